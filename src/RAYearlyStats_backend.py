@@ -7,10 +7,27 @@ Created on Sun Nov 10
 
 # Libraries for API usage
 
+import os
+import sys
+import shutil
+import json
 import time
+import base64
+import asyncio
+import hashlib
+import threading
+import functools
+import contextlib
+import contextvars
 import requests
 import datetime, calendar
 
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 # Libraries for data manipulation
 
 import numpy as np
@@ -24,787 +41,4744 @@ from io import BytesIO
 import matplotlib.pyplot as plt
 import plotly.graph_objects as go
 
+from plotly.subplots import make_subplots
+
+# Optional library for columnar snapshots of the retrieved data
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+#################
+# Configuration #
+#################
+
+
+# Local folder where retrieved data is stored between runs
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "RAYearlyStats")
+
+# Time (in seconds) a cached game's metadata is considered up to date
+
+DEFAULT_GAMES_CACHE_TTL = 30*24*60*60
+
+# Version of the layout of the data snapshots, increased whenever old
+# snapshots can no longer be read
+
+SNAPSHOT_FORMAT_VERSION = 2
+
+# Tables of a snapshot and the file each one is stored in
+
+SNAPSHOT_TABLES = {
+    "Historic": "historic.arrow",
+    "Awards": "awards.arrow",
+    "Games": "games.arrow",
+    "Achievements": "achievements.arrow",
+}
+
+# Maximum sustained request rate to the RetroAchievements API and number of
+# requests allowed in flight at the same time
+
+DEFAULT_REQUESTS_PER_SECOND = 5
+DEFAULT_MAX_WORKERS = 8
+
+# HTTP transport settings: (connect, read) timeouts in seconds, number of
+# retries of a failed request and base waiting time between retries, doubled
+# after each one
+
+DEFAULT_HTTP_TIMEOUT = (5, 30)
+DEFAULT_HTTP_RETRIES = 4
+DEFAULT_HTTP_BACKOFF = 0.5
+MAX_HTTP_BACKOFF = 60
+
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Maximum number of achievements sent by the API per history request
+
+HISTORIC_PAGE_SIZE = 500
+
+# Base URLs of the RetroAchievements web API and media host. They can be
+# pointed elsewhere, like a local mock server, through configure_http
+
+DEFAULT_API_BASE_URL = "https://retroachievements.org/API/"
+DEFAULT_MEDIA_BASE_URL = "https://media.retroachievements.org"
+
+# Folder where HTTP responses are recorded to be replayed later
+
+DEFAULT_RECORDINGS_DIR = os.path.join(DEFAULT_CACHE_DIR, "recordings")
+
+# Maximum memory (in bytes) taken by downloaded images kept in memory
+
+DEFAULT_IMAGE_MEMORY_CACHE_SIZE = 64*1024*1024
+
+# Maximum memory (in bytes) taken by the rendered yearly reports kept in
+# memory, so that coming back to an already seen year costs nothing
+
+DEFAULT_RENDER_CACHE_SIZE = 32*1024*1024
+
+# Media folders whose files never change once uploaded (a new badge or icon
+# gets a new file name), so they can be kept on disk forever
+
+IMMUTABLE_MEDIA_FOLDERS = ("Badge", "Images")
+
+# Ways in which retrieved images can be returned: plottable matplotlib
+# figures, the downloaded file contents, or uint8 RGBA pixel arrays
+
+IMAGE_FORMATS = ("figure", "bytes", "array")
+
+# Column types of the achievement and award histories. Repeated strings are
+# stored as categories and numbers with the smallest type that fits them
+
+HISTORIC_DTYPES = {
+    "HardcoreMode": "int8",
+    "AchievementID": "int32",
+    "Points": "int16",
+    "TrueRatio": "int32",
+    "GameID": "int32",
+    "CumulScore": "int32",
+    "Year": "int16",
+    "Month": "int8",
+    "Day": "int8",
+    "Hour": "int8",
+    "Minute": "int8",
+    "Type": "category",
+    "Author": "category",
+    "GameTitle": "category",
+    "GameIcon": "category",
+    "ConsoleName": "category",
+}
+
+AWARDS_DTYPES = {
+    "AwardData": "int32",
+    "AwardDataExtra": "int8",
+    "ConsoleID": "int16",
+    "Year": "int16",
+    "Month": "int8",
+    "Day": "int8",
+    "Hour": "int8",
+    "Minute": "int8",
+    "AwardType": "category",
+    "ConsoleName": "category",
+}
+
+# Achievement metadata kept in the achievement catalog, and its column types
+
+CHEEVOS_COLUMNS = [
+    "GameID",
+    "AchievementID",
+    "Title",
+    "Description",
+    "Points",
+    "TrueRatio",
+    "Author",
+    "type",
+]
+
+CHEEVOS_DTYPES = {
+    "GameID": "int32",
+    "AchievementID": "int32",
+    "Points": "int16",
+    "TrueRatio": "int32",
+    "Author": "category",
+    "type": "category",
+}
+
 
 ###################
 # Basic functions #
 ###################
 
 
-def http_get(
-    url:str,
-) -> requests.Response:
-    
-    # TODO Handle some edge cases
-    
-    return requests.get(url)
+# Shared HTTP session, so that connections to the RetroAchievements servers
+# are kept alive and reused between requests
 
+http_session = None
+http_session_lock = threading.Lock()
 
-def get_game_ids(
-    df_historic: pd.DataFrame,
-) -> np.ndarray:
-    
-    """
-    Returns all the game IDs contained in a DataFrame containing the user's metadata.
-    
-    Parameters:
+http_settings = {
+    "Timeout": DEFAULT_HTTP_TIMEOUT,
+    "Retries": DEFAULT_HTTP_RETRIES,
+    "Backoff": DEFAULT_HTTP_BACKOFF,
+    "Pool size": 2*DEFAULT_MAX_WORKERS,
+    "API base URL": DEFAULT_API_BASE_URL,
+    "Media base URL": DEFAULT_MEDIA_BASE_URL,
+}
 
-        df (pandas.DataFrame):
-            A DataFrame containing the user's RA metadata.
+# Record/replay of HTTP responses: in "record" mode every response received
+# is saved to disk, in "replay" mode responses are read from disk instead of
+# being requested
 
-    Returns:
-        
-        numpy.array (dtype=int):
-            Array containing all the game IDs.
-    """
+http_recording = {
+    "Mode": None,
+    "Directory": DEFAULT_RECORDINGS_DIR,
+}
 
-    return df_historic["GameID"].unique()
+# Request statistics per endpoint
 
+http_stats = {}
+http_stats_lock = threading.Lock()
 
-def get_game_title(
-    game_id: int,
-    df_games_data: pd.DataFrame,
-) -> str:
-    
-    """
-    Returns all the game IDs contained in a DataFrame containing the user's metadata.
-    
-    Parameters:
-        
-        game_id (int):
-            The RetroAchievements ID of the desired game.
+# Opt-in instrumentation of a run: wall time spent in each stage (history
+# paging, game metadata, figures...) and counters of requests, bytes, time
+# slept and cache hits
 
-        df_games_data (pandas.DataFrame):
-           A DataFrame containing RA's metadata of some games including the desired one.
+instrumentation = {
+    "Enabled": False,
+    "Stages": {},
+    "Counters": {},
+}
+instrumentation_lock = threading.Lock()
 
-    Returns:
-        
-        str:
-            Title of the desired game.
-    """
+# Name of the stage being run, nested stages are joined with slashes
 
-    return df_games_data[df_games_data["ID"] == game_id]["Title"].values[0]
+current_stage = contextvars.ContextVar("current_stage", default="")
 
 
-def get_game_console(
-    game_id: int,
-    df_historic: pd.DataFrame,
-) -> str:
-    
+def get_http_session(
+) -> requests.Session:
+
     """
-    Returns all the game IDs contained in a DataFrame containing the user's metadata.
+    Returns the HTTP session shared by all requests, creating it if needed.
     
-    Parameters:
-        
-        game_id (int):
-            The RetroAchievements ID of the desired game.
-
-        df (pandas.DataFrame):
-            A DataFrame containing the user's RA metadata.
-
     Returns:
         
-        str:
-            System of the desired game.
+        requests.Session:
+            Session with a connection pool for each host.
     """
 
-    return df_historic[df_historic["GameID"] == game_id]["ConsoleName"].values[0]
+    global http_session
 
+    with http_session_lock:
+
+        if http_session is None:
+
+            adapter = requests.adapters.HTTPAdapter(pool_connections=4,
+                                                    pool_maxsize=http_settings["Pool size"],
+                                                    )
+
+            http_session = requests.Session()
+            http_session.mount("https://", adapter)
+            http_session.mount("http://", adapter)
+
+        return http_session
+
+
+def configure_http(
+    timeout: float | tuple | None= None,
+    retries: int | None= None,
+    backoff: float | None= None,
+    pool_size: int | None= None,
+    api_base_url: str | None= None,
+    media_base_url: str | None= None,
+):
 
-def get_cheevo_data(
-    game_id: int,
-    cheevos_data_dict: dict,
-) -> pd.DataFrame:
-    
     """
-    Retrieve the achievement list for a game with all the metadata.
+    Change the settings of the HTTP transport. Unspecified settings are kept.
     
     Parameters:
         
-        game_id (int):
-            The RetroAchievements ID of the desired game.
+        timeout (float | tuple, optional):
+            Timeout in seconds, or (connect, read) tuple of timeouts.
             
-        cheevos_data_dict (dict):
-            Dictionary with the involved games' ID as keys and a Pandas
-            DataFrame containing the achievements' metadata as values
+        retries (int, optional):
+            Number of times a failed request is retried.
             
-    Returns:
-
-        pandas.DataFrame:
-            Pandas DataFrame containing the game's achievement metadata.
+        backoff (float, optional):
+            Seconds waited before the first retry, doubled after each one.
+            
+        pool_size (int, optional):
+            Maximum number of connections kept alive per host.
+            
+        api_base_url (str, optional):
+            URL the API function names are appended to.
+            
+        media_base_url (str, optional):
+            URL the media paths (badges, icons...) are appended to.
     """
 
-    return cheevos_data_dict[game_id]
+    global http_session
 
+    if timeout is not None:
+        http_settings["Timeout"] = timeout
+
+    if retries is not None:
+        http_settings["Retries"] = retries
+
+    if backoff is not None:
+        http_settings["Backoff"] = backoff
+
+    if api_base_url is not None:
+        http_settings["API base URL"] = api_base_url
+
+    if media_base_url is not None:
+        http_settings["Media base URL"] = media_base_url
+
+    if pool_size is not None:
+        
+        http_settings["Pool size"] = pool_size
+
+        # The pool size is fixed on creation, so start a new session
+
+        with http_session_lock:
+            if http_session is not None:
+                http_session.close()
+            http_session = None
+
+
+def get_endpoint_name(
+    url: str,
+) -> str:
 
-def check_mastered(
-    game_id: int,
-    df_game: pd.DataFrame,
-    cheevos_data_dict: dict,
-) -> bool:
-    
     """
-    Check if a specific game was mastered.
+    Returns the endpoint of a URL, that is, its host and path without the
+    query.
     
     Parameters:
         
-        game_id (int):
-            The RetroAchievements ID of the desired game.
-            
-        df_game (pandas.DataFrame):
-            DataFrame containing the user's RA metadata regarding the desired game.
-            
-        cheevos_data_dict (dict):
-            Dictionary with the involved games' ID as keys and a Pandas
-            DataFrame containing the achievements' metadata as values.
+        url (str):
+            Any URL.
             
     Returns:
         
-        bool:
-            True if the game was mastered.
+        str:
+            Endpoint of the URL. Media files are grouped by their top folder.
     """
 
-    df_cheevos = get_cheevo_data(game_id, cheevos_data_dict)
+    split_url = urlsplit(url)
 
-    return len(df_game) == len(df_cheevos)
+    path = split_url.path
 
+    # Group media files (badges, icons...) by folder instead of by file
+
+    media_base_url = http_settings["Media base URL"]
+
+    if url.startswith(media_base_url) and not url.startswith(http_settings["API base URL"]):
+        path = "/" + url[len(media_base_url):].strip("/").split("/")[0]
+
+    return split_url.netloc + path
+
+
+def record_http_stats(
+    endpoint: str,
+    latency: float= 0.0,
+    retried: bool= False,
+    failed: bool= False,
+):
 
-def check_beaten(
-    game_id: int,
-    df_game: pd.DataFrame,
-    cheevos_data_dict: dict,
-) -> bool:
-    
     """
-    Check if a specific game was beaten.
+    Add the outcome of one attempt of a request to the statistics of its
+    endpoint.
     
     Parameters:
         
-        game_id (int):
-            The RetroAchievements ID of the desired game.
+        endpoint (str):
+            Endpoint of the request.
             
-        df_game (pandas.DataFrame):
-            DataFrame containing the user's RA metadata regarding the desired game.
+        latency (float, optional):
+            Seconds the attempt took.
             
-        cheevos_data_dict (dict):
-            Dictionary with the involved games' ID as keys and a Pandas
-            DataFrame containing the achievements' metadata as values.
+        retried (bool, optional):
+            Whether the request is going to be retried.
             
-    Returns:
-        
-        bool:
-            True if the game was beaten.
+        failed (bool, optional):
+            Whether the request failed for good.
     """
 
-    df_cheevos = get_cheevo_data(game_id, cheevos_data_dict)
+    with http_stats_lock:
 
-    # If one Progression achievement is missing, return False
-    
-    for cheevo_id in df_cheevos[df_cheevos["type"] == "progression"]["ID"]:
-        if cheevo_id not in df_game["AchievementID"].values:
-            return False
-    
-    win_condition_cheevos = df_cheevos[df_cheevos["type"] == "win_condition"]
-    
-    # If all Progression achievements are there but there is no Win Condition, return True
-    
-    if len(win_condition_cheevos) == 0:
-        return True
-    
-    # If one Win Condition achievement is present, return True
+        stats = http_stats.setdefault(endpoint, {"Requests": 0,
+                                                 "Retries": 0,
+                                                 "Failures": 0,
+                                                 "Total latency": 0.0,
+                                                 "Max latency": 0.0,
+                                                 })
 
-    for cheevo_id in win_condition_cheevos["ID"]:
-        if cheevo_id in df_game["AchievementID"].values:
-            return True
+        stats["Requests"] += 1
+        stats["Retries"] += int(retried)
+        stats["Failures"] += int(failed)
+        stats["Total latency"] += latency
+        stats["Max latency"] = max(stats["Max latency"], latency)
 
-    return False
 
+def get_http_stats(
+) -> pd.DataFrame:
 
-def get_most_point_game(
-    df_historic: pd.DataFrame,
-) -> tuple:
-    
     """
-    Get the game with the most points and its point total from a historic.
+    Returns the request statistics gathered per endpoint since the start of
+    the session or the last reset.
     
-    Parameters:
-        
-        df_historic (pandas.DataFrame):
-            Some user's RetroAchievements achievement history
-            
     Returns:
         
-        tuple:
-            GameID and point total of the game with most points.
+        pandas.DataFrame:
+            DataFrame with the endpoints as index and the number of requests
+            (attempts), retries, failures, and total, mean and maximum latency
+            in seconds as columns.
     """
 
-    points_by_game_sorted = df_historic.groupby('GameID')['Points'].sum().sort_values(ascending=False)
+    with http_stats_lock:
+        df_stats = pd.DataFrame.from_dict(http_stats, orient="index")
 
-    return points_by_game_sorted.index[0], points_by_game_sorted.values[0]
+    if len(df_stats) > 0:
+        df_stats["Mean latency"] = df_stats["Total latency"]/df_stats["Requests"]
 
+    return df_stats
+
+
+def reset_http_stats(
+):
 
-def get_most_retropoint_game(
-    df_historic: pd.DataFrame,
-) -> tuple:
-    
     """
-    Get the game with the most RetroPoints and its RetroPoint total from a
-    historic.
-    
-    Parameters:
-        
-        df_historic (pandas.DataFrame):
-            Some user's RetroAchievements achievement history
-            
-    Returns:
-        
-        tuple:
-            GameID and RetroPoint total of the game with most RetroPoints.
+    Clear the request statistics gathered so far.
     """
 
-    retropoints_by_game_sorted = df_historic.groupby('GameID')['TrueRatio'].sum().sort_values(ascending=False)
+    with http_stats_lock:
+        http_stats.clear()
 
-    return retropoints_by_game_sorted.index[0], retropoints_by_game_sorted.values[0]
 
+def enable_instrumentation(
+    enabled: bool= True,
+):
 
-def get_most_cheevo_game(
-    df_historic: pd.DataFrame,
-) -> tuple:
-    
     """
-    Get the game with the most achievements and its achievement total from a
-    historic.
+    Start or stop measuring the stages of the runs and counting their I/O.
+    Nothing is measured by default.
     
     Parameters:
         
-        df_historic (pandas.DataFrame):
-            Some user's RetroAchievements achievement history
-            
-    Returns:
-        
-        tuple:
-            GameID and achievement total of the game with most achievements.
+        enabled (bool, optional):
+            Whether to measure.
     """
 
-    game_counts = df_historic['GameID'].value_counts()
+    instrumentation["Enabled"] = enabled
 
-    return game_counts.index[0], game_counts.iloc[0]
 
+def reset_instrumentation(
+):
+
+    """
+    Clear the stage timings and counters gathered so far, along with the
+    request statistics.
+    """
+
+    with instrumentation_lock:
+        instrumentation["Stages"].clear()
+        instrumentation["Counters"].clear()
+
+    reset_http_stats()
+
+
+def count_event(
+    name: str,
+    value: float= 1,
+):
 
-def retrieve_image(
-    url: str,
-) -> Image.Image | None:
-    
     """
-    Get an image from the web.
+    Add to one of the instrumentation counters, if instrumentation is
+    enabled.
     
     Parameters:
         
-        url (str):
-            URL of the picture to download.
+        name (str):
+            Name of the counter.
             
-    Returns:
-        
-        Image:
-            The requested image.
+        value (float, optional):
+            Amount to add.
     """
 
-    response = http_get(url)
-    
-    if response.status_code == 200:
-        return Image.open(BytesIO(response.content))
-    else:
-        print(f"Failed to download image. Status code: {response.status_code}")
+    if not instrumentation["Enabled"]:
         return
 
+    with instrumentation_lock:
+        instrumentation["Counters"][name] = instrumentation["Counters"].get(name, 0) + value
 
-def retrieve_image_as_fig(
-    url: str,
+
+@contextlib.contextmanager
+def instrument_stage(
+    name: str,
 ):
+
+    """
+    Measure the wall time of the code run inside a with block, if
+    instrumentation is enabled. Stages started inside another one are
+    reported under its name, e.g. 'User data/History paging'.
     
+    Parameters:
+        
+        name (str):
+            Name of the stage.
     """
-    Get an image from the web as a plottable figure.
+
+    if not instrumentation["Enabled"]:
+        yield
+        return
+
+    parent = current_stage.get()
+    full_name = parent + "/" + name if parent else name
+
+    token = current_stage.set(full_name)
+    start = time.monotonic()
+
+    try:
+        yield
+    finally:
+
+        end = time.monotonic()
+        current_stage.reset(token)
+
+        with instrumentation_lock:
+
+            stats = instrumentation["Stages"].setdefault(full_name, {"Calls": 0,
+                                                                     "Total time": 0.0,
+                                                                     "Max time": 0.0,
+                                                                     "First start": start,
+                                                                     "Last end": end,
+                                                                     })
+
+            stats["Calls"] += 1
+            stats["Total time"] += end - start
+            stats["Max time"] = max(stats["Max time"], end - start)
+            stats["First start"] = min(stats["First start"], start)
+            stats["Last end"] = max(stats["Last end"], end)
+
+
+def instrumented(
+    name: str,
+):
+
+    """
+    Decorator that runs every call of a function, or coroutine function,
+    inside instrument_stage.
     
     Parameters:
         
-        url (str):
-            URL of the picture to download.
+        name (str):
+            Name of the stage.
+    """
+
+    def decorator(func):
+
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                with instrument_stage(name):
+                    return await func(*args, **kwargs)
+
+        else:
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with instrument_stage(name):
+                    return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def get_instrumentation_report(
+) -> dict:
+
+    """
+    Returns everything measured since instrumentation was enabled or last
+    reset, ready to be dumped as JSON.
+    
+    Returns:
+        
+        dict:
+            Dictionary with the 'Stages' timings (number of calls, total,
+            maximum and wall time in seconds, the latter being the span from
+            the first start to the last end, which is shorter than the total
+            when calls run concurrently), the 'Counters' and the 'HTTP'
+            request statistics per endpoint.
+    """
+
+    with instrumentation_lock:
+
+        stages = {name: {"Calls": stats["Calls"],
+                         "Total time": stats["Total time"],
+                         "Max time": stats["Max time"],
+                         "Wall time": stats["Last end"] - stats["First start"],
+                         }
+                  for name, stats in sorted(instrumentation["Stages"].items())}
+
+        counters = dict(sorted(instrumentation["Counters"].items()))
+
+    with http_stats_lock:
+        http = {endpoint: dict(stats) for endpoint, stats in http_stats.items()}
+
+    return {
+        "Stages": stages,
+        "Counters": counters,
+        "HTTP": http,
+    }
+
+
+def get_instrumentation_summary(
+) -> pd.DataFrame:
+
+    """
+    Returns the stage timings measured so far as a table.
+    
+    Returns:
+        
+        pandas.DataFrame:
+            DataFrame with the stages as index and their number of calls and
+            total, maximum and wall time in seconds as columns.
+    """
+
+    return pd.DataFrame.from_dict(get_instrumentation_report()["Stages"], orient="index")
+
+
+def write_instrumentation_report(
+    path: str,
+):
+
+    """
+    Write the instrumentation report to a JSON file and print the summary of
+    the stages and counters.
+    
+    Parameters:
+        
+        path (str):
+            Path of the JSON file.
+    """
+
+    report = get_instrumentation_report()
+
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+
+    print(get_instrumentation_summary().to_string(float_format=lambda x: f"{x:.3f}"))
+
+    for name, value in report["Counters"].items():
+        print(f"{name}: {value:g}")
+
+
+def get_retry_after(
+    response: requests.Response,
+) -> float | None:
+
+    """
+    Returns the time the server asked to wait before retrying a request.
+    
+    Parameters:
+        
+        response (requests.Response):
+            Response of the failed request.
             
     Returns:
         
-        matplotlib.figure.Figure:
-            The requested image as a plottable figure.
+        float | None:
+            Seconds to wait, or None if the server did not specify it.
     """
 
-    img = retrieve_image(url)
+    retry_after = response.headers.get("Retry-After")
 
-    if img == None:
+    if retry_after is None:
+        return
+
+    # It can be either a number of seconds or a date
+
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+
+    try:
+        retry_date = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
         return
+
+    return max(0.0, retry_date.timestamp() - time.time())
+
+
+def configure_http_recording(
+    mode: str | None= None,
+    directory: str | None= None,
+):
+
+    """
+    Start saving every HTTP response to disk, start answering requests with
+    the saved responses instead of the network, or go back to normal.
     
-    fig, ax = plt.subplots(figsize=(1, 1))
-    ax.axis('off')
+    Parameters:
+        
+        mode (str, optional):
+            'record', 'replay', or None to stop both.
+            
+        directory (str, optional):
+            Folder where the responses are saved. The current one is kept if
+            not specified.
+    """
+
+    if mode not in (None, "record", "replay"):
+        raise ValueError(f"Unknown recording mode: {mode}")
+
+    http_recording["Mode"] = mode
+
+    if directory is not None:
+        http_recording["Directory"] = directory
+
+
+def scrub_url(
+    url: str,
+) -> str:
+
+    """
+    Returns a URL without the API key, so that it can be stored safely.
     
-    ax.imshow(img)
+    Parameters:
+        
+        url (str):
+            Any URL.
+            
+    Returns:
+        
+        str:
+            The URL without its 'y' query argument.
+    """
 
-    plt.close(fig)
+    split_url = urlsplit(url)
+
+    query = [(key, value) for key, value in parse_qsl(split_url.query, keep_blank_values=True) if key != "y"]
+
+    return urlunsplit(split_url._replace(query=urlencode(query)))
+
+
+def get_recording_path(
+    url: str,
+) -> str:
+
+    """
+    Returns the path of the file where the response to a URL is recorded.
     
-    return fig
+    Parameters:
+        
+        url (str):
+            Requested URL.
+            
+    Returns:
+        
+        str:
+            Path of the recording, named after the URL without its API key.
+    """
 
+    key = hashlib.sha256(scrub_url(url).encode("utf-8")).hexdigest()
 
-def get_game_icon(
-    df_historic: pd.DataFrame,
-    game_id: int,
+    return os.path.join(http_recording["Directory"], key + ".json")
+
+
+def store_recorded_response(
+    url: str,
+    response: requests.Response,
 ):
+
+    """
+    Save a response to disk to be replayed later.
     
+    Parameters:
+        
+        url (str):
+            Requested URL.
+            
+        response (requests.Response):
+            Response received.
     """
-    Get the icon of a game registered in RetroAchievements.
+
+    path = get_recording_path(url)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # Cookies are not kept, they might identify the user
+
+    headers = {key: value for key, value in response.headers.items() if key.lower() != "set-cookie"}
+
+    tmp_path = path + ".tmp"
+
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump({
+            "URL": scrub_url(url),
+            "Status": response.status_code,
+            "Headers": headers,
+            "Content": base64.b64encode(response.content).decode("ascii"),
+        }, file)
+
+    os.replace(tmp_path, path)
+
+
+def load_recorded_response(
+    url: str,
+) -> requests.Response:
+
+    """
+    Read a recorded response from disk.
     
     Parameters:
         
-        df_historic (pandas.DataFrame):
-            Some user's RetroAchievements achievement history.
+        url (str):
+            Requested URL.
             
-        game_id (int):
-            The RetroAchievements ID of the desired game.
+    Returns:
+        
+        requests.Response:
+            The recorded response.
+    """
+
+    path = get_recording_path(url)
+
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No recorded response for {scrub_url(url)}")
+
+    with open(path, "r", encoding="utf-8") as file:
+        recording = json.load(file)
+
+    response = requests.Response()
+
+    response.url = recording["URL"]
+    response.status_code = recording["Status"]
+    response.headers.update(recording["Headers"])
+    response._content = base64.b64decode(recording["Content"])
+
+    return response
+
+
+def http_get(
+    url:str,
+    timeout: float | tuple | None= None,
+) -> requests.Response:
+    
+    """
+    Make a GET request through the shared HTTP session.
+    
+    Connection errors, timeouts and responses with status 429 or 5xx are
+    retried with exponential backoff, honoring the Retry-After header sent by
+    the server. The final response is saved or replayed instead if
+    configure_http_recording says so.
+    
+    Parameters:
+        
+        url (str):
+            URL to request.
+            
+        timeout (float | tuple, optional):
+            Timeout in seconds, or (connect, read) tuple of timeouts. The
+            configured one is used if not specified.
+            
+    Returns:
+        
+        requests.Response:
+            The last response received.
+    """
+
+    endpoint = get_endpoint_name(url)
+
+    if http_recording["Mode"] == "replay":
+
+        start = time.monotonic()
+        response = load_recorded_response(url)
+        record_http_stats(endpoint, time.monotonic() - start)
+
+        count_event("HTTP responses replayed")
+        count_event("HTTP bytes received", len(response.content))
+
+        return response
+
+    session = get_http_session()
+
+    if timeout is None:
+        timeout = http_settings["Timeout"]
+
+    retries = http_settings["Retries"]
+
+    for attempt in range(retries + 1):
+
+        last_attempt = attempt == retries
+        backoff = min(MAX_HTTP_BACKOFF, http_settings["Backoff"]*2**attempt)
+
+        start = time.monotonic()
+
+        try:
+            response = session.get(url, timeout=timeout)
+            
+        except (requests.ConnectionError, requests.Timeout):
+            
+            record_http_stats(endpoint, time.monotonic() - start, retried=not last_attempt, failed=last_attempt)
+            
+            if last_attempt:
+                raise
+            
+            wait = backoff
+            
+        else:
+
+            latency = time.monotonic() - start
+
+            count_event("HTTP bytes received", len(response.content))
+
+            if response.status_code not in RETRYABLE_STATUS_CODES or last_attempt:
+
+                record_http_stats(endpoint, latency, failed=response.status_code in RETRYABLE_STATUS_CODES)
+
+                if http_recording["Mode"] == "record":
+                    store_recorded_response(url, response)
+
+                return response
+
+            record_http_stats(endpoint, latency, retried=True)
+
+            wait = get_retry_after(response)
+
+            if wait is None:
+                wait = backoff
+            else:
+                wait = min(MAX_HTTP_BACKOFF, wait)
+
+        count_event("Retry sleep (s)", wait)
+        time.sleep(wait)
+
+
+async def http_get_async(
+    url: str,
+    timeout: float | tuple | None= None,
+) -> requests.Response:
+
+    """
+    Make a GET request through the shared HTTP session without blocking the
+    event loop. It runs http_get in a worker thread, so it has the same
+    retries and statistics.
+    
+    Parameters:
+        
+        url (str):
+            URL to request.
+            
+        timeout (float | tuple, optional):
+            Timeout in seconds, or (connect, read) tuple of timeouts. The
+            configured one is used if not specified.
+            
+    Returns:
+        
+        requests.Response:
+            The last response received.
+    """
+
+    return await asyncio.to_thread(http_get, url, timeout)
+
+
+def check_response(
+    response: requests.Response,
+) -> requests.Response:
+
+    """
+    Make sure that a response from the API succeeded before its body is used,
+    since a failed request still returns a JSON body with an error message.
+    Raises requests.HTTPError otherwise, without the API key in the message.
+    
+    Parameters:
+        
+        response (requests.Response):
+            A response returned by http_get.
+            
+    Returns:
+        
+        requests.Response:
+            The same response.
+    """
+
+    if response.status_code != 200:
+        raise requests.HTTPError(f"Request to {scrub_url(response.url)} failed with status code {response.status_code}", response=response)
+
+    return response
+
+
+def run_sync(
+    coroutine,
+):
+
+    """
+    Run a coroutine to completion and return its result, also when called
+    from code already running inside an event loop (like a Jupyter notebook).
+    
+    Parameters:
+        
+        coroutine (coroutine):
+            The coroutine to run.
             
     Returns:
         
-        Image:
-            The requested image.
+        The coroutine's result.
+    """
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    # The running loop can't be blocked waiting for itself, so run the
+    # coroutine in its own loop in another thread
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(contextvars.copy_context().run, asyncio.run, coroutine).result()
+
+
+class RateLimiter:
+    
+    """
+    Token bucket rate limiter shared by every thread making requests.
+    
+    Parameters:
+        
+        rate (float):
+            Sustained number of requests allowed per second.
+            
+        burst (int, optional):
+            Number of requests that can be made back to back before the rate
+            starts to apply.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int= 1,
+    ):
+
+        self.rate = rate
+        self.burst = burst
+
+        self._tokens = burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(
+        self,
+    ) -> float:
+
+        """
+        Take one token from the bucket.
+        
+        Returns:
+            
+            float:
+                Seconds the caller has to wait before making its request.
+        """
+
+        with self._lock:
+
+            now = time.monotonic()
+
+            # Refill the bucket with the tokens generated since the last call
+
+            self._tokens = min(self.burst, self._tokens + (now - self._last)*self.rate)
+            self._last = now
+
+            # Tokens may go negative, which queues callers one after another
+
+            self._tokens -= 1
+
+            if self._tokens >= 0:
+                return 0.0
+
+            return -self._tokens/self.rate
+
+    def acquire(
+        self,
+    ):
+
+        """
+        Block until a request can be made without exceeding the rate.
+        """
+
+        wait = self.reserve()
+
+        if wait > 0:
+            count_event("Rate limit sleep (s)", wait)
+            time.sleep(wait)
+
+    async def acquire_async(
+        self,
+    ):
+
+        """
+        Wait, without blocking the event loop, until a request can be made
+        without exceeding the rate.
+        """
+
+        wait = self.reserve()
+
+        if wait > 0:
+            count_event("Rate limit sleep (s)", wait)
+            await asyncio.sleep(wait)
+
+
+# Rate limiter shared by all requests to the RetroAchievements API
+
+api_rate_limiter = RateLimiter(DEFAULT_REQUESTS_PER_SECOND)
+
+
+def set_api_rate_limit(
+    rate: float,
+    burst: int= 1,
+):
+
+    """
+    Change the maximum request rate to the RetroAchievements API.
+    
+    Parameters:
+        
+        rate (float):
+            Sustained number of requests allowed per second.
+            
+        burst (int, optional):
+            Number of requests that can be made back to back before the rate
+            starts to apply.
+    """
+
+    global api_rate_limiter
+
+    api_rate_limiter = RateLimiter(rate, burst)
+
+
+def fetch_concurrently(
+    func,
+    items: list,
+    max_workers: int= DEFAULT_MAX_WORKERS,
+    rate_limiter: RateLimiter | None= None,
+) -> tuple:
+
+    """
+    Call a function once per item using a bounded pool of worker threads.
+    
+    A failing call does not stop the rest, its exception is collected instead.
+    
+    Parameters:
+        
+        func (callable):
+            Function taking a single item as argument.
+            
+        items (list):
+            Hashable items to process.
+            
+        max_workers (int, optional):
+            Maximum number of calls running at the same time.
+            
+        rate_limiter (RateLimiter, optional):
+            If specified, every call waits for it before starting.
+            
+    Returns:
+        
+        dict:
+            Dictionary with the items as keys and the results of the
+            successful calls as values.
+            
+        dict:
+            Dictionary with the items as keys and the exceptions raised by the
+            failed calls as values.
+    """
+
+    def call(item):
+        
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+            
+        return func(item)
+
+    results = {}
+    errors = {}
+
+    if len(items) == 0:
+        return results, errors
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as executor:
+
+        futures = {executor.submit(call, item): item for item in items}
+
+        for future in as_completed(futures):
+            
+            item = futures[future]
+            
+            try:
+                results[item] = future.result()
+            except Exception as error:
+                errors[item] = error
+
+    return results, errors
+
+
+class PartitionedHistory:
+
+    """
+    Achievement history split by year and by game once, so that the slice of
+    any year or game can be taken without scanning the whole history again.
+    
+    It can be used in place of the history DataFrame by the functions that
+    work on a single year or game.
+    
+    Parameters:
+        
+        df_historic (pandas.DataFrame):
+            Some user's RetroAchievements achievement history. It must not be
+            modified afterwards.
+    """
+
+    def __init__(
+        self,
+        df_historic: pd.DataFrame,
+    ):
+
+        self.df = df_historic
+
+        # Years are sliced right away since every analysis needs them, games
+        # only keep their row positions until they are requested
+
+        self.years = {year: df_year for year, df_year in df_historic.groupby("Year", sort=True)}
+
+        self._game_positions = None
+
+    def get_year(
+        self,
+        year: int,
+    ) -> pd.DataFrame:
+
+        """
+        Returns the achievements earned in a year.
+        """
+
+        if year in self.years:
+            return self.years[year]
+
+        return self.df.iloc[0:0]
+
+    def get_game(
+        self,
+        game_id: int,
+    ) -> pd.DataFrame:
+
+        """
+        Returns the achievements earned in a game.
+        """
+
+        if self._game_positions is None:
+            self._game_positions = self.df.groupby("GameID").indices
+
+        if game_id in self._game_positions:
+            return self.df.iloc[self._game_positions[game_id]]
+
+        return self.df.iloc[0:0]
+
+
+class LookupIndex:
+
+    """
+    Hash tables of the metadata that is looked up one game or achievement at
+    a time, built once per dataset so that each lookup takes constant time
+    instead of a scan of the whole history.
+    
+    It can be used in place of the history or games' metadata DataFrame by
+    the functions that look up the title, system or icon of a game, or the
+    badge of an achievement.
+    
+    Parameters:
+        
+        df_historic (pandas.DataFrame | PartitionedHistory):
+            Some user's RetroAchievements achievement history.
+            
+        df_games_data (pandas.DataFrame, optional):
+            RetroAchievements metadata of the games that appear in
+            df_historic. If given, the game titles are taken from it instead
+            of from the history.
+    """
+
+    def __init__(
+        self,
+        df_historic: pd.DataFrame | PartitionedHistory,
+        df_games_data: pd.DataFrame | None= None,
+    ):
+
+        df_historic = get_historic_df(df_historic)
+
+        # The first row of each game or achievement is kept, as a scan would
+        # find
+
+        df_games = df_historic.drop_duplicates("GameID")
+        game_ids = df_games["GameID"].tolist()
+
+        self.game_titles = dict(zip(game_ids, df_games["GameTitle"].tolist()))
+        self.game_consoles = dict(zip(game_ids, df_games["ConsoleName"].tolist()))
+        self.game_icons = dict(zip(game_ids, df_games["GameIcon"].tolist()))
+
+        if df_games_data is not None:
+            df_games_data = df_games_data.drop_duplicates("ID")
+            self.game_titles.update(zip(df_games_data["ID"].tolist(), df_games_data["Title"].tolist()))
+
+        df_cheevos = df_historic.drop_duplicates("AchievementID")
+        cheevo_ids = df_cheevos["AchievementID"].tolist()
+
+        self.cheevo_badges = dict(zip(cheevo_ids, df_cheevos["BadgeURL"].tolist()))
+        self.cheevo_titles = dict(zip(cheevo_ids, df_cheevos["Title"].tolist()))
+        self.cheevo_points = dict(zip(cheevo_ids, df_cheevos["Points"].tolist()))
+
+    def get_game_title(
+        self,
+        game_id: int,
+    ) -> str:
+
+        """
+        Returns the title of a game.
+        """
+
+        return self.game_titles[game_id]
+
+    def get_game_console(
+        self,
+        game_id: int,
+    ) -> str:
+
+        """
+        Returns the system of a game.
+        """
+
+        return self.game_consoles[game_id]
+
+    def get_game_icon(
+        self,
+        game_id: int,
+    ) -> str:
+
+        """
+        Returns the media path of a game's icon.
+        """
+
+        return self.game_icons[game_id]
+
+    def get_cheevo_badge(
+        self,
+        cheevo_id: int,
+    ) -> str:
+
+        """
+        Returns the media path of an achievement's badge.
+        """
+
+        return self.cheevo_badges[cheevo_id]
+
+    def get_cheevo_title(
+        self,
+        cheevo_id: int,
+    ) -> str:
+
+        """
+        Returns the title of an achievement.
+        """
+
+        return self.cheevo_titles[cheevo_id]
+
+    def get_cheevo_points(
+        self,
+        cheevo_id: int,
+    ) -> int:
+
+        """
+        Returns the points of an achievement.
+        """
+
+        return self.cheevo_points[cheevo_id]
+
+
+def get_historic_df(
+    df_historic: pd.DataFrame | PartitionedHistory,
+) -> pd.DataFrame:
+
+    """
+    Returns the complete achievement history.
+    
+    Parameters:
+        
+        df_historic (pandas.DataFrame | PartitionedHistory):
+            Some user's RetroAchievements achievement history.
+            
+    Returns:
+        
+        pandas.DataFrame:
+            The achievement history as a DataFrame.
+    """
+
+    if isinstance(df_historic, PartitionedHistory):
+        return df_historic.df
+
+    return df_historic
+
+
+def get_year_data(
+    df_historic: pd.DataFrame | PartitionedHistory,
+    year: int,
+) -> pd.DataFrame:
+
+    """
+    Returns the achievements earned in a year.
+    
+    Parameters:
+        
+        df_historic (pandas.DataFrame | PartitionedHistory):
+            Some user's RetroAchievements achievement history.
+            
+        year (int):
+            Year to check.
+            
+    Returns:
+        
+        pandas.DataFrame:
+            Sub-DataFrame of the history with the selected year's data.
+    """
+
+    if isinstance(df_historic, PartitionedHistory):
+        return df_historic.get_year(year)
+
+    return df_historic[df_historic["Year"] == year]
+
+
+def get_game_data(
+    df_historic: pd.DataFrame | PartitionedHistory,
+    game_id: int,
+) -> pd.DataFrame:
+
+    """
+    Returns the achievements earned in a game.
+    
+    Parameters:
+        
+        df_historic (pandas.DataFrame | PartitionedHistory):
+            Some user's RetroAchievements achievement history.
+            
+        game_id (int):
+            The RetroAchievements ID of the desired game.
+            
+    Returns:
+        
+        pandas.DataFrame:
+            Sub-DataFrame of the history with the selected game's data.
+    """
+
+    if isinstance(df_historic, PartitionedHistory):
+        return df_historic.get_game(game_id)
+
+    return df_historic[df_historic["GameID"] == game_id]
+
+
+def get_game_ids(
+    df_historic: pd.DataFrame,
+) -> np.ndarray:
+    
+    """
+    Returns all the game IDs contained in a DataFrame containing the user's metadata.
+    
+    Parameters:
+
+        df (pandas.DataFrame):
+            A DataFrame containing the user's RA metadata.
+
+    Returns:
+        
+        numpy.array (dtype=int):
+            Array containing all the game IDs.
+    """
+
+    return df_historic["GameID"].unique()
+
+
+def get_game_title(
+    game_id: int,
+    df_games_data: pd.DataFrame | LookupIndex,
+) -> str:
+    
+    """
+    Returns all the game IDs contained in a DataFrame containing the user's metadata.
+    
+    Parameters:
+        
+        game_id (int):
+            The RetroAchievements ID of the desired game.
+
+        df_games_data (pandas.DataFrame | LookupIndex):
+           A DataFrame containing RA's metadata of some games including the desired one.
+
+    Returns:
+        
+        str:
+            Title of the desired game.
+    """
+
+    if isinstance(df_games_data, LookupIndex):
+        return df_games_data.get_game_title(game_id)
+
+    return df_games_data[df_games_data["ID"] == game_id]["Title"].values[0]
+
+
+def get_game_console(
+    game_id: int,
+    df_historic: pd.DataFrame | LookupIndex,
+) -> str:
+    
+    """
+    Returns all the game IDs contained in a DataFrame containing the user's metadata.
+    
+    Parameters:
+        
+        game_id (int):
+            The RetroAchievements ID of the desired game.
+
+        df (pandas.DataFrame | LookupIndex):
+            A DataFrame containing the user's RA metadata.
+
+    Returns:
+        
+        str:
+            System of the desired game.
+    """
+
+    if isinstance(df_historic, LookupIndex):
+        return df_historic.get_game_console(game_id)
+
+    return df_historic[df_historic["GameID"] == game_id]["ConsoleName"].values[0]
+
+
+def format_cheevos_catalog(
+    df_cheevos: pd.DataFrame,
+) -> pd.DataFrame:
+
+    """
+    Build the achievement catalog from a table of achievements as sent by the
+    RetroAchievements API plus their game's ID.
+    
+    Parameters:
+        
+        df_cheevos (pandas.DataFrame):
+            DataFrame with a GameID column and the achievements' metadata.
+            
+    Returns:
+        
+        pandas.DataFrame:
+            The achievement catalog: the CHEEVOS_COLUMNS metadata with compact
+            types, indexed by GameID and AchievementID.
+    """
+
+    df_cheevos = df_cheevos.rename(columns={"ID": "AchievementID"}).reindex(columns=CHEEVOS_COLUMNS)
+
+    df_cheevos = set_column_dtypes(df_cheevos, CHEEVOS_DTYPES)
+
+    return df_cheevos.set_index(["GameID", "AchievementID"]).sort_index()
+
+
+def get_cheevos_catalog(
+    df_cheevos_data: pd.DataFrame | dict,
+) -> pd.DataFrame:
+
+    """
+    Returns the achievement catalog, building it if the achievements' metadata
+    comes as a dictionary of DataFrames per game.
+    
+    Parameters:
+        
+        df_cheevos_data (pandas.DataFrame | dict):
+            Achievement catalog, as returned by format_games_data, or
+            dictionary with the involved games' ID as keys and a Pandas
+            DataFrame containing the achievements' metadata as values.
+            
+    Returns:
+        
+        pandas.DataFrame:
+            The achievement catalog.
+    """
+
+    if isinstance(df_cheevos_data, pd.DataFrame):
+        return df_cheevos_data
+
+    if len(df_cheevos_data) == 0:
+        return format_cheevos_catalog(pd.DataFrame(columns=CHEEVOS_COLUMNS))
+
+    df_cheevos = pd.concat(df_cheevos_data.values(), keys=list(df_cheevos_data.keys()), names=["GameID", None])
+
+    return format_cheevos_catalog(df_cheevos.reset_index(level=0).reset_index(drop=True))
+
+
+def get_cheevo_data(
+    game_id: int,
+    df_cheevos_data: pd.DataFrame | dict,
+) -> pd.DataFrame:
+    
+    """
+    Retrieve the achievement list for a game with all the metadata.
+    
+    Parameters:
+        
+        game_id (int):
+            The RetroAchievements ID of the desired game.
+            
+        df_cheevos_data (pandas.DataFrame | dict):
+            Achievement catalog, as returned by format_games_data. A
+            dictionary of achievement DataFrames per game is accepted too.
+            
+    Returns:
+
+        pandas.DataFrame:
+            Pandas DataFrame containing the game's achievement metadata,
+            indexed by AchievementID.
+    """
+
+    if isinstance(df_cheevos_data, dict):
+        df_cheevos_data = get_cheevos_catalog({game_id: df_cheevos_data[game_id]})
+
+    return df_cheevos_data.loc[game_id]
+
+
+def get_games_cheevo_data(
+    game_ids: list,
+    df_cheevos_data: pd.DataFrame | dict,
+) -> pd.DataFrame:
+
+    """
+    Retrieve the part of the achievement catalog concerning some games.
+    
+    Parameters:
+        
+        game_ids (list):
+            The RetroAchievements IDs of the desired games. Those missing from
+            the catalog are ignored.
+            
+        df_cheevos_data (pandas.DataFrame | dict):
+            Achievement catalog, as returned by format_games_data. A
+            dictionary of achievement DataFrames per game is accepted too.
+            
+    Returns:
+        
+        pandas.DataFrame:
+            The achievement catalog of the desired games.
+    """
+
+    if isinstance(df_cheevos_data, dict):
+        return get_cheevos_catalog({game_id: df_cheevos_data[game_id] for game_id in game_ids if game_id in df_cheevos_data})
+
+    return df_cheevos_data[df_cheevos_data.index.get_level_values("GameID").isin(game_ids)]
+
+
+def concat_cheevo_data(
+    df_cheevos_data: pd.DataFrame | dict,
+    columns: list,
+) -> pd.DataFrame:
+
+    """
+    Put the achievement metadata of every game in a single flat table.
+    
+    Parameters:
+        
+        df_cheevos_data (pandas.DataFrame | dict):
+            Achievement catalog, as returned by format_games_data. A
+            dictionary of achievement DataFrames per game is accepted too.
+            
+        columns (list):
+            Achievement metadata columns to keep.
+            
+    Returns:
+        
+        pandas.DataFrame:
+            DataFrame with the GameID and AchievementID columns plus the
+            requested ones.
+    """
+
+    df_cheevos = get_cheevos_catalog(df_cheevos_data)[columns].reset_index()
+
+    return df_cheevos.astype({"AchievementID": "int64", "GameID": "int64"})
+
+
+def check_mastered(
+    game_id: int,
+    df_game: pd.DataFrame,
+    df_cheevos_data: pd.DataFrame | dict,
+) -> bool:
+    
+    """
+    Check if a specific game was mastered.
+    
+    Parameters:
+        
+        game_id (int):
+            The RetroAchievements ID of the desired game.
+            
+        df_game (pandas.DataFrame):
+            DataFrame containing the user's RA metadata regarding the desired game.
+            
+        df_cheevos_data (pandas.DataFrame | dict):
+            Achievement catalog, as returned by format_games_data. A
+            dictionary of achievement DataFrames per game is accepted too.
+            
+    Returns:
+        
+        bool:
+            True if the game was mastered.
+    """
+
+    df_cheevos = get_cheevo_data(game_id, df_cheevos_data)
+
+    return len(df_game) == len(df_cheevos)
+
+
+def check_beaten(
+    game_id: int,
+    df_game: pd.DataFrame,
+    df_cheevos_data: pd.DataFrame | dict,
+) -> bool:
+    
+    """
+    Check if a specific game was beaten.
+    
+    Parameters:
+        
+        game_id (int):
+            The RetroAchievements ID of the desired game.
+            
+        df_game (pandas.DataFrame):
+            DataFrame containing the user's RA metadata regarding the desired game.
+            
+        df_cheevos_data (pandas.DataFrame | dict):
+            Achievement catalog, as returned by format_games_data. A
+            dictionary of achievement DataFrames per game is accepted too.
+            
+    Returns:
+        
+        bool:
+            True if the game was beaten.
+    """
+
+    df_cheevos = get_cheevo_data(game_id, df_cheevos_data)
+
+    earned_cheevos = df_cheevos.index.isin(df_game["AchievementID"].to_numpy())
+
+    # If one Progression achievement is missing, return False
+    
+    if not earned_cheevos[(df_cheevos["type"] == "progression").to_numpy()].all():
+        return False
+    
+    win_condition_cheevos = (df_cheevos["type"] == "win_condition").to_numpy()
+    
+    # If all Progression achievements are there but there is no Win Condition, return True
+    
+    if not win_condition_cheevos.any():
+        return True
+    
+    # If one Win Condition achievement is present, return True
+
+    return bool(earned_cheevos[win_condition_cheevos].any())
+
+
+@instrumented("Completion")
+def get_completion_data(
+    df_historic: pd.DataFrame | PartitionedHistory,
+    df_cheevos_data: pd.DataFrame | dict,
+) -> pd.DataFrame:
+
+    """
+    Check which games were beaten and mastered, and when, all at once.
+    
+    A game is beaten once all of its Progression achievements and, if it has
+    any, one of its Win Condition achievements are earned. Games without
+    either kind are always considered beaten, with no date. A game is
+    mastered once as many achievements as the set has are earned.
+    
+    Parameters:
+        
+        df_historic (pandas.DataFrame | PartitionedHistory):
+            Some user's RetroAchievements achievement history.
+            
+        df_cheevos_data (pandas.DataFrame | dict):
+            Achievement catalog, as returned by format_games_data. A
+            dictionary of achievement DataFrames per game is accepted too.
+            
+    Returns:
+        
+        pandas.DataFrame:
+            DataFrame with the games' ID as index and the columns
+            'Achievement count', 'Achievement total', 'Beaten', 'Beaten date',
+            'Beaten year', 'Mastered', 'Mastered date' and 'Mastered year'.
+            Dates are UNIX timestamps and, as years, missing if the game was
+            not beaten or mastered.
+    """
+
+    df_earned = get_historic_df(df_historic)[["GameID", "AchievementID", "Date"]]
+
+    df_cheevos = concat_cheevo_data(df_cheevos_data, ["type"])
+
+    df_earned = df_earned.astype({"AchievementID": "int64", "GameID": "int64"})
+
+    game_ids = pd.Index(df_cheevos["GameID"].unique(), name="GameID")
+
+    df_completion = pd.DataFrame(index=game_ids)
+
+    # Mastery: as many achievements earned as the set has, the last one
+    # earned being the one that completes it
+
+    earned_by_game = df_earned.groupby("GameID")["Date"]
+
+    df_completion["Achievement count"] = earned_by_game.size().reindex(game_ids, fill_value=0)
+    df_completion["Achievement total"] = df_cheevos.groupby("GameID").size().reindex(game_ids, fill_value=0)
+
+    df_completion["Mastered"] = df_completion["Achievement count"] == df_completion["Achievement total"]
+
+    df_completion["Mastered date"] = earned_by_game.max().reindex(game_ids).where(df_completion["Mastered"])
+
+    # Progression: all of them must be earned, the last one earned being the
+    # one that completes the requirement
+
+    df_progression = df_cheevos[df_cheevos["type"] == "progression"].merge(df_earned, on=["GameID", "AchievementID"], how="left")
+
+    progression_by_game = df_progression.groupby("GameID")["Date"]
+
+    progression_total  = progression_by_game.size().reindex(game_ids, fill_value=0)
+    progression_earned = progression_by_game.count().reindex(game_ids, fill_value=0)
+    progression_date   = progression_by_game.max().reindex(game_ids)
+
+    # Win condition: one of them is enough, so the first one earned
+
+    df_win_condition = df_cheevos[df_cheevos["type"] == "win_condition"]
+
+    win_condition_total = df_win_condition.groupby("GameID").size().reindex(game_ids, fill_value=0)
+    win_condition_date  = (df_win_condition.merge(df_earned, on=["GameID", "AchievementID"], how="inner")
+                                           .groupby("GameID")["Date"].min()
+                                           .reindex(game_ids))
+
+    df_completion["Beaten"] = ((progression_earned == progression_total) &
+                               ((win_condition_total == 0) | win_condition_date.notna()))
+
+    df_completion["Beaten date"] = (pd.concat([progression_date, win_condition_date], axis=1)
+                                      .max(axis=1)
+                                      .where(df_completion["Beaten"]))
+
+    # Convert dates to nullable integers and get their years
+
+    for column in ("Beaten", "Mastered"):
+
+        dates = df_completion[column + " date"].astype("Int64")
+
+        df_completion[column + " date"] = dates
+        df_completion[column + " year"] = pd.to_datetime(dates, unit="s").dt.year.astype("Int16")
+
+    return df_completion[["Achievement count",
+                          "Achievement total",
+                          "Beaten",
+                          "Beaten date",
+                          "Beaten year",
+                          "Mastered",
+                          "Mastered date",
+                          "Mastered year"]]
+
+
+def get_most_point_game(
+    df_historic: pd.DataFrame,
+) -> tuple:
+    
+    """
+    Get the game with the most points and its point total from a historic.
+    
+    Parameters:
+        
+        df_historic (pandas.DataFrame):
+            Some user's RetroAchievements achievement history
+            
+    Returns:
+        
+        tuple:
+            GameID and point total of the game with most points.
+    """
+
+    points_by_game_sorted = df_historic.groupby('GameID')['Points'].sum().sort_values(ascending=False)
+
+    return points_by_game_sorted.index[0], points_by_game_sorted.values[0]
+
+
+def get_most_retropoint_game(
+    df_historic: pd.DataFrame,
+) -> tuple:
+    
+    """
+    Get the game with the most RetroPoints and its RetroPoint total from a
+    historic.
+    
+    Parameters:
+        
+        df_historic (pandas.DataFrame):
+            Some user's RetroAchievements achievement history
+            
+    Returns:
+        
+        tuple:
+            GameID and RetroPoint total of the game with most RetroPoints.
+    """
+
+    retropoints_by_game_sorted = df_historic.groupby('GameID')['TrueRatio'].sum().sort_values(ascending=False)
+
+    return retropoints_by_game_sorted.index[0], retropoints_by_game_sorted.values[0]
+
+
+def get_most_cheevo_game(
+    df_historic: pd.DataFrame,
+) -> tuple:
+    
+    """
+    Get the game with the most achievements and its achievement total from a
+    historic.
+    
+    Parameters:
+        
+        df_historic (pandas.DataFrame):
+            Some user's RetroAchievements achievement history
+            
+    Returns:
+        
+        tuple:
+            GameID and achievement total of the game with most achievements.
+    """
+
+    game_counts = df_historic['GameID'].value_counts()
+
+    return game_counts.index[0], game_counts.iloc[0]
+
+
+class LRUCache:
+
+    """
+    Thread safe dictionary that discards its least recently used entries once
+    the total size of its values exceeds a limit.
+    
+    Parameters:
+        
+        max_size (int):
+            Maximum total size of the stored values.
+            
+        size_func (callable, optional):
+            Function returning the size of a value. By default, its length.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        size_func= len,
+    ):
+
+        self.max_size = max_size
+        self.size_func = size_func
+
+        self.size = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(
+        self,
+    ) -> int:
+
+        return len(self._entries)
+
+    def __contains__(
+        self,
+        key,
+    ) -> bool:
+
+        return key in self._entries
+
+    def get(
+        self,
+        key,
+        default= None,
+    ):
+
+        """
+        Returns the value stored for a key, marking it as recently used.
+        """
+
+        with self._lock:
+
+            if key not in self._entries:
+                return default
+
+            self._entries.move_to_end(key)
+
+            return self._entries[key][0]
+
+    def put(
+        self,
+        key,
+        value,
+    ):
+
+        """
+        Store a value, discarding the least recently used entries if needed.
+        Values bigger than the whole cache are not stored.
+        """
+
+        value_size = self.size_func(value)
+
+        with self._lock:
+
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+
+            if value_size > self.max_size:
+                return
+
+            self._entries[key] = (value, value_size)
+            self.size += value_size
+
+            while self.size > self.max_size:
+                self.size -= self._entries.popitem(last=False)[1][1]
+
+    def resize(
+        self,
+        max_size: int,
+    ):
+
+        """
+        Change the maximum total size, discarding the least recently used
+        entries if needed.
+        """
+
+        with self._lock:
+
+            self.max_size = max_size
+
+            while self.size > self.max_size:
+                self.size -= self._entries.popitem(last=False)[1][1]
+
+    def clear(
+        self,
+    ):
+
+        """
+        Remove every entry.
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+# Downloaded images are kept both in memory and, if they never change, on
+# disk under the cache folder
+
+image_memory_cache = LRUCache(DEFAULT_IMAGE_MEMORY_CACHE_SIZE)
+image_cache_dir = os.path.join(DEFAULT_CACHE_DIR, "images")
+
+
+def configure_image_cache(
+    max_memory: int | None= None,
+    cache_dir: str | None= None,
+    disk_cache: bool= True,
+):
+
+    """
+    Change the settings of the image cache. Unspecified settings are kept.
+    
+    Parameters:
+        
+        max_memory (int, optional):
+            Maximum memory in bytes taken by the images kept in memory.
+            
+        cache_dir (str, optional):
+            Folder where images are stored on disk.
+            
+        disk_cache (bool, optional):
+            Set to False to not store images on disk.
+    """
+
+    global image_cache_dir
+
+    if max_memory is not None:
+        image_memory_cache.resize(max_memory)
+
+    if not disk_cache:
+        image_cache_dir = None
+    elif cache_dir is not None:
+        image_cache_dir = cache_dir
+    elif image_cache_dir is None:
+        image_cache_dir = os.path.join(DEFAULT_CACHE_DIR, "images")
+
+
+def clear_image_cache(
+    disk: bool= False,
+):
+
+    """
+    Remove the images kept in memory.
+    
+    Parameters:
+        
+        disk (bool, optional):
+            If True, the images stored on disk are removed as well.
+    """
+
+    image_memory_cache.clear()
+
+    if disk and image_cache_dir is not None and os.path.isdir(image_cache_dir):
+        for folder, _, files in os.walk(image_cache_dir):
+            for name in files:
+                os.remove(os.path.join(folder, name))
+
+
+# Trace properties that hold one value per point, which take most of a
+# figure's memory
+
+FIGURE_ARRAY_PROPERTIES = ["x", "y", "z", "text", "hovertext", "customdata", "values", "labels"]
+
+
+def get_array_size(
+    values,
+) -> int:
+
+    """
+    Returns the approximate memory taken by the values of a trace property.
+    
+    Parameters:
+        
+        values (numpy.ndarray | list | tuple | str | None):
+            The values, as stored by plotly.
+            
+    Returns:
+        
+        int:
+            Bytes of numeric arrays, plus the length of the strings.
+    """
+
+    if values is None:
+        return 0
+
+    if isinstance(values, str):
+        return len(values)
+
+    if isinstance(values, np.ndarray) and values.dtype != object:
+        return values.nbytes
+
+    if isinstance(values, (list, tuple, np.ndarray)):
+        return sum(get_array_size(value) if isinstance(value, (str, list, tuple, np.ndarray)) else 8 for value in values)
+
+    return sys.getsizeof(values)
+
+
+def get_rendered_size(
+    outputs: list,
+) -> int:
+
+    """
+    Returns the approximate memory taken by some rendered output, without
+    serializing the figures.
+    
+    Parameters:
+        
+        outputs (list):
+            HTML code strings and plotly figures.
+            
+    Returns:
+        
+        int:
+            Length of the HTML code plus the size of the figures' data
+            arrays.
+    """
+
+    size = 0
+
+    for output in outputs:
+        if isinstance(output, str):
+            size += len(output)
+        elif isinstance(output, go.Figure):
+            size += sum(get_array_size(trace[name]) for trace in output.data for name in FIGURE_ARRAY_PROPERTIES if name in trace)
+        else:
+            size += sys.getsizeof(output)
+
+    return size
+
+
+# Rendered yearly reports, per user, year and Hardcore mode
+
+render_cache = LRUCache(DEFAULT_RENDER_CACHE_SIZE, size_func=get_rendered_size)
+
+
+def configure_render_cache(
+    max_memory: int,
+):
+
+    """
+    Change the maximum memory taken by the rendered reports kept in memory.
+    
+    Parameters:
+        
+        max_memory (int):
+            Maximum memory in bytes. Set to 0 to disable the cache.
+    """
+
+    render_cache.resize(max_memory)
+
+
+def clear_render_cache(
+):
+
+    """
+    Remove the rendered reports kept in memory, e.g. after retrieving newer
+    data.
+    """
+
+    render_cache.clear()
+
+
+def get_rendered_output(
+    username: str,
+    year: int,
+    hardcore_mode_only: bool,
+    render,
+) -> list:
+
+    """
+    Returns the rendered report of a user and year, rendering it only if it
+    is not in the render cache.
+    
+    Parameters:
+        
+        username (str):
+            The user's RetroAchievements username.
+            
+        year (int):
+            Year of the report.
+            
+        hardcore_mode_only (bool):
+            True if Softcore data was left out.
+            
+        render (callable):
+            Function without arguments returning the rendered report as a
+            list of HTML code strings and plotly figures.
+            
+    Returns:
+        
+        list:
+            The rendered report. It is shared with the cache, so it should
+            not be modified.
+    """
+
+    key = (username.lower(), int(year), hardcore_mode_only)
+
+    outputs = render_cache.get(key)
+
+    if outputs is not None:
+        count_event("Render cache hits")
+        return outputs
+
+    count_event("Render cache misses")
+
+    outputs = render()
+
+    render_cache.put(key, outputs)
+
+    return outputs
+
+
+def get_image_cache_path(
+    url: str,
+) -> str | None:
+
+    """
+    Returns the path where an image is stored in the disk cache.
+    
+    Parameters:
+        
+        url (str):
+            URL of the picture.
+            
+    Returns:
+        
+        str | None:
+            Path of the image file, or None if the image should not be stored
+            on disk.
+    """
+
+    if image_cache_dir is None:
+        return
+
+    split_url = urlsplit(url)
+
+    if split_url.path.strip("/").split("/")[0] not in IMMUTABLE_MEDIA_FOLDERS:
+        return
+
+    # Files are named after a hash of the media path, spread in subfolders
+
+    digest = hashlib.sha256((split_url.netloc + split_url.path).encode("utf-8")).hexdigest()
+    extension = os.path.splitext(split_url.path)[1]
+
+    return os.path.join(image_cache_dir, digest[:2], digest + extension)
+
+
+def retrieve_image_bytes(
+    url: str,
+) -> bytes | None:
+    
+    """
+    Get the contents of an image file from the web, looking for it in the
+    memory and disk caches first.
+    
+    Parameters:
+        
+        url (str):
+            URL of the picture to download.
+            
+    Returns:
+        
+        bytes | None:
+            The requested image file contents, or None if it could not be
+            downloaded.
+    """
+
+    # Memory cache
+
+    content = image_memory_cache.get(url)
+
+    if content is not None:
+        count_event("Image memory cache hits")
+        return content
+
+    # Disk cache
+
+    path = get_image_cache_path(url)
+
+    if path is not None:
+        try:
+            with open(path, "rb") as file:
+                content = file.read()
+            count_event("Image disk cache hits")
+        except OSError:
+            pass
+
+    # Download
+
+    if content is None:
+
+        count_event("Image downloads")
+
+        response = http_get(url)
+
+        if response.status_code != 200:
+            print(f"Failed to download image. Status code: {response.status_code}")
+            return
+
+        content = response.content
+
+        if path is not None:
+            
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+
+            with open(tmp_path, "wb") as file:
+                file.write(content)
+
+            os.replace(tmp_path, path)
+
+    image_memory_cache.put(url, content)
+
+    return content
+
+
+def retrieve_image(
+    url: str,
+) -> Image.Image | None:
+    
+    """
+    Get an image from the web. Images already downloaded are taken from the
+    image cache.
+    
+    Parameters:
+        
+        url (str):
+            URL of the picture to download.
+            
+    Returns:
+        
+        Image:
+            The requested image.
+    """
+
+    content = retrieve_image_bytes(url)
+
+    if content is None:
+        return
+
+    return Image.open(BytesIO(content))
+
+
+def retrieve_image_as_fig(
+    url: str,
+):
+    
+    """
+    Get an image from the web as a plottable figure.
+    
+    Parameters:
+        
+        url (str):
+            URL of the picture to download.
+            
+    Returns:
+        
+        matplotlib.figure.Figure:
+            The requested image as a plottable figure.
+    """
+
+    img = retrieve_image(url)
+
+    if img == None:
+        return
+    
+    fig, ax = plt.subplots(figsize=(1, 1))
+    ax.axis('off')
+    
+    ax.imshow(img)
+
+    plt.close(fig)
+    
+    return fig
+
+
+def retrieve_image_in_format(
+    url: str,
+    image_format: str= "figure",
+):
+
+    """
+    Get an image from the web in the requested format.
+    
+    Parameters:
+        
+        url (str):
+            URL of the picture to download.
+            
+        image_format (str, optional):
+            'figure' for a plottable figure, 'bytes' for the downloaded file
+            contents or 'array' for a uint8 array of RGBA pixels.
+            
+    Returns:
+        
+        matplotlib.figure.Figure | bytes | numpy.ndarray | None:
+            The requested image, or None if it could not be downloaded.
+    """
+
+    if image_format == "figure":
+        return retrieve_image_as_fig(url)
+
+    elif image_format == "bytes":
+        return retrieve_image_bytes(url)
+
+    elif image_format == "array":
+        
+        img = retrieve_image(url)
+        
+        if img is None:
+            return
+        
+        return np.asarray(img.convert("RGBA"))
+
+    else:
+        raise ValueError(f"'image_format' argument should be one of 'figure', 'bytes' or 'array', but was '{image_format}'.")
+
+
+def get_image_data_uri(
+    image,
+) -> str:
+
+    """
+    Returns an image encoded as a data URI, ready to be embedded in HTML.
+    
+    Parameters:
+        
+        image (bytes | numpy.ndarray | matplotlib.figure.Figure):
+            An image in any of the formats returned by retrieve_image_in_format.
+            Downloaded file contents are embedded as they are, the rest are
+            encoded as PNG.
+            
+    Returns:
+        
+        str:
+            The image as a base64 data URI.
+    """
+
+    if isinstance(image, bytes):
+        
+        content = image
+
+        # Guess the file type from its first bytes
+
+        if content.startswith(b"\xff\xd8"):
+            mime_type = "image/jpeg"
+        elif content.startswith(b"GIF8"):
+            mime_type = "image/gif"
+        else:
+            mime_type = "image/png"
+            
+    else:
+
+        buffer = BytesIO()
+
+        if isinstance(image, np.ndarray):
+            Image.fromarray(image).save(buffer, format="png")
+        else:
+            image.savefig(buffer, format="png", bbox_inches="tight")
+
+        content = buffer.getvalue()
+        mime_type = "image/png"
+
+    return f"data:{mime_type};base64," + base64.b64encode(content).decode("utf-8")
+
+
+@instrumented("Images")
+def prefetch_images(
+    urls: dict,
+    max_workers: int= DEFAULT_MAX_WORKERS,
+    image_format: str= "figure",
+) -> dict:
+
+    """
+    Get some images from the web, downloading them concurrently.
+    
+    Parameters:
+        
+        urls (dict):
+            Dictionary with any hashable keys and the URLs of the pictures to
+            download as values.
+            
+        max_workers (int, optional):
+            Maximum number of downloads at the same time.
+            
+        image_format (str, optional):
+            Format of the returned images, see retrieve_image_in_format.
+            
+    Returns:
+        
+        dict:
+            Dictionary with the same keys and the requested images as values,
+            or None for the images that could not be downloaded.
+    """
+
+    # Download every distinct image once, which leaves them in the image cache
+
+    contents, errors = fetch_concurrently(retrieve_image_bytes, list(set(urls.values())), max_workers=max_workers)
+
+    for url, error in errors.items():
+        print(f"Failed to download image {url}: {error}")
+
+    # Images that were not sent back, already reported, are failures too and
+    # are not requested again
+
+    failed = set(errors) | {url for url, content in contents.items() if content is None}
+
+    # Build the figures from the cached images
+
+    return {key: None if url in failed else retrieve_image_in_format(url, image_format) for key, url in urls.items()}
+
+
+def get_media_url(
+    path: str,
+) -> str:
+    
+    """
+    Get the URL of a file of the RetroAchievements media host.
+    
+    Parameters:
+        
+        path (str):
+            Path of the file, as given by the API (e.g. '/Badge/1234.png').
+            
+    Returns:
+        
+        str:
+            URL of the file.
+    """
+
+    return http_settings["Media base URL"] + path
+
+
+def get_game_icon_url(
+    df_historic: pd.DataFrame | LookupIndex,
+    game_id: int,
+) -> str:
+    
+    """
+    Get the URL of the icon of a game registered in RetroAchievements.
+    
+    Parameters:
+        
+        df_historic (pandas.DataFrame | LookupIndex):
+            Some user's RetroAchievements achievement history.
+            
+        game_id (int):
+            The RetroAchievements ID of the desired game.
+            
+    Returns:
+        
+        str:
+            URL of the game's icon.
+    """
+
+    if isinstance(df_historic, LookupIndex):
+        return get_media_url(df_historic.get_game_icon(game_id))
+
+    return get_media_url(df_historic[df_historic["GameID"] == game_id]["GameIcon"].values[0])
+
+
+def get_user_icon_url(
+    username: str,
+) -> str:
+    
+    """
+    Get the URL of the icon of a user registered in RetroAchievements.
+    
+    Parameters:
+        
+        username (str):
+            The user's RetroAchievements username
+            
+    Returns:
+        
+        str:
+            URL of the user's icon.
+    """
+
+    return get_media_url("/UserPic/" + username + ".png")
+
+
+def get_game_icon(
+    df_historic: pd.DataFrame | LookupIndex,
+    game_id: int,
+):
+    
+    """
+    Get the icon of a game registered in RetroAchievements.
+    
+    Parameters:
+        
+        df_historic (pandas.DataFrame | LookupIndex):
+            Some user's RetroAchievements achievement history.
+            
+        game_id (int):
+            The RetroAchievements ID of the desired game.
+            
+    Returns:
+        
+        Image:
+            The requested image.
+    """
+
+    url = get_game_icon_url(df_historic, game_id)
+
+    return retrieve_image(url)
+
+
+def get_game_icon_fig(
+    df_historic: pd.DataFrame | LookupIndex,
+    game_id: int,
+):
+    
+    """
+    Get the icon of a game registered in RetroAchievements as a plottable
+    figure.
+    
+    Parameters:
+        
+        df_historic (pandas.DataFrame | LookupIndex):
+            Some user's RetroAchievements achievement history.
+            
+        game_id (int):
+            The RetroAchievements ID of the desired game.
+            
+    Returns:
+        
+        matplotlib.figure.Figure:
+            The requested image as a plottable figure.
+    """
+
+    url = get_game_icon_url(df_historic, game_id)
+
+    return retrieve_image_as_fig(url)
+
+
+def get_cheevo_badge_fig(
+    df: pd.DataFrame | LookupIndex,
+    cheevo_id: int,
+):
+    
+    """
+    Get the badge of a RetroAchievements achievement as a plottable figure.
+    
+    Parameters:
+        
+        df_historic (pandas.DataFrame | LookupIndex):
+            Some user's RetroAchievements achievement history.
+            
+        cheevo_id (int):
+            The RetroAchievements ID of the desired achievement.
+            
+    Returns:
+        
+        matplotlib.figure.Figure:
+            The requested image as a plottable figure.
+    """
+    
+    if isinstance(df, LookupIndex):
+        url = get_media_url(df.get_cheevo_badge(cheevo_id))
+    else:
+        url = get_media_url(df[df["AchievementID"] == cheevo_id]["BadgeURL"].values[0])
+
+    return retrieve_image_as_fig(url)
+
+
+def get_user_icon_fig(
+    username: str,
+):
+    
+    """
+    Get the icon of a user registered in RetroAchievements as a plottable
+    figure.
+    
+    Parameters:
+        
+        username (str):
+            The user's RetroAchievements username
+            
+    Returns:
+        
+        matplotlib.figure.Figure:
+            The requested image as a plottable figure.
+    """
+
+    url = get_user_icon_url(username)
+    
+    return retrieve_image_as_fig(url)
+
+
+def set_column_dtypes(
+    df: pd.DataFrame,
+    dtypes: dict,
+) -> pd.DataFrame:
+
+    """
+    Convert the columns of a DataFrame to compact types.
+    
+    Parameters:
+        
+        df (pandas.DataFrame):
+            Any DataFrame.
+            
+        dtypes (dict):
+            Dictionary with column names as keys and types as values. Missing
+            columns are ignored, as are integer columns with missing values.
+            
+    Returns:
+        
+        pandas.DataFrame:
+            The DataFrame with the converted columns.
+    """
+
+    dtypes = {column: dtype for column, dtype in dtypes.items()
+              if column in df.columns and (dtype == "category" or not df[column].isna().any())}
+
+    return df.astype(dtypes)
+
+
+def split_dates(
+    df: pd.DataFrame,
+    dates: pd.Series,
+) -> pd.DataFrame:
+
+    """
+    Add the Year, Month, Day, Hour, Minute and Date (UNIX timestamp) columns
+    to a DataFrame from a Series of dates.
+    
+    Parameters:
+        
+        df (pandas.DataFrame):
+            Any DataFrame.
+            
+        dates (pandas.Series):
+            Series of datetimes aligned with df.
+            
+    Returns:
+        
+        pandas.DataFrame:
+            The DataFrame with the date columns.
+    """
+
+    df["Year"]   = dates.dt.year
+    df["Month"]  = dates.dt.month
+    df["Day"]    = dates.dt.day
+    df["Hour"]   = dates.dt.hour
+    df["Minute"] = dates.dt.minute
+
+    df["Date"] = (dates - pd.Timestamp(0)) // pd.Timedelta(seconds=1)
+
+    return df
+
+
+def get_games_cache_path(
+    game_id: int,
+    cache_dir: str= DEFAULT_CACHE_DIR,
+) -> str:
+
+    """
+    Returns the path of the file where a game's metadata is cached.
+    
+    Parameters:
+        
+        game_id (int):
+            The RetroAchievements ID of the desired game.
+            
+        cache_dir (str, optional):
+            Folder where the cached data is stored.
+            
+    Returns:
+        
+        str:
+            Path of the game's cache file.
+    """
+
+    return os.path.join(cache_dir, "games", f"{int(game_id)}.json")
+
+
+def load_cached_game_data(
+    game_id: int,
+    cache_dir: str= DEFAULT_CACHE_DIR,
+    ttl: float= DEFAULT_GAMES_CACHE_TTL,
+) -> dict | None:
+
+    """
+    Get the metadata of a game as returned by API_GetGameExtended.php from the
+    local cache.
+    
+    Parameters:
+        
+        game_id (int):
+            The RetroAchievements ID of the desired game.
+            
+        cache_dir (str, optional):
+            Folder where the cached data is stored.
+            
+        ttl (float, optional):
+            Maximum age in seconds of the cached data. Older entries are
+            treated as missing. Use None to never expire entries.
+            
+    Returns:
+        
+        dict | None:
+            The game's metadata including its achievements, or None if the
+            game is not cached or its entry has expired.
+    """
+
+    path = get_games_cache_path(game_id, cache_dir)
+
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            entry = json.load(file)
+    except (OSError, ValueError):
+        return
+
+    if ttl is not None and time.time() - entry["FetchedAt"] > ttl:
+        return
+
+    # Entries without achievements are error messages cached by older versions
+
+    if "Achievements" not in entry["Data"]:
+        return
+
+    return entry["Data"]
+
+
+def store_cached_game_data(
+    game_id: int,
+    game_data: dict,
+    cache_dir: str= DEFAULT_CACHE_DIR,
+):
+
+    """
+    Store the metadata of a game as returned by API_GetGameExtended.php in the
+    local cache.
+    
+    Parameters:
+        
+        game_id (int):
+            The RetroAchievements ID of the desired game.
+            
+        game_data (dict):
+            The game's metadata including its achievements.
+            
+        cache_dir (str, optional):
+            Folder where the cached data is stored.
+    """
+
+    path = get_games_cache_path(game_id, cache_dir)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # Write to a temporary file first so that an interrupted run never leaves
+    # a half written entry behind
+
+    tmp_path = path + ".tmp"
+
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump({"FetchedAt": time.time(), "Data": game_data}, file)
+
+    os.replace(tmp_path, path)
+
+
+def invalidate_games_cache(
+    game_ids: list | None= None,
+    cache_dir: str= DEFAULT_CACHE_DIR,
+) -> int:
+
+    """
+    Remove games' metadata from the local cache so that it is requested again
+    on the next run.
+    
+    Parameters:
+        
+        game_ids (list, optional):
+            The RetroAchievements IDs of the games to remove. If not specified,
+            every cached game is removed.
+            
+        cache_dir (str, optional):
+            Folder where the cached data is stored.
+            
+    Returns:
+        
+        int:
+            Number of removed entries.
+    """
+
+    if game_ids is None:
+        
+        games_dir = os.path.join(cache_dir, "games")
+        
+        if not os.path.isdir(games_dir):
+            return 0
+        
+        paths = [os.path.join(games_dir, name) for name in os.listdir(games_dir) if name.endswith(".json")]
+        
+    else:
+        paths = [get_games_cache_path(game_id, cache_dir) for game_id in game_ids]
+
+    removed = 0
+
+    for path in paths:
+        try:
+            os.remove(path)
+            removed += 1
+        except FileNotFoundError:
+            pass
+
+    return removed
+
+
+def get_snapshot_path(
+    username: str,
+    cache_dir: str= DEFAULT_CACHE_DIR,
+) -> str:
+
+    """
+    Returns the default folder of a user's data snapshot.
+    
+    Parameters:
+        
+        username (str):
+            The user's RetroAchievements username.
+            
+        cache_dir (str, optional):
+            Folder where the cached data is stored.
+            
+    Returns:
+        
+        str:
+            Path of the snapshot folder.
+    """
+
+    return os.path.join(cache_dir, "snapshots", username.lower())
+
+
+def write_arrow_table(
+    df: pd.DataFrame,
+    path: str,
+) -> list:
+
+    """
+    Write a DataFrame to an Arrow IPC file. Columns holding lists or
+    dictionaries, which have no fixed columnar type, are stored as JSON text.
+    
+    Parameters:
+        
+        df (pandas.DataFrame):
+            The table.
+            
+        path (str):
+            Path of the file.
+            
+    Returns:
+        
+        list:
+            Names of the columns stored as JSON text.
+    """
+
+    json_columns = [column for column in df.columns
+                    if df[column].dtype == object and df[column].map(lambda value: isinstance(value, (list, dict))).any()]
+
+    if len(json_columns) > 0:
+        df = df.assign(**{column: df[column].map(json.dumps) for column in json_columns})
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    with pa.OSFile(path, "wb") as file:
+        with pa.ipc.new_file(file, table.schema) as writer:
+            writer.write_table(table)
+
+    return json_columns
+
+
+def read_arrow_table(
+    path: str,
+    json_columns: list,
+    memory_map: bool= True,
+) -> pd.DataFrame:
+
+    """
+    Read a DataFrame from an Arrow IPC file written by write_arrow_table.
+    
+    Parameters:
+        
+        path (str):
+            Path of the file.
+            
+        json_columns (list):
+            Names of the columns stored as JSON text.
+            
+        memory_map (bool, optional):
+            Whether to map the file in memory instead of reading it. Numeric
+            columns without missing values then use the mapped file as their
+            storage, without being copied. Other columns, such as text and
+            categories, are always converted into new memory.
+            
+    Returns:
+        
+        pandas.DataFrame:
+            The table.
+    """
+
+    source = pa.memory_map(path, "r") if memory_map else pa.OSFile(path, "rb")
+
+    # Each column is kept in its own block, since putting columns of the same
+    # type together would copy them out of the mapped file
+
+    with source:
+        df = pa.ipc.open_file(source).read_all().to_pandas(split_blocks=memory_map)
+
+    for column in json_columns:
+        df[column] = df[column].map(json.loads)
+
+    return df
+
+
+def save_snapshot(
+    snapshot_dir: str,
+    df_historic: pd.DataFrame,
+    df_awards: pd.DataFrame,
+    df_games_data: pd.DataFrame,
+    df_cheevos_data: pd.DataFrame | dict,
+    metadata: dict | None= None,
+):
+
+    """
+    Save all the retrieved data of a user to a snapshot folder: one Arrow IPC
+    file per table and a manifest. The folder is replaced as a whole, so an
+    interrupted save never leaves a broken snapshot behind. Needs pyarrow.
+    
+    Parameters:
+        
+        snapshot_dir (str):
+            Folder of the snapshot, see get_snapshot_path.
+            
+        df_historic (pandas.DataFrame):
+            Some user's RetroAchievements achievement history.
+            
+        df_awards (pandas.DataFrame):
+            Some user's RetroAchievements award history.
+            
+        df_games_data (pandas.DataFrame):
+            RetroAchievements metadata of the games that appear in df_historic.
+            
+        df_cheevos_data (pandas.DataFrame | dict):
+            Achievement catalog, as returned by format_games_data. A
+            dictionary of achievement DataFrames per game is accepted too.
+            
+        metadata (dict, optional):
+            Anything else to store in the manifest (username, mode...). It
+            must be JSON serializable.
+    """
+
+    if pa is None:
+        raise ImportError("Data snapshots need the pyarrow library, install it with 'pip install pyarrow'.")
+
+    tables = {
+        "Historic": df_historic,
+        "Awards": df_awards,
+        "Games": df_games_data,
+        "Achievements": get_cheevos_catalog(df_cheevos_data).reset_index(),
+    }
+
+    tmp_dir = snapshot_dir.rstrip(os.sep) + ".tmp"
+
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    manifest = {
+        "Format version": SNAPSHOT_FORMAT_VERSION,
+        "Created": time.time(),
+        "Metadata": metadata or {},
+        "Tables": {},
+    }
+
+    for name, df in tables.items():
+
+        json_columns = write_arrow_table(df, os.path.join(tmp_dir, SNAPSHOT_TABLES[name]))
+
+        manifest["Tables"][name] = {
+            "File": SNAPSHOT_TABLES[name],
+            "Rows": len(df),
+            "JSON columns": json_columns,
+        }
+
+    with open(os.path.join(tmp_dir, "manifest.json"), "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+
+    # Swap the new snapshot in
+
+    old_dir = snapshot_dir.rstrip(os.sep) + ".old"
+
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+    if os.path.isdir(snapshot_dir):
+        os.replace(snapshot_dir, old_dir)
+
+    os.replace(tmp_dir, snapshot_dir)
+
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def read_snapshot_manifest(
+    snapshot_dir: str,
+) -> dict | None:
+
+    """
+    Returns the manifest of a snapshot.
+    
+    Parameters:
+        
+        snapshot_dir (str):
+            Folder of the snapshot.
+            
+    Returns:
+        
+        dict | None:
+            The manifest, or None if there is no snapshot there or it was
+            saved in another format version.
+    """
+
+    try:
+        with open(os.path.join(snapshot_dir, "manifest.json"), "r", encoding="utf-8") as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return
+
+    if manifest.get("Format version") != SNAPSHOT_FORMAT_VERSION:
+        return
+
+    return manifest
+
+
+def load_snapshot(
+    snapshot_dir: str,
+    memory_map: bool= True,
+) -> tuple:
+
+    """
+    Load all the data of a user saved with save_snapshot. Needs pyarrow.
+    
+    Parameters:
+        
+        snapshot_dir (str):
+            Folder of the snapshot.
+            
+        memory_map (bool, optional):
+            Whether to map the files in memory instead of reading them. The
+            numeric columns without missing values are then used straight
+            from the mapped files, so processes loading the same snapshot
+            share those pages. The rest of the columns are copied.
+            
+    Returns:
+        
+        pandas.DataFrame:
+            The user's achievement history.
+            
+        pandas.DataFrame:
+            The user's award history.
+            
+        pandas.DataFrame:
+            The games' metadata.
+            
+        pandas.DataFrame:
+            The achievement catalog, indexed by GameID and AchievementID.
+    """
+
+    if pa is None:
+        raise ImportError("Data snapshots need the pyarrow library, install it with 'pip install pyarrow'.")
+
+    manifest = read_snapshot_manifest(snapshot_dir)
+
+    if manifest is None:
+        raise FileNotFoundError(f"No readable snapshot in {snapshot_dir}")
+
+    tables = {name: read_arrow_table(os.path.join(snapshot_dir, table["File"]), table["JSON columns"], memory_map)
+              for name, table in manifest["Tables"].items()}
+
+    df_cheevos_data = tables["Achievements"].set_index(["GameID", "AchievementID"])
+
+    return tables["Historic"], tables["Awards"], tables["Games"], df_cheevos_data
+
+
+def get_formatted_date(
+    day: int,
+    month: int,
+    year: int= 0,
+) -> str:
+
+    """
+    Returns a string representing the requested date.
+    
+    Parameters:
+        
+        day (int):
+            Day cardinal from 1 to 31.
+        month (int):
+            Month cardinal from 1 to 12.
+        year (int, optional):
+            Year, omitted if not specified.
+            
+    Returns:
+        
+        str:
+            A date formatted like '{month} {day}th, {year}'.
+    """
+
+    # Format the day
+
+    if day in (11, 12, 13):
+        day_str =  f"{day}th"
+    else:
+        last_digit = day % 10
+        if last_digit == 1:
+            day_str =  f"{day}st"
+        elif last_digit == 2:
+            day_str =  f"{day}nd"
+        elif last_digit == 3:
+            day_str =  f"{day}rd"
+        else:
+            day_str =  f"{day}th"
+
+    # Format the month
+
+    month_name = calendar.month_name[month]
+
+    # Return
+
+    if year == 0:
+        return f"{month_name} {day_str}"
+    else:
+        return f"{month_name} {day_str}, {year}"
+
+
+#####################
+# Complex functions #
+#####################
+
+
+@instrumented("History paging")
+async def retrieve_historic_records_async(
+    username: str,
+    api_key: str,
+    start_date_epoch: int= 0,
+    on_page= None,
+) -> list:
+    
+    """
+    Asynchronous version of retrieve_historic_records.
+    
+    Parameters:
+        
+        username (str):
+            The user's RetroAchievements username.
+            
+        api_key (str):
+            The user's RetroAchievements API key.
+            
+        start_date_epoch (int, optional):
+            Only achievements earned at or after this UNIX timestamp are
+            requested. The whole history is requested by default.
+            
+        on_page (callable, optional):
+            Function called with each batch of achievements as soon as it is
+            received.
+        
+    Returns:
+        
+        list:
+            The user's achievement history as a list of dictionaries, sorted
+            by date.
+    """
+    
+    # Set base URL
+    
+    func_url = http_settings["API base URL"] + "API_GetAchievementsEarnedBetween.php?"
+    
+    # Prepare arguments for the request
+    
+    end_date_epoch = calendar.timegm(datetime.datetime(2100, 1, 1, 0, 0, 0).timetuple())
+
+    args = [
+        "y=" + api_key,
+        "u=" + username,
+        "f=" + str(start_date_epoch),
+        "t=" + str(end_date_epoch),
+    ]
+    
+    # Request the first batch of achievements (HISTORIC_PAGE_SIZE/request max)
+
+    url = func_url + "&".join(args)
+    await api_rate_limiter.acquire_async()
+    response = check_response(await http_get_async(url)).json()
+
+    count_event("History pages")
+
+    if on_page is not None:
+        on_page(response)
+    
+    # Store first batch of achievements in the historic
+
+    historic = response
+    
+    # Keep repeating until there are no results left
+
+    while len(response) == HISTORIC_PAGE_SIZE:
+        
+        # Update arguments to get next batch based on start date
+        
+        new_start_date = response[-1]["Date"].replace("-", " ").replace(":", " ").split()
+        for i in range(6):
+            new_start_date[i] = int(new_start_date[i])
+        
+        start_date_epoch = calendar.timegm(datetime.datetime(*new_start_date).timetuple()) + 1
+
+        args[2] = "f=" + str(start_date_epoch)
+        
+        # Request the next batch achievements. Each batch starts where the
+        # previous one ended, so they are requested one after another and
+        # only the rate limiter spaces them out
+
+        url = func_url + "&".join(args)
+        await api_rate_limiter.acquire_async()
+        response = check_response(await http_get_async(url)).json()
+
+        count_event("History pages")
+
+        if on_page is not None:
+            on_page(response)
+        
+        # Store in the historic
+        
+        historic += response
+
+    return historic
+
+
+def retrieve_historic_records(
+    username: str,
+    api_key: str,
+    start_date_epoch: int= 0,
+) -> list:
+    
+    """
+    Make some requests to the RetroAchievements API and return the user's
+    achievement history as it is sent by the API.
+    
+    Parameters:
+        
+        username (str):
+            The user's RetroAchievements username.
+            
+        api_key (str):
+            The user's RetroAchievements API key.
+            
+        start_date_epoch (int, optional):
+            Only achievements earned at or after this UNIX timestamp are
+            requested. The whole history is requested by default.
+        
+    Returns:
+        
+        list:
+            The user's achievement history as a list of dictionaries, sorted
+            by date.
+    """
+
+    return run_sync(retrieve_historic_records_async(username, api_key, start_date_epoch))
+
+
+@instrumented("Formatting")
+def format_historic_df(
+    historic: list,
+) -> pd.DataFrame:
+    
+    """
+    Convert an achievement history as sent by the RetroAchievements API into
+    a DataFrame with the dates split into Year, Month, Day, Hour and Minute
+    columns.
+    
+    Parameters:
+        
+        historic (list):
+            Some user's achievement history as a list of dictionaries.
+        
+    Returns:
+        
+        df_historic (pandas.DataFrame):
+            The user's achievement history.
+    """
+
+    # Convert historic data to DataFrame format
+    
+    df_historic = pd.DataFrame(historic)
+    
+    # Format the dates in a more manageable way, parsing them all at once
+    
+    dates = pd.to_datetime(df_historic["Date"], format="%Y-%m-%d %H:%M:%S")
+
+    df_historic = split_dates(df_historic, dates)
+    
+    # Drop unused achievements data to save memory
+    
+    df_historic = df_historic.drop("GameURL", axis=1)
+
+    return set_column_dtypes(df_historic, HISTORIC_DTYPES)
+
+
+def retrieve_historic_df(
+    username: str,
+    api_key: str,
+    hardcore_mode_only: bool,
+) -> pd.DataFrame:
+    
+    """
+    Make some requests to the RetroAchievements API and return a DataFrame
+    containing the user's achievement history.
+    
+    Parameters:
+        
+        username (str):
+            The user's RetroAchievements username.
+            
+        api_key (str):
+            The user's RetroAchievements API key.
+            
+        hardcore_mode_only (bool, optional):
+            True if you want to exclude Softcore achievement data.
+        
+    Returns:
+        
+        df_historic (pandas.DataFrame):
+            The user's achievement history.
+    """
+
+    historic = retrieve_historic_records(username, api_key)
+
+    # Softcore achievements gained later on hardcore are not counted.
+    # To avoid misrepresenting data, we entirely drop softcore achievements
+    # if the user decides so.
+
+    if hardcore_mode_only:
+        historic = [cheevo for cheevo in historic if cheevo["HardcoreMode"] == 1]
+
+    return format_historic_df(historic)
+
+
+def iter_historic_chunks(
+    username: str,
+    api_key: str,
+    hardcore_mode_only: bool= False,
+    start_date_epoch: int= 0,
+):
+    
+    """
+    Request the user's achievement history page by page, yielding each page
+    as a formatted DataFrame as soon as it arrives. Only one page of raw
+    data is held in memory at a time.
+    
+    Parameters:
+        
+        username (str):
+            The user's RetroAchievements username.
+            
+        api_key (str):
+            The user's RetroAchievements API key.
+            
+        hardcore_mode_only (bool, optional):
+            True if you want to exclude Softcore achievement data.
+            
+        start_date_epoch (int, optional):
+            Only achievements earned at or after this UNIX timestamp are
+            requested. The whole history is requested by default.
+        
+    Yields:
+        
+        pandas.DataFrame:
+            Chunks of up to HISTORIC_PAGE_SIZE achievements, as
+            retrieve_historic_df would format them, sorted by date.
+    """
+
+    func_url = http_settings["API base URL"] + "API_GetAchievementsEarnedBetween.php?"
+
+    end_date_epoch = calendar.timegm(datetime.datetime(2100, 1, 1, 0, 0, 0).timetuple())
+
+    while True:
+
+        args = [
+            "y=" + api_key,
+            "u=" + username,
+            "f=" + str(start_date_epoch),
+            "t=" + str(end_date_epoch),
+        ]
+
+        api_rate_limiter.acquire()
+        page = check_response(http_get(func_url + "&".join(args))).json()
+
+        count_event("History pages")
+
+        if len(page) == 0:
+            return
+
+        # The next page starts right after the last achievement of this one
+
+        last_page = len(page) < HISTORIC_PAGE_SIZE
+        start_date_epoch = calendar.timegm(time.strptime(page[-1]["Date"], "%Y-%m-%d %H:%M:%S")) + 1
+
+        if hardcore_mode_only:
+            page = [cheevo for cheevo in page if cheevo["HardcoreMode"] == 1]
+
+        if len(page) > 0:
+            yield format_historic_df(page)
+
+        if last_page:
+            return
+
+
+def concat_historic_chunks(
+    chunks: list,
+) -> pd.DataFrame:
+    
+    """
+    Put together the chunks of an achievement history, as yielded by
+    iter_historic_chunks, into a single DataFrame.
+    
+    Parameters:
+        
+        chunks (list):
+            The formatted chunks, sorted by date.
+        
+    Returns:
+        
+        df_historic (pandas.DataFrame):
+            The user's achievement history.
+    """
+
+    # Each chunk has its own categories, so the types are set again
+
+    df_historic = pd.concat(chunks, ignore_index=True)
+
+    return set_column_dtypes(df_historic, HISTORIC_DTYPES)
+
+
+class YearlyTotalsAggregator:
+    
+    """
+    Running totals of an achievement history per year, fed one chunk at a
+    time: achievements, games, Hardcore and Softcore points and RetroPoints.
+    """
+
+    def __init__(
+        self,
+    ):
+
+        self.totals = None
+        self.games = set()
+
+    def update(
+        self,
+        df_chunk: pd.DataFrame,
+    ):
+
+        """
+        Add a chunk of the history to the totals.
+        """
+
+        hardcore = (df_chunk["HardcoreMode"] == 1).to_numpy()
+        points = df_chunk["Points"].to_numpy(dtype=np.int64)
+
+        df_totals = pd.DataFrame({
+            "Year": df_chunk["Year"].to_numpy(),
+            "Achievements": 1,
+            "Points": np.where(hardcore, points, 0),
+            "Softcore Points": np.where(hardcore, 0, points),
+            "RetroPoints": np.where(hardcore, df_chunk["TrueRatio"].to_numpy(dtype=np.int64), 0),
+        }).groupby("Year").sum()
+
+        if self.totals is None:
+            self.totals = df_totals
+        else:
+            self.totals = self.totals.add(df_totals, fill_value=0).astype("int64")
+
+        self.games.update(zip(df_chunk["Year"].to_numpy().tolist(), df_chunk["GameID"].to_numpy().tolist()))
+
+    def result(
+        self,
+    ) -> pd.DataFrame:
+
+        """
+        Returns a DataFrame with the years as index and the 'Achievements',
+        'Games', 'Points' (Hardcore), 'Softcore Points' and 'RetroPoints'
+        totals as columns.
+        """
+
+        if self.totals is None:
+            return pd.DataFrame(columns=["Achievements", "Games", "Points", "Softcore Points", "RetroPoints"])
+
+        df_totals = self.totals.copy()
+
+        df_totals.insert(1, "Games", pd.Series([year for year, _ in self.games]).value_counts().reindex(df_totals.index, fill_value=0))
+
+        return df_totals
+
+
+class DistributionAggregator:
+    
+    """
+    Running distribution of an achievement history per year and value of a
+    column (e.g. console or developer), fed one chunk at a time.
+    
+    Parameters:
+        
+        column (str):
+            Column to distribute by, like 'ConsoleName' or 'Author'.
+            
+        by (str, optional):
+            Count method (options: 'Achievements', 'Points', 'RetroPoints').
+            Achievements are counted once per row of the history.
+    """
+
+    def __init__(
+        self,
+        column: str,
+        by: str= "Achievements",
+    ):
+
+        if by not in ("Achievements", "Points", "RetroPoints"):
+            raise ValueError(f"'by' argument should be one of 'Achievements' 'Points' or 'RetroPoints', but was '{by}'.")
+
+        self.column = column
+        self.by = by
+
+        self.counts = None
+
+    def update(
+        self,
+        df_chunk: pd.DataFrame,
+    ):
+
+        """
+        Add a chunk of the history to the distribution.
+        """
+
+        # Plain labels, since every chunk has its own categories
+
+        keys = [df_chunk["Year"], df_chunk[self.column].astype(object)]
+
+        if self.by == "Achievements":
+            counts = df_chunk.groupby(keys).size()
+        elif self.by == "Points":
+            counts = df_chunk["Points"].astype("int64").groupby(keys).sum()
+        else:
+            counts = df_chunk["TrueRatio"].astype("int64").groupby(keys).sum()
+
+        if self.counts is None:
+            self.counts = counts
+        else:
+            self.counts = self.counts.add(counts, fill_value=0).astype("int64")
+
+    def result(
+        self,
+    ) -> dict:
+
+        """
+        Returns a dictionary with the years as keys and Series with the
+        column's values as index and their count as values.
+        """
+
+        if self.counts is None:
+            return {}
+
+        return {year: self.counts.loc[year] for year in self.counts.index.unique(level=0)}
+
+
+class DailyPointsAggregator:
+    
+    """
+    Running points per day of an achievement history, fed one chunk at a
+    time.
+    """
+
+    def __init__(
+        self,
+    ):
+
+        self.daily_points = {}
+
+    def update(
+        self,
+        df_chunk: pd.DataFrame,
+    ):
+
+        """
+        Add a chunk of the history to the daily points.
+        """
+
+        for year, df_year in df_chunk.groupby("Year"):
+
+            daily_points = get_daily_points(df_year, int(year))
+
+            if year in self.daily_points:
+                self.daily_points[year] += daily_points
+            else:
+                self.daily_points[year] = daily_points
+
+    def result(
+        self,
+    ) -> dict:
+
+        """
+        Returns a dictionary with the years as keys and the points earned each
+        day of the year, from the 1st of January on, as values.
+        """
+
+        return dict(self.daily_points)
+
+
+def stream_yearly_summary(
+    username: str,
+    api_key: str,
+    hardcore_mode_only: bool= False,
+    on_chunk= None,
+) -> dict:
+    
+    """
+    Build the yearly summary of a user while the history is retrieved,
+    without ever holding the whole history in memory.
+    
+    Parameters:
+        
+        username (str):
+            The user's RetroAchievements username.
+            
+        api_key (str):
+            The user's RetroAchievements API key.
+            
+        hardcore_mode_only (bool, optional):
+            True if you want to exclude Softcore achievement data.
+            
+        on_chunk (callable, optional):
+            Function called with each formatted chunk of the history, e.g. to
+            keep them for concat_historic_chunks.
+        
+    Returns:
+        
+        dict:
+            Dictionary with the years as keys and dictionaries with the 'Game
+            total', 'Achievements total', 'Points total', 'Softcore Points
+            total' and 'RetroPoints total', and the 'System distribution' and
+            'Dev distribution' of achievements and the 'Daily points' as
+            values.
+    """
+
+    totals = YearlyTotalsAggregator()
+    systems = DistributionAggregator("ConsoleName")
+    devs = DistributionAggregator("Author")
+    daily = DailyPointsAggregator()
+
+    for df_chunk in iter_historic_chunks(username, api_key, hardcore_mode_only):
+
+        for aggregator in (totals, systems, devs, daily):
+            aggregator.update(df_chunk)
+
+        if on_chunk is not None:
+            on_chunk(df_chunk)
+
+    df_totals = totals.result()
+    system_distributions = systems.result()
+    dev_distributions = devs.result()
+    daily_points = daily.result()
+
+    summary = {}
+
+    for year in df_totals.index:
+        summary[year] = {
+            "Game total": df_totals.loc[year, "Games"],
+            "Achievements total": df_totals.loc[year, "Achievements"],
+            "Points total": df_totals.loc[year, "Points"],
+            "Softcore Points total": df_totals.loc[year, "Softcore Points"],
+            "RetroPoints total": df_totals.loc[year, "RetroPoints"],
+            "System distribution": system_distributions[year],
+            "Dev distribution": dev_distributions[year],
+            "Daily points": daily_points[year],
+        }
+
+    return summary
+
+
+def get_historic_cache_path(
+    username: str,
+    cache_dir: str= DEFAULT_CACHE_DIR,
+) -> str:
+
+    """
+    Returns the path of the file where a user's achievement history is stored
+    between runs.
+    
+    Parameters:
+        
+        username (str):
+            The user's RetroAchievements username.
+            
+        cache_dir (str, optional):
+            Folder where the cached data is stored.
+            
+    Returns:
+        
+        str:
+            Path of the user's history file.
+    """
+
+    return os.path.join(cache_dir, "historic", f"{username.lower()}.pkl")
+
+
+@instrumented("History sync")
+def sync_historic_df(
+    username: str,
+    api_key: str,
+    hardcore_mode_only: bool,
+    cache_dir: str= DEFAULT_CACHE_DIR,
+) -> pd.DataFrame:
+    
+    """
+    Return a DataFrame containing the user's achievement history, only
+    requesting to the RetroAchievements API the achievements earned since the
+    last time it was called.
+    
+    The complete history, Softcore achievements included, is stored in the
+    local cache and updated on every call.
+    
+    Parameters:
+        
+        username (str):
+            The user's RetroAchievements username.
+            
+        api_key (str):
+            The user's RetroAchievements API key.
+            
+        hardcore_mode_only (bool, optional):
+            True if you want to exclude Softcore achievement data.
+            
+        cache_dir (str, optional):
+            Folder where the history is stored between runs.
+        
+    Returns:
+        
+        df_historic (pandas.DataFrame):
+            The user's achievement history.
+    """
+
+    path = get_historic_cache_path(username, cache_dir)
+
+    # Load the stored history if there is any. A file that can't be read
+    # (truncated, or pickled by another pandas version) is requested again
+
+    try:
+        df_stored = pd.read_pickle(path)
+    except FileNotFoundError:
+        df_stored = None
+    except Exception as error:
+        print(f"Failed to load the stored history of {username}, requesting it again: {error}")
+        df_stored = None
+
+    # Request only what was earned since the newest stored achievement. That
+    # second is requested again in case more achievements were earned in it
+
+    if df_stored is None or len(df_stored) == 0:
+        start_date_epoch = 0
+    else:
+        start_date_epoch = int(df_stored["Date"].max())
+
+    historic = retrieve_historic_records(username, api_key, start_date_epoch)
+
+    # Format just the new achievements and append them
+
+    if df_stored is None or len(historic) > 0:
+
+        df_new = format_historic_df(historic)
+
+        if df_stored is None:
+            df_stored = df_new
+        else:
+
+            # The newest stored second was requested again, leave out what
+            # was already stored from it
+
+            key = ["AchievementID", "Date", "HardcoreMode"]
+
+            df_overlap = df_stored[df_stored["Date"] >= start_date_epoch]
+
+            already_stored = pd.MultiIndex.from_frame(df_new[key].astype("int64")).isin(
+                pd.MultiIndex.from_frame(df_overlap[key].astype("int64")))
+
+            df_stored = pd.concat([df_stored, df_new[~already_stored]], ignore_index=True)
+
+        # Categories of both parts may differ, which turns them back to text
+
+        df_stored = set_column_dtypes(df_stored, HISTORIC_DTYPES)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        tmp_path = path + ".tmp"
+        df_stored.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+
+    # Softcore achievements gained later on hardcore are not counted.
+    # To avoid misrepresenting data, we entirely drop softcore achievements
+    # if the user decides so.
+
+    if hardcore_mode_only:
+        return df_stored[df_stored["HardcoreMode"] == 1].reset_index(drop=True)
+
+    return df_stored.copy()
+
+
+@instrumented("Formatting")
+def format_awards_df(
+    awards: dict,
+) -> pd.DataFrame:
+    
+    """
+    Convert an award history as sent by the RetroAchievements API into a
+    DataFrame with the dates split into Year, Month, Day, Hour and Minute
+    columns.
+    
+    Parameters:
+        
+        awards (dict):
+            Some user's award history.
+        
+    Returns:
+        
+        df_awards (pandas.DataFrame):
+            The user's award history.
+    """
+
+    df_awards = pd.DataFrame(awards['VisibleUserAwards'])
+
+    # Format the dates in a more manageable way, parsing them all at once.
+    # The time zone suffix is ignored
+    
+    dates = pd.to_datetime(df_awards["AwardedAt"].str[:-6], format="%Y-%m-%dT%H:%M:%S")
+
+    df_awards = split_dates(df_awards, dates)
+
+    # Drop unused achievements data to save memory
+
+    df_awards.drop(
+        [
+            "AwardedAt",
+            "DisplayOrder",
+            "Flags",
+        ],
+        axis=1,
+        inplace=True)
+
+    return set_column_dtypes(df_awards, AWARDS_DTYPES)
+
+
+@instrumented("Awards")
+async def retrieve_awards_df_async(
+    username: str,
+    api_key: str,
+) -> pd.DataFrame:
+    
+    """
+    Asynchronous version of retrieve_awards_df.
+    
+    Parameters:
+        
+        username (str):
+            The user's RetroAchievements username.
+            
+        api_key (str):
+            The user's RetroAchievements API key.
+        
+    Returns:
+        
+        df_awards (pandas.DataFrame):
+            The user's award history.
+    """
+    
+    # Set base URL
+    
+    func_url = http_settings["API base URL"] + "API_GetUserAwards.php?"
+
+    # Prepare arguments for the request
+
+    args = [
+        "y=" + api_key,
+        "u=" + username,
+    ]
+    
+    # Make the request
+
+    url = func_url + "&".join(args)
+    await api_rate_limiter.acquire_async()
+    response = check_response(await http_get_async(url)).json()
+
+    return format_awards_df(response)
+
+
+def retrieve_awards_df(
+    username: str,
+    api_key: str,
+) -> pd.DataFrame:
+    
+    """
+    Make some requests to the RetroAchievements API and return a DataFrame
+    containing the user's award history.
+    
+    Parameters:
+        
+        username (str):
+            The user's RetroAchievements username.
+            
+        api_key (str):
+            The user's RetroAchievements API key.
+        
+    Returns:
+        
+        df_awards (pandas.DataFrame):
+            The user's award history.
+    """
+
+    return run_sync(retrieve_awards_df_async(username, api_key))
+
+
+async def retrieve_game_data_async(
+    game_id: int,
+    api_key: str,
+    cache_dir: str | None= DEFAULT_CACHE_DIR,
+    cache_ttl: float= DEFAULT_GAMES_CACHE_TTL,
+    semaphore: asyncio.Semaphore | None= None,
+) -> dict:
+
+    """
+    Get the metadata of a game as returned by API_GetGameExtended.php, from
+    the local cache if it is there or from the RetroAchievements API
+    otherwise.
+    
+    Parameters:
+        
+        game_id (int):
+            The RetroAchievements ID of the desired game.
+            
+        api_key (str):
+            A valid RetroAchievements API key.
+            
+        cache_dir (str, optional):
+            Folder where the games' metadata is cached. Set to None to disable
+            the cache.
+            
+        cache_ttl (float, optional):
+            Maximum age in seconds of the cached metadata. Use None to never
+            expire entries.
+            
+        semaphore (asyncio.Semaphore, optional):
+            If specified, limits the number of requests in flight.
+            
+    Returns:
+        
+        dict:
+            The game's metadata including its achievements.
+    """
+
+    # Look for the game's data in the cache first. The cache files are read
+    # and written in a worker thread, like the requests, so that they don't
+    # block the event loop
+
+    if cache_dir is not None:
+        
+        game_data = await asyncio.to_thread(load_cached_game_data, game_id, cache_dir, cache_ttl)
+        
+        if game_data is not None:
+            count_event("Games cache hits")
+            return game_data
+
+    count_event("Game metadata downloads")
+
+    # Request it, the rate limiter takes care of not saturating the API
+
+    url = http_settings["API base URL"] + "API_GetGameExtended.php?" + "&".join(["y=" + api_key, "i=" + str(game_id)])
+
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(1)
+
+    async with semaphore:
+        await api_rate_limiter.acquire_async()
+        game_data = check_response(await http_get_async(url)).json()
+
+    if cache_dir is not None:
+        await asyncio.to_thread(store_cached_game_data, game_id, game_data, cache_dir)
+
+    return game_data
+
+
+@instrumented("Formatting")
+def format_games_data(
+    game_ids: list,
+    raw_games_data: dict,
+) -> tuple:
+
+    """
+    Convert the metadata of some games as sent by the RetroAchievements API
+    into a DataFrame of games and a catalog of their achievements.
+    
+    Parameters:
+        
+        game_ids (list):
+            The RetroAchievements IDs of the games, in the desired order.
+            Games missing from raw_games_data, or without achievements data,
+            are left out.
+            
+        raw_games_data (dict):
+            Dictionary with the games' ID as keys and their metadata as
+            returned by API_GetGameExtended.php as values.
+            
+    Returns:
+        
+        pandas.DataFrame:
+            The games' metadata.
+            
+        pandas.DataFrame:
+            The achievement catalog, indexed by GameID and AchievementID.
+    """
+
+    # Prepare variables to store retrieved data
+
+    game_data_list = []
+    cheevos_list = []
+
+    # Iterate over all games
+
+    for game_id in game_ids:
+
+        if game_id not in raw_games_data:
+            continue
+
+        # Leave out responses that aren't a game's metadata, like error
+        # messages, instead of aborting the whole retrieval
+
+        if "Achievements" not in raw_games_data[game_id]:
+            print(f"Failed to retrieve data for game {game_id}: {raw_games_data[game_id]}")
+            continue
+
+        game_data = dict(raw_games_data[game_id])
+        
+        # Separate achievements data, sent as a dictionary by ID (or an
+        # empty list if there are none)
+        
+        cheevos = game_data.pop("Achievements") or {}
+        
+        # Store general data and achievements data for current game
+        
+        game_data_list.append(game_data)
+        
+        cheevos_list += [dict(cheevo, GameID=game_id) for cheevo in cheevos.values()]
+        
+    # Convert game data to DataFrame and drop unused columns to save memory
+    
+    df_game_data = pd.DataFrame(game_data_list)
+    
+    df_game_data = df_game_data.drop(["ForumTopicID",
+                                      "Flags",
+                                      "ImageTitle",
+                                      "ImageIngame",
+                                      "ImageBoxArt",
+                                      "Publisher",
+                                      "Developer",
+                                      "Released",
+                                      "ReleasedAtGranularity",
+                                      "IsFinal",
+                                      "RichPresencePatch",
+                                      "GuideURL",
+                                      "Updated",
+                                      "ParentGameID",
+                                      "NumDistinctPlayers",
+                                      "NumAchievements",
+                                      "Claims",
+                                      "NumDistinctPlayersCasual",
+                                      "NumDistinctPlayersHardcore"], axis=1, errors="ignore")
+    
+    # Single achievement catalog, keeping only the useful metadata
+    
+    df_cheevos_data = format_cheevos_catalog(pd.DataFrame(cheevos_list))
+        
+    return df_game_data, df_cheevos_data
+
+
+async def retrieve_games_data_async(
+    game_ids: list,
+    api_key: str,
+    cache_dir: str | None= DEFAULT_CACHE_DIR,
+    cache_ttl: float= DEFAULT_GAMES_CACHE_TTL,
+    max_workers: int= DEFAULT_MAX_WORKERS,
+) -> dict:
+
+    """
+    Get the metadata of some games as returned by API_GetGameExtended.php,
+    requesting the ones missing from the local cache concurrently.
+    
+    Games that fail to be retrieved are reported and left out.
+    
+    Parameters:
+        
+        game_ids (list):
+            The RetroAchievements IDs of the games.
+            
+        api_key (str):
+            A valid RetroAchievements API key.
+            
+        cache_dir (str, optional):
+            Folder where the games' metadata is cached. Set to None to disable
+            the cache.
+            
+        cache_ttl (float, optional):
+            Maximum age in seconds of the cached metadata. Use None to never
+            expire entries.
+            
+        max_workers (int, optional):
+            Maximum number of requests in flight at the same time.
+            
+    Returns:
+        
+        dict:
+            Dictionary with the games' ID as keys and their metadata as
+            values.
+    """
+
+    semaphore = asyncio.Semaphore(max_workers)
+
+    return await gather_games_data(game_ids, [retrieve_game_data_async(game_id, api_key, cache_dir, cache_ttl, semaphore) for game_id in game_ids])
+
+
+@instrumented("Game metadata")
+async def gather_games_data(
+    game_ids: list,
+    awaitables: list,
+) -> dict:
+
+    """
+    Wait for the retrieval of some games' metadata, reporting and leaving out
+    the games that failed.
+    
+    Parameters:
+        
+        game_ids (list):
+            The RetroAchievements IDs of the games.
+            
+        awaitables (list):
+            Coroutines or tasks retrieving each game's metadata, in the same
+            order as game_ids.
+            
+    Returns:
+        
+        dict:
+            Dictionary with the games' ID as keys and their metadata as
+            values.
+    """
+
+    results = await asyncio.gather(*awaitables, return_exceptions=True)
+
+    raw_games_data = {}
+
+    for game_id, result in zip(game_ids, results):
+        if isinstance(result, Exception):
+            print(f"Failed to retrieve data for game {game_id}: {result}")
+        else:
+            raw_games_data[game_id] = result
+
+    return raw_games_data
+
+
+async def cancel_tasks(
+    tasks: list,
+):
+
+    """
+    Cancel the tasks that are still running and wait for all of them, so that
+    none is left pending when a retrieval fails halfway.
+    
+    Parameters:
+        
+        tasks (list):
+            The asyncio tasks.
     """
 
-    url = 'https://media.retroachievements.org' + df_historic[df_historic["GameID"] == game_id]["GameIcon"].values[0]
+    for task in tasks:
+        task.cancel()
 
-    return retrieve_image(url)
+    await asyncio.gather(*tasks, return_exceptions=True)
 
 
-def get_game_icon_fig(
+async def retrieve_necessary_games_data_async(
     df_historic: pd.DataFrame,
-    game_id: int,
-):
+    api_key: str,
+    cache_dir: str | None= DEFAULT_CACHE_DIR,
+    cache_ttl: float= DEFAULT_GAMES_CACHE_TTL,
+    max_workers: int= DEFAULT_MAX_WORKERS,
+) -> tuple:
     
     """
-    Get the icon of a game registered in RetroAchievements as a plottable
-    figure.
+    Asynchronous version of retrieve_necessary_games_data.
     
     Parameters:
         
         df_historic (pandas.DataFrame):
             Some user's RetroAchievements achievement history.
             
-        game_id (int):
-            The RetroAchievements ID of the desired game.
+        api_key (str):
+            A valid RetroAchievements API key.
+            
+        cache_dir (str, optional):
+            Folder where the games' metadata is cached. Set to None to disable
+            the cache.
             
+        cache_ttl (float, optional):
+            Maximum age in seconds of the cached metadata. Use None to never
+            expire entries.
+            
+        max_workers (int, optional):
+            Maximum number of requests in flight at the same time.
+        
     Returns:
         
-        matplotlib.figure.Figure:
-            The requested image as a plottable figure.
+        pandas.DataFrame:
+            The games' metadata.
+            
+        pandas.DataFrame:
+            The achievement catalog, indexed by GameID and AchievementID.
     """
+    
+    # Get the set of all the games to retrieve from historic_df
+    
+    game_ids = df_historic["GameID"].unique()
 
-    url = 'https://media.retroachievements.org' + df_historic[df_historic["GameID"] == game_id]["GameIcon"].values[0]
+    raw_games_data = await retrieve_games_data_async(game_ids, api_key, cache_dir, cache_ttl, max_workers)
 
-    return retrieve_image_as_fig(url)
+    return format_games_data(game_ids, raw_games_data)
 
 
-def get_cheevo_badge_fig(
-    df: pd.DataFrame,
-    cheevo_id: int,
-):
+def retrieve_necessary_games_data(
+    df_historic: pd.DataFrame,
+    api_key: str,
+    cache_dir: str | None= DEFAULT_CACHE_DIR,
+    cache_ttl: float= DEFAULT_GAMES_CACHE_TTL,
+    max_workers: int= DEFAULT_MAX_WORKERS,
+) -> tuple:
     
     """
-    Get the badge of a RetroAchievements achievement as a plottable figure.
+    Make some requests to the RetroAchievements API and return the metadata
+    of the games that appear in some user's achievement history.
+    
+    Games found in the local cache are not requested again until their entry
+    expires. The rest are requested concurrently under the shared API rate
+    limit, and games that fail to be retrieved are reported and left out.
     
     Parameters:
         
         df_historic (pandas.DataFrame):
             Some user's RetroAchievements achievement history.
             
-        cheevo_id (int):
-            The RetroAchievements ID of the desired achievement.
+        api_key (str):
+            A valid RetroAchievements API key.
+            
+        cache_dir (str, optional):
+            Folder where the games' metadata is cached. Set to None to disable
+            the cache.
             
+        cache_ttl (float, optional):
+            Maximum age in seconds of the cached metadata. Use None to never
+            expire entries.
+            
+        max_workers (int, optional):
+            Maximum number of requests in flight at the same time.
+        
     Returns:
         
-        matplotlib.figure.Figure:
-            The requested image as a plottable figure.
+        pandas.DataFrame:
+            The games' metadata.
+            
+        pandas.DataFrame:
+            The achievement catalog, indexed by GameID and AchievementID.
     """
-    
-    url = 'https://media.retroachievements.org' + df[df["AchievementID"] == cheevo_id]["BadgeURL"].values[0]
 
-    return retrieve_image_as_fig(url)
+    return run_sync(retrieve_necessary_games_data_async(df_historic, api_key, cache_dir, cache_ttl, max_workers))
 
 
-def get_user_icon_fig(
+@instrumented("User data")
+async def retrieve_user_data_async(
     username: str,
-):
+    api_key: str,
+    hardcore_mode_only: bool,
+    cache_dir: str | None= DEFAULT_CACHE_DIR,
+    cache_ttl: float= DEFAULT_GAMES_CACHE_TTL,
+    max_workers: int= DEFAULT_MAX_WORKERS,
+) -> tuple:
     
     """
-    Get the icon of a user registered in RetroAchievements as a plottable
-    figure.
+    Retrieve all the data of a user from the RetroAchievements API at once.
+    
+    The awards, the history pages and the games' metadata are requested
+    concurrently under the shared API rate limit: every game is requested as
+    soon as it shows up in a history page.
     
     Parameters:
         
         username (str):
-            The user's RetroAchievements username
+            The user's RetroAchievements username.
+            
+        api_key (str):
+            The user's RetroAchievements API key.
+            
+        hardcore_mode_only (bool):
+            True if you want to exclude Softcore achievement data.
+            
+        cache_dir (str, optional):
+            Folder where the games' metadata is cached. Set to None to disable
+            the cache.
             
+        cache_ttl (float, optional):
+            Maximum age in seconds of the cached metadata. Use None to never
+            expire entries.
+            
+        max_workers (int, optional):
+            Maximum number of game requests in flight at the same time.
+        
     Returns:
         
-        matplotlib.figure.Figure:
-            The requested image as a plottable figure.
+        pandas.DataFrame:
+            The user's achievement history, as returned by retrieve_historic_df.
+            
+        pandas.DataFrame:
+            The user's award history, as returned by retrieve_awards_df.
+            
+        pandas.DataFrame:
+            The games' metadata.
+            
+        pandas.DataFrame:
+            The achievement catalog, indexed by GameID and AchievementID.
     """
 
-    url = 'https://media.retroachievements.org/UserPic/' + username + ".png"  
+    semaphore = asyncio.Semaphore(max_workers)
     
-    return retrieve_image_as_fig(url)
+    game_tasks = {}
 
+    # Start requesting each game as soon as it shows up
 
-def get_formatted_date(
-    day: int,
-    month: int,
-    year: int= 0,
-) -> str:
+    def request_page_games(page):
+        for cheevo in page:
+            if hardcore_mode_only and cheevo["HardcoreMode"] != 1:
+                continue
+            if cheevo["GameID"] not in game_tasks:
+                game_tasks[cheevo["GameID"]] = asyncio.ensure_future(
+                    retrieve_game_data_async(cheevo["GameID"], api_key, cache_dir, cache_ttl, semaphore))
 
-    """
-    Returns a string representing the requested date.
-    
-    Parameters:
-        
-        day (int):
-            Day cardinal from 1 to 31.
-        month (int):
-            Month cardinal from 1 to 12.
-        year (int, optional):
-            Year, omitted if not specified.
-            
-    Returns:
-        
-        str:
-            A date formatted like '{month} {day}th, {year}'.
-    """
+    awards_task = asyncio.ensure_future(retrieve_awards_df_async(username, api_key))
 
-    # Format the day
+    # If anything fails, the requests still in flight are not left behind
 
-    if day in (11, 12, 13):
-        day_str =  f"{day}th"
-    else:
-        last_digit = day % 10
-        if last_digit == 1:
-            day_str =  f"{day}st"
-        elif last_digit == 2:
-            day_str =  f"{day}nd"
-        elif last_digit == 3:
-            day_str =  f"{day}rd"
-        else:
-            day_str =  f"{day}th"
+    try:
 
-    # Format the month
+        historic = await retrieve_historic_records_async(username, api_key, on_page=request_page_games)
 
-    month_name = calendar.month_name[month]
+        if hardcore_mode_only:
+            historic = [cheevo for cheevo in historic if cheevo["HardcoreMode"] == 1]
 
-    # Return
+        df_historic = format_historic_df(historic)
 
-    if year == 0:
-        return f"{month_name} {day_str}"
-    else:
-        return f"{month_name} {day_str}, {year}"
+        # Wait for the rest
 
+        df_awards = await awards_task
 
-#####################
-# Complex functions #
-#####################
+        game_ids = df_historic["GameID"].unique()
 
+        raw_games_data = await gather_games_data(game_ids, [game_tasks[game_id] for game_id in game_ids])
 
-def retrieve_historic_df(
-    username: str,
+    finally:
+        await cancel_tasks([awards_task, *game_tasks.values()])
+
+    df_games_data, df_cheevos_data = format_games_data(game_ids, raw_games_data)
+
+    return df_historic, df_awards, df_games_data, df_cheevos_data
+
+
+@instrumented("Users data")
+async def retrieve_users_data_async(
+    usernames: list,
     api_key: str,
     hardcore_mode_only: bool,
-) -> pd.DataFrame:
+    cache_dir: str | None= DEFAULT_CACHE_DIR,
+    cache_ttl: float= DEFAULT_GAMES_CACHE_TTL,
+    max_workers: int= DEFAULT_MAX_WORKERS,
+) -> dict:
     
     """
-    Make some requests to the RetroAchievements API and return a DataFrame
-    containing the user's achievement history.
+    Asynchronous version of retrieve_users_data.
     
     Parameters:
         
-        username (str):
-            The user's RetroAchievements username.
+        usernames (list):
+            The users' RetroAchievements usernames.
             
         api_key (str):
-            The user's RetroAchievements API key.
+            A valid RetroAchievements API key.
             
-        hardcore_mode_only (bool, optional):
+        hardcore_mode_only (bool):
             True if you want to exclude Softcore achievement data.
+            
+        cache_dir (str, optional):
+            Folder where the games' metadata is cached. Set to None to disable
+            the cache.
+            
+        cache_ttl (float, optional):
+            Maximum age in seconds of the cached metadata. Use None to never
+            expire entries.
+            
+        max_workers (int, optional):
+            Maximum number of game requests in flight at the same time.
         
     Returns:
         
-        df_historic (pandas.DataFrame):
-            The user's achievement history.
+        dict:
+            Dictionary with the usernames as keys and the same tuples
+            retrieve_user_data_async returns as values: the user's achievement
+            history, award history, games' metadata and achievement catalog,
+            the last two limited to the games the user played.
     """
-    
-    # Set base URL
-    
-    func_url = "https://retroachievements.org/API/API_GetAchievementsEarnedBetween.php?"
-    
-    # Prepare arguments for the request
-    
-    start_date_epoch = calendar.timegm(datetime.datetime(1970, 1, 1, 0, 0, 0).timetuple())
-    end_date_epoch   = calendar.timegm(datetime.datetime(2100, 1, 1, 0, 0, 0).timetuple())
 
-    args = [
-        "y=" + api_key,
-        "u=" + username,
-        "f=" + str(start_date_epoch),
-        "t=" + str(end_date_epoch),
-    ]
+    semaphore = asyncio.Semaphore(max_workers)
     
-    # Request the first batch of achievements (500/request max)
+    game_tasks = {}
 
-    url = func_url + "&".join(args)
-    response = http_get(url).json()
-    
-    # Store first batch of achievements in the historic
+    # Start requesting each game as soon as it shows up in any history, only
+    # once for all the users
 
-    historic = response
-    
-    # Keep repeating until there are no results left
+    def request_page_games(page):
+        for cheevo in page:
+            if hardcore_mode_only and cheevo["HardcoreMode"] != 1:
+                continue
+            if cheevo["GameID"] not in game_tasks:
+                game_tasks[cheevo["GameID"]] = asyncio.ensure_future(
+                    retrieve_game_data_async(cheevo["GameID"], api_key, cache_dir, cache_ttl, semaphore))
 
-    while len(response) == 500:
-        
-        # Update arguments to get next batch based on start date
-        
-        new_start_date = response[-1]["Date"].replace("-", " ").replace(":", " ").split()
-        for i in range(6):
-            new_start_date[i] = int(new_start_date[i])
-        
-        start_date_epoch = calendar.timegm(datetime.datetime(*new_start_date).timetuple()) + 1
+    async def retrieve_histories(username):
 
-        args[2] = "f=" + str(start_date_epoch)
-        
-        # Request the next batch achievements
+        historic, df_awards = await asyncio.gather(
+            retrieve_historic_records_async(username, api_key, on_page=request_page_games),
+            retrieve_awards_df_async(username, api_key),
+        )
 
-        url = func_url + "&".join(args)
-        response = http_get(url).json()
-        
-        # Store in the historic
-        
-        historic += response
-        
-        # Avoid saturating the API
-        
-        time.sleep(0.2)
-        
-    # Convert historic data to DataFrame format
-    
-    df_historic = pd.DataFrame(historic)
-    
-    # Softcore achievements gained later on hardcore are not counted.
-    # To avoid misrepresenting data, we entirely drop softcore achievements
-    # if the user decides so.
+        if hardcore_mode_only:
+            historic = [cheevo for cheevo in historic if cheevo["HardcoreMode"] == 1]
 
-    if hardcore_mode_only:
-        df_historic = df_historic[df_historic["HardcoreMode"] == 1].reset_index(drop=True)
-    
-    # Format the dates in a more manageable way
-    
-    splitdate = df_historic["Date"].apply(lambda x: np.array(x.replace("-", " ").replace(":", " ").split()))
-    splitdate = splitdate.apply(lambda x: [int(item) for item in x])
-    
-    df_historic["Year"]   = splitdate.apply(lambda x: x[0])
-    df_historic["Month"]  = splitdate.apply(lambda x: x[1])
-    df_historic["Day"]    = splitdate.apply(lambda x: x[2])
-    df_historic["Hour"]   = splitdate.apply(lambda x: x[3])
-    df_historic["Minute"] = splitdate.apply(lambda x: x[4])
-    
-    df_historic["Date"] = splitdate.apply(lambda x: calendar.timegm(datetime.datetime(*x).timetuple()))
-    
-    # Drop unused achievements data to save memory
-    
-    if hardcore_mode_only:
-        df_historic = df_historic.drop(
-            [
-                "GameURL",
-            ],
-            axis=1)
-    else:
-        df_historic = df_historic.drop("GameURL", axis=1)
+        return format_historic_df(historic), df_awards
 
-    return df_historic
+    # Games only requested for failed users are cancelled, as are all the
+    # requests in flight if anything else fails
 
+    try:
 
-def retrieve_awards_df(
-    username: str,
-    api_key: str,
-) -> pd.DataFrame:
-    
-    """
-    Make some requests to the RetroAchievements API and return a DataFrame
-    containing the user's award history.
-    
-    Parameters:
-        
-        username (str):
-            The user's RetroAchievements username.
-            
-        api_key (str):
-            The user's RetroAchievements API key.
-        
-    Returns:
-        
-        df_historic (pandas.DataFrame):
-            The user's achievement history.
-    """
-    
-    # Set base URL
-    
-    func_url = "https://retroachievements.org/API/API_GetUserAwards.php?"
+        results = await asyncio.gather(*[retrieve_histories(username) for username in usernames], return_exceptions=True)
 
-    # Prepare arguments for the request
+        histories = {}
 
-    args = [
-        "y=" + api_key,
-        "u=" + username,
-    ]
-    
-    # Make the request
+        for username, result in zip(usernames, results):
+            if isinstance(result, Exception):
+                print(f"Failed to retrieve data for user {username}: {result}")
+            else:
+                histories[username] = result
 
-    url = func_url + "&".join(args)
-    response = http_get(url).json()
+        if len(histories) == 0:
+            return {}
 
-    df_awards = pd.DataFrame(response['VisibleUserAwards'])
+        # Wait for the union of the users' games and format them once
 
-    # Format the dates in a more manageable way
-    
-    splitdate = df_awards["AwardedAt"].apply(lambda x: np.array(x.replace("T", " ").replace("-", " ").replace(":", " ")[:-6].split()))
-    splitdate = splitdate.apply(lambda x: [int(item) for item in x])
+        game_ids = pd.unique(np.concatenate([df_historic["GameID"].unique() for df_historic, _ in histories.values()]))
 
-    df_awards["Year"]   = splitdate.apply(lambda x: x[0])
-    df_awards["Month"]  = splitdate.apply(lambda x: x[1])
-    df_awards["Day"]    = splitdate.apply(lambda x: x[2])
-    df_awards["Hour"]   = splitdate.apply(lambda x: x[3])
-    df_awards["Minute"] = splitdate.apply(lambda x: x[4])
+        raw_games_data = await gather_games_data(game_ids, [game_tasks[game_id] for game_id in game_ids])
 
-    df_awards["Date"] = splitdate.apply(lambda x: calendar.timegm(datetime.datetime(*x).timetuple()))
+    finally:
+        await cancel_tasks(list(game_tasks.values()))
 
-    # Drop unused achievements data to save memory
+    df_games_data, df_cheevos_data = format_games_data(game_ids, raw_games_data)
 
-    df_awards.drop(
-        [
-            "AwardedAt",
-            "DisplayOrder",
-            "Flags",
-        ],
-        axis=1,
-        inplace=True)
+    # Give each user the part that concerns them
+
+    users_data = {}
+
+    for username, (df_historic, df_awards) in histories.items():
+
+        user_game_ids = df_historic["GameID"].unique()
 
-    return df_awards
+        users_data[username] = (
+            df_historic,
+            df_awards,
+            df_games_data[df_games_data["ID"].isin(user_game_ids)].reset_index(drop=True),
+            get_games_cheevo_data(user_game_ids, df_cheevos_data),
+        )
 
+    return users_data
 
-def retrieve_necessary_games_data(
-    df_historic: pd.DataFrame,
+
+def retrieve_users_data(
+    usernames: list,
     api_key: str,
-) -> tuple:
+    hardcore_mode_only: bool,
+    cache_dir: str | None= DEFAULT_CACHE_DIR,
+    cache_ttl: float= DEFAULT_GAMES_CACHE_TTL,
+    max_workers: int= DEFAULT_MAX_WORKERS,
+) -> dict:
     
     """
-    Make some requests to the RetroAchievements API and return the metadata
-    of the games that appear in some user's achievement history.
+    Retrieve all the data of several users from the RetroAchievements API at
+    once, like a group or community would need for everyone's yearly stats.
+    
+    The users' histories and awards are requested concurrently, and the
+    metadata of every game in any of the histories is requested only once.
+    Users whose data could not be retrieved are reported and left out.
     
     Parameters:
         
-        df_historic (pandas.DataFrame):
-            Some user's RetroAchievements achievement history.
+        usernames (list):
+            The users' RetroAchievements usernames.
             
         api_key (str):
             A valid RetroAchievements API key.
+            
+        hardcore_mode_only (bool):
+            True if you want to exclude Softcore achievement data.
+            
+        cache_dir (str, optional):
+            Folder where the games' metadata is cached. Set to None to disable
+            the cache.
+            
+        cache_ttl (float, optional):
+            Maximum age in seconds of the cached metadata. Use None to never
+            expire entries.
+            
+        max_workers (int, optional):
+            Maximum number of game requests in flight at the same time.
         
     Returns:
         
-        pandas.DataFrame:
-            The games' metadata.
-            
         dict:
-            Dictionary with the involved games' ID as keys and a Pandas
-            DataFrame containing the achievements' metadata as values.
+            Dictionary with the usernames as keys and tuples with the user's
+            achievement history, award history, games' metadata and
+            achievement catalog (a DataFrame indexed by GameID and
+            AchievementID, see format_games_data) as values.
     """
-    
-    # Set base URL
-    
-    func_url = "https://retroachievements.org/API/API_GetGameExtended.php?"
-    
-    # Get the set of all the games to retrieve from historic_df
-    
-    game_ids = df_historic["GameID"].unique()
 
-    # Prepare arguments for the request
+    return run_sync(retrieve_users_data_async(usernames, api_key, hardcore_mode_only, cache_dir, cache_ttl, max_workers))
+
 
-    args = ["y=" + api_key,
-            "i="]
+def get_users_yearly_stats(
+    users_data: dict,
+    year: int,
+    hardcore_mode_only: bool= False,
+    max_workers: int= DEFAULT_MAX_WORKERS,
+    image_format: str= "bytes",
+) -> dict:
     
-    # Prepare variables to store retrieved data
+    """
+    Extract the RetroAchievements stats for a certain year of several users,
+    working on the users in parallel.
+    
+    Parameters:
+        
+        users_data (dict):
+            Dictionary with the usernames as keys and tuples whose first two
+            elements are the user's achievement history and award history, as
+            returned by retrieve_users_data.
+            
+        year (int):
+            Year to check.
+            
+        hardcore_mode_only (bool, optional):
+            Set to True to not take Softcore data into account.
+            
+        max_workers (int, optional):
+            Maximum number of users processed at the same time.
+            
+        image_format (str, optional):
+            Format of the returned images, see retrieve_image_in_format. File
+            contents by default. Matplotlib figures can't be built safely
+            from several threads, so with 'figure' the users are processed
+            one after another.
+        
+    Returns:
+        
+        dict:
+            Dictionary with the usernames as keys and their stats, as
+            returned by get_yearly_stats, as values.
+    """
 
-    game_data_list = []
-    cheevos_df_dict = {}
+    if image_format == "figure":
+        max_workers = 1
 
-    # Iterate over all games
+    def get_user_stats(username):
+        df_historic, df_awards = users_data[username][:2]
+        return get_yearly_stats(df_historic, df_awards, year, hardcore_mode_only, image_format=image_format)
 
-    for game_id in game_ids:
-        
-        # Update arguments to set current game as request target
+    users_stats, errors = fetch_concurrently(get_user_stats, list(users_data.keys()), max_workers=max_workers)
 
-        args[1] = "i=" + str(game_id)
-        
-        url = func_url + "&".join(args)
-        
-        # Request the next game's data
-        
-        game_data = http_get(url).json()
-        
-        # Separate achievements data
-        
-        cheevos_df = pd.DataFrame(game_data.pop("Achievements")).transpose().reset_index(drop=True)
-        
-        # Drop unused achievements data to save memory
-        
-        cheevos_df.drop(["NumAwarded",
-                         "NumAwardedHardcore",
-                         "DateModified",
-                         "DateCreated",
-                         "BadgeName",
-                         "DisplayOrder",
-                         "MemAddr"], axis=1)
-        
-        # Store general data and achievements data for current game
-        
-        game_data_list.append(game_data)
-        
-        cheevos_df_dict[game_id] = cheevos_df
+    for username, error in errors.items():
+        print(f"Failed to get the {year} stats of user {username}: {error}")
 
-        # Avoid saturating the API
-        
-        time.sleep(0.2)
-        
-    # Convert game data to DataFrame and drop unused columns to save memory
-    
-    df_game_data = pd.DataFrame(game_data_list)
-    
-    df_game_data.drop(["ForumTopicID",
-                       "Flags",
-                       "ImageTitle",
-                       "ImageIngame",
-                       "ImageBoxArt",
-                       "Publisher",
-                       "Developer",
-                       "Released",
-                       "ReleasedAtGranularity",
-                       "IsFinal",
-                       "RichPresencePatch",
-                       "GuideURL",
-                       "Updated",
-                       "ParentGameID",
-                       "NumDistinctPlayers",
-                       "NumAchievements",
-                       "Claims",
-                       "NumDistinctPlayersCasual",
-                       "NumDistinctPlayersHardcore"], axis=1)
-        
-    return df_game_data, cheevos_df_dict
+    # Keep the order of the users
+
+    return {username: users_stats[username] for username in users_data if username in users_stats}
 
 
 def get_event_data(
@@ -837,20 +4811,25 @@ def get_event_data(
     return df_events
 
 
+@instrumented("Yearly stats")
 def get_yearly_stats(
-    df_historic: pd.DataFrame,
+    df_historic: pd.DataFrame | PartitionedHistory,
     df_awards: pd.DataFrame,
     year: int,
     hardcore_mode_only: bool= False,
+    max_workers: int= DEFAULT_MAX_WORKERS,
+    image_format: str= "figure",
 ) -> dict:
     
     """
     Extract the RetroAchievements stats for a certain year from some user's
     achievement history.
     
+    Every image needed is collected first and downloaded concurrently.
+    
     Parameters:
         
-        df_historic (pandas.DataFrame):
+        df_historic (pandas.DataFrame | PartitionedHistory):
             Some user's RetroAchievements achievement history.
         
         df_awards (pandas.DataFrame):
@@ -859,14 +4838,17 @@ def get_yearly_stats(
         year (int):
             Year to check.
             
-        cheevos_data_dict (dict):
-            Dictionary with the involved games' ID as keys and a Pandas
-            DataFrame containing the achievements' metadata as values.
-            
         hardcore_mode_only (bool, optional):
             Set to True to not take Softcore data into account. If False, it
             requires df_historic to have the HardcoreMode column. False by
             default.
+            
+        max_workers (int, optional):
+            Maximum number of image downloads at the same time.
+            
+        image_format (str, optional):
+            Format of the returned images, see retrieve_image_in_format.
+            Plottable figures by default.
         
     Returns:
         
@@ -874,7 +4856,7 @@ def get_yearly_stats(
             Dictionary with the user's stats for the selected year.
     """
 
-    df_cheevo_year = df_historic[df_historic["Year"] == year].reset_index(drop=True)
+    df_cheevo_year = get_year_data(df_historic, year).reset_index(drop=True)
     df_awards_year = df_awards[  df_awards["Year"]   == year].reset_index(drop=True)
 
     df_awards_year = df_awards_year[(df_awards_year["AwardType"] == "Game Beaten") |
@@ -891,105 +4873,431 @@ def get_yearly_stats(
     
     if hardcore_mode_only:
 
-        df_awards_year = df_awards_year[df_awards_year["AwardDataExtra"] == 1]
-        
-        stats["Softcore Points total"] = 0
-        stats["Hardcore Points total"] = df_cheevo_year["Points"].sum()
-        stats["RetroPoints total"]     = df_cheevo_year["TrueRatio"].sum()
-        
-    else:
-        
-        stats["Softcore Points total"] = df_cheevo_year[df_cheevo_year["HardcoreMode"] == False]["Points"].sum()
-        stats["Points total"]          = df_cheevo_year[df_cheevo_year["HardcoreMode"] == True ]["Points"].sum()
-        stats["RetroPoints total"]     = df_cheevo_year[df_cheevo_year["HardcoreMode"] == True ]["TrueRatio"].sum()
+        df_awards_year = df_awards_year[df_awards_year["AwardDataExtra"] == 1]
+        
+        stats["Softcore Points total"] = 0
+        stats["Hardcore Points total"] = df_cheevo_year["Points"].sum()
+        stats["RetroPoints total"]     = df_cheevo_year["TrueRatio"].sum()
+        
+    else:
+        
+        stats["Softcore Points total"] = df_cheevo_year[df_cheevo_year["HardcoreMode"] == False]["Points"].sum()
+        stats["Points total"]          = df_cheevo_year[df_cheevo_year["HardcoreMode"] == True ]["Points"].sum()
+        stats["RetroPoints total"]     = df_cheevo_year[df_cheevo_year["HardcoreMode"] == True ]["TrueRatio"].sum()
+
+    ### Get beaten & mastery data
+
+    beaten_games   = df_awards_year[df_awards_year["AwardType"] == "Game Beaten"].reset_index(drop=True)
+    mastered_games = df_awards_year[df_awards_year["AwardType"] == "Mastery/Completion"].reset_index(drop=True)
+
+    # Store relevant data in output dictionary
+
+    stats["Mastered games"] = mastered_games
+    stats["Beaten games"]   = beaten_games
+    
+    ### Get hardest achievements
+    
+    hardest_achievements = df_cheevo_year.nlargest(10, "TrueRatio").reset_index(drop=True)
+    
+    stats["Hardest achievements"] = [hardest_achievements.iloc[i] for i in range(len(hardest_achievements))]
+
+    ### Retrieve all the images at once: icons of the chosen games and badges
+    ### of the hardest achievements
+
+    df_game_icons = df_awards_year[["AwardData", "ImageIcon"]].drop_duplicates()
+
+    media_urls = {}
+
+    for game_id, path in zip(df_game_icons["AwardData"], df_game_icons["ImageIcon"]):
+        media_urls[("Game", game_id)] = get_media_url(path)
+
+    for cheevo_id, path in zip(hardest_achievements["AchievementID"], hardest_achievements["BadgeURL"]):
+        media_urls[("Achievement", cheevo_id)] = get_media_url(path)
+
+    images = prefetch_images(media_urls, max_workers=max_workers, image_format=image_format)
+
+    stats["Game icons"] = {game_id: images[("Game", game_id)] for game_id in df_game_icons["AwardData"]}
+    stats["Hardest achievements badges"] = [images[("Achievement", cheevo_id)] for cheevo_id in hardest_achievements["AchievementID"]]
+
+    return stats
+
+
+@instrumented("Yearly dev stats")
+def get_yearly_favdev_stats(
+    df_historic: pd.DataFrame | PartitionedHistory,
+    year: int,
+    image_format: str= "figure",
+) -> dict:
+
+    """
+    Extract the developer related achievement data contained in a user's
+    RetroAchievements history and structure it, for the developer with the
+    most achievements. See get_dev_stats for all the developers.
+    
+    Parameters:
+        
+        df_historic (pandas.DataFrame | PartitionedHistory):
+            Some user's RetroAchievements achievement history.
+            
+        year (int):
+            Year to check.
+            
+        image_format (str, optional):
+            Format of the returned user icon, see retrieve_image_in_format.
+            Plottable figure by default.
+        
+    Returns:
+        
+        stats (dict):
+            Dictionary with the user's developer related stats for the selected
+            year.
+    """
+
+    df_year = get_year_data(df_historic, year)
+    df_devs, dev_games = get_dev_stats(df_year, top_n=1)
+
+    username = df_devs.index[0]
+
+    stats = {}
+
+    # Basic data
+
+    stats["Username"] = username
+
+    stats["User icon"] = retrieve_image_in_format(get_user_icon_url(username), image_format)
+
+    # Totals
+    
+    stats["Achievement total"] = df_devs.loc[username, "Achievement total"]
+    stats["Point total"] = df_devs.loc[username, "Point total"]
+    stats["RetroPoint total"] = df_devs.loc[username, "RetroPoint total"]
+
+    stats["Achievement %"] = df_devs.loc[username, "Achievement %"]
+
+    # Distribution
+
+    stats["Game distribution"] = dev_games.loc[username]
+
+    return stats
+
+
+@instrumented("All years stats")
+def get_all_yearly_stats(
+    df_historic: pd.DataFrame | PartitionedHistory,
+    df_awards: pd.DataFrame,
+    hardcore_mode_only: bool= False,
+    max_workers: int= DEFAULT_MAX_WORKERS,
+    image_format: str= "figure",
+) -> dict:
+    
+    """
+    Extract the RetroAchievements stats of every year of some user's
+    achievement history at once.
+    
+    The totals and the hardest achievements of all the years come out of a
+    few aggregations grouped by year, and the images of all the years are
+    downloaded together, so switching from one year to another is just a
+    dictionary lookup.
+    
+    Parameters:
+        
+        df_historic (pandas.DataFrame | PartitionedHistory):
+            Some user's RetroAchievements achievement history.
+        
+        df_awards (pandas.DataFrame):
+            Some user's RetroAchievements award history.
+            
+        hardcore_mode_only (bool, optional):
+            Set to True to not take Softcore data into account. If False, it
+            requires df_historic to have the HardcoreMode column. False by
+            default.
+            
+        max_workers (int, optional):
+            Maximum number of image downloads at the same time.
+            
+        image_format (str, optional):
+            Format of the returned images, see retrieve_image_in_format.
+            Plottable figures by default.
+        
+    Returns:
+        
+        dict:
+            Dictionary with the years as keys and the stats of each year, as
+            returned by get_yearly_stats, as values.
+    """
+
+    df_historic = get_historic_df(df_historic)
+
+    by_year = df_historic.groupby("Year")
+
+    years = by_year.size().index
+
+    # Totals of all the years
+
+    game_totals = by_year["GameID"].nunique()
+    cheevo_totals = by_year.size()
+
+    if hardcore_mode_only:
+        
+        point_totals = by_year[["Points", "TrueRatio"]].sum()
+
+    else:
+        
+        mode_totals = df_historic.groupby(["Year", "HardcoreMode"])[["Points", "TrueRatio"]].sum().unstack(fill_value=0)
+        mode_totals = mode_totals.reindex(columns=pd.MultiIndex.from_product([["Points", "TrueRatio"], [0, 1]]), fill_value=0)
+
+    # Beaten & mastery awards of all the years
+
+    df_awards = df_awards[(df_awards["AwardType"] == "Game Beaten") |
+                          (df_awards["AwardType"] == "Mastery/Completion")]
+
+    if hardcore_mode_only:
+        df_awards = df_awards[df_awards["AwardDataExtra"] == 1]
+
+    awards_by_year = dict(tuple(df_awards.groupby("Year")))
+
+    # Ten hardest achievements of every year, ties kept in history order as
+    # nlargest does
+
+    df_hardest = df_historic.sort_values("TrueRatio", ascending=False, kind="stable").groupby("Year").head(10)
+
+    hardest_by_year = dict(tuple(df_hardest.groupby("Year")))
+
+    # Retrieve the images of every year at once
+
+    media_urls = {}
+
+    for game_id, path in zip(df_awards["AwardData"], df_awards["ImageIcon"]):
+        media_urls[("Game", game_id)] = get_media_url(path)
+
+    for cheevo_id, path in zip(df_hardest["AchievementID"], df_hardest["BadgeURL"]):
+        media_urls[("Achievement", cheevo_id)] = get_media_url(path)
+
+    images = prefetch_images(media_urls, max_workers=max_workers, image_format=image_format)
+
+    # Put every year's stats together
+
+    all_stats = {}
+
+    for year in years:
+
+        stats = {}
+
+        stats["Game total"]         = game_totals[year]
+        stats["Achievements total"] = cheevo_totals[year]
+
+        if hardcore_mode_only:
+            
+            stats["Softcore Points total"] = 0
+            stats["Hardcore Points total"] = point_totals.loc[year, "Points"]
+            stats["RetroPoints total"]     = point_totals.loc[year, "TrueRatio"]
+
+        else:
+            
+            stats["Softcore Points total"] = mode_totals.loc[year, ("Points", 0)]
+            stats["Points total"]          = mode_totals.loc[year, ("Points", 1)]
+            stats["RetroPoints total"]     = mode_totals.loc[year, ("TrueRatio", 1)]
+
+        df_awards_year = awards_by_year.get(year, df_awards.iloc[:0]).reset_index(drop=True)
+
+        stats["Mastered games"] = df_awards_year[df_awards_year["AwardType"] == "Mastery/Completion"].reset_index(drop=True)
+        stats["Beaten games"]   = df_awards_year[df_awards_year["AwardType"] == "Game Beaten"].reset_index(drop=True)
+
+        hardest_achievements = hardest_by_year[year].reset_index(drop=True)
+
+        stats["Hardest achievements"] = [hardest_achievements.iloc[i] for i in range(len(hardest_achievements))]
+
+        df_game_icons = df_awards_year[["AwardData", "ImageIcon"]].drop_duplicates()
+
+        stats["Game icons"] = {game_id: images[("Game", game_id)] for game_id in df_game_icons["AwardData"]}
+        stats["Hardest achievements badges"] = [images[("Achievement", cheevo_id)] for cheevo_id in hardest_achievements["AchievementID"]]
+
+        all_stats[year] = stats
+
+    return all_stats
+
+
+@instrumented("All years dev stats")
+def get_all_yearly_favdev_stats(
+    df_historic: pd.DataFrame | PartitionedHistory,
+    max_workers: int= DEFAULT_MAX_WORKERS,
+    image_format: str= "figure",
+) -> dict:
+    
+    """
+    Extract the favorite developer stats of every year of some user's
+    achievement history at once, from aggregations grouped by year and
+    developer.
+    
+    Parameters:
+        
+        df_historic (pandas.DataFrame | PartitionedHistory):
+            Some user's RetroAchievements achievement history.
+            
+        max_workers (int, optional):
+            Maximum number of image downloads at the same time.
+            
+        image_format (str, optional):
+            Format of the returned images, see retrieve_image_in_format.
+            Plottable figures by default.
+        
+    Returns:
+        
+        dict:
+            Dictionary with the years as keys and the developer stats of each
+            year, as returned by get_yearly_favdev_stats, as values. They also
+            have the 'Game icons' of the games in the 'Game distribution'.
+    """
+
+    df_historic = get_historic_df(df_historic)
+
+    cheevo_totals = df_historic.groupby("Year").size()
+
+    by_dev = df_historic.groupby(["Year", "Author"], observed=True)
+
+    dev_cheevos = by_dev["AchievementID"].nunique()
+    dev_points = by_dev[["Points", "TrueRatio"]].sum()
+
+    dev_games = df_historic.groupby(["Year", "Author", "GameID"], observed=True)["AchievementID"].nunique()
+
+    # Favorite developer of every year
+
+    favdevs = {}
+
+    for year in cheevo_totals.index:
+        favdevs[year] = dev_cheevos.loc[year].sort_values(ascending=False).index[0]
+
+    game_distributions = {year: dev_games.loc[(year, username)] for year, username in favdevs.items()}
+
+    # Retrieve the images of every year at once
+
+    df_game_icons = df_historic[["GameID", "GameIcon"]].drop_duplicates("GameID").set_index("GameID")["GameIcon"]
+
+    media_urls = {("User", username): get_user_icon_url(username) for username in favdevs.values()}
+
+    for game_distribution in game_distributions.values():
+        for game_id in game_distribution.index:
+            media_urls[("Game", game_id)] = get_media_url(df_game_icons[game_id])
 
-    ### Get beaten & mastery data
+    images = prefetch_images(media_urls, max_workers=max_workers, image_format=image_format)
 
-    beaten_games   = df_awards_year[df_awards_year["AwardType"] == "Game Beaten"].reset_index(drop=True)
-    mastered_games = df_awards_year[df_awards_year["AwardType"] == "Mastery/Completion"].reset_index(drop=True)
+    # Put every year's stats together
 
-    # Retrieve game icons for chosen games
+    all_stats = {}
 
-    df_game_icons = df_awards_year[["AwardData", "ImageIcon"]].drop_duplicates().reset_index(drop=True)
+    for year, username in favdevs.items():
 
-    game_icons = {}
+        stats = {}
 
-    for i in range(len(df_game_icons)):
-        url = 'https://media.retroachievements.org' + df_game_icons["ImageIcon"].values[i]
-        game_icons[df_game_icons["AwardData"].values[i]] = retrieve_image_as_fig(url)
+        stats["Username"] = username
 
-    # Store relevant data in output dictionary
+        stats["User icon"] = images[("User", username)]
 
-    stats["Mastered games"] = mastered_games
-    stats["Beaten games"]   = beaten_games
-    stats["Game icons"]     = game_icons
-    
-    ### Get hardest achievements
-    
-    hardest_achievements = df_cheevo_year.nlargest(10, "TrueRatio").reset_index(drop=True)
-    
-    stats["Hardest achievements"] = [hardest_achievements.iloc[i] for i in range(len(hardest_achievements))]
-    stats["Hardest achievements badges"] = [get_cheevo_badge_fig(df_historic, stats["Hardest achievements"][i]["AchievementID"]) for i in range(len(hardest_achievements))]
+        stats["Achievement total"] = dev_cheevos.loc[(year, username)]
+        stats["Point total"] = dev_points.loc[(year, username), "Points"]
+        stats["RetroPoint total"] = dev_points.loc[(year, username), "TrueRatio"]
 
-    return stats
+        stats["Achievement %"] = 100*stats["Achievement total"]/cheevo_totals[year]
 
+        stats["Game distribution"] = game_distributions[year]
 
-def get_yearly_favdev_stats(
-    df_historic: pd.DataFrame,
-    year: int,
-) -> dict:
+        stats["Game icons"] = {game_id: images[("Game", game_id)] for game_id in game_distributions[year].index}
 
+        all_stats[year] = stats
+
+    return all_stats
+
+
+def get_all_yearly_distributions(
+    df_historic: pd.DataFrame | PartitionedHistory,
+    by: str,
+) -> tuple:
+    
     """
-    Extract the developer related achievement data contained in a user's
-    RetroAchievements history and structure it.
+    Returns the console and developer distributions of every year of some
+    user's achievement history, each from a single aggregation grouped by
+    year.
     
     Parameters:
         
-        df_historic (pandas.DataFrame):
+        df_historic (pandas.DataFrame | PartitionedHistory):
             Some user's RetroAchievements achievement history.
             
-        year (int):
-            Year to check.
-        
+        by (str):
+            Categorization method (options: 'Achievements', 'Points', 'RetroPoints').
+            
     Returns:
         
-        stats (dict):
-            Dictionary with the user's developer related stats for the selected
-            year.
+        dict:
+            Dictionary with the years as keys and the console distribution,
+            as returned by get_system_distribution, as values.
+            
+        dict:
+            Dictionary with the years as keys and the developer distribution,
+            as returned by get_dev_distribution, as values.
     """
 
-    df_year = df_historic[df_historic["Year"] == year]
-    dev_dist = get_dev_distribution(df_year, "Achievements").sort_values(ascending=False)
+    df_historic = get_historic_df(df_historic)
 
-    username = dev_dist.index[0]
+    columns = {"Achievements": "AchievementID", "Points": "Points", "RetroPoints": "TrueRatio"}
 
-    stats = {}
+    if by not in columns:
+        raise ValueError(f"'by' argument should be one of 'Achievements' 'Points' or 'RetroPoints', but was '{by}'.")
 
-    # Basic data
+    distributions = []
 
-    stats["Username"] = username
+    for column in ("ConsoleName", "Author"):
 
-    stats["User icon"] = get_user_icon_fig(username)
+        by_year = df_historic.groupby(["Year", column], observed=True)[columns[by]]
 
-    # Totals
-    
-    stats["Achievement total"] = dev_dist.iloc[0]
-    stats["Point total"] = np.sum(df_year[df_year["Author"] == username]["Points"])
-    stats["RetroPoint total"] = np.sum(df_year[df_year["Author"] == username]["TrueRatio"])
+        df_dist = by_year.nunique() if by == "Achievements" else by_year.sum()
 
-    stats["Achievement %"] = 100*dev_dist.iloc[0]/len(df_year)
+        distributions.append({year: df_dist.loc[year] for year in df_dist.index.unique(level="Year")})
 
-    # Distribution
+    return tuple(distributions)
 
-    stats["Game distribution"] = df_year[df_year["Author"] == username].groupby("GameID")["AchievementID"].nunique()
 
-    return stats
+def get_daily_points(
+    df_year: pd.DataFrame,
+    year: int,
+    count: bool= False,
+) -> np.ndarray:
+    
+    """
+    Returns the points earned each day of a year.
+    
+    Parameters:
+        
+        df_year (pandas.DataFrame):
+            Some user's RetroAchievements achievement history of that year.
+            
+        year (int):
+            Year of the history.
+            
+        count (bool, optional):
+            Return the number of achievements earned each day instead.
+        
+    Returns:
+        
+        numpy.ndarray:
+            Points earned each day, from the 1st of January on.
+    """
+
+    year_start = calendar.timegm(datetime.date(year, 1, 1).timetuple())
+    day_of_year = (df_year["Date"].to_numpy() - year_start)//(24*60*60)
+    
+    return np.bincount(day_of_year,
+                       weights=None if count else df_year["Points"].to_numpy(),
+                       minlength=365 + calendar.isleap(year),
+                       ).astype(int)
 
 
+@instrumented("Figures")
 def get_figure_daily_points_one_year(
-    df_historic: pd.DataFrame,
+    df_historic: pd.DataFrame | PartitionedHistory | None,
     year: int,
     title: bool= False,
+    daily_points: np.ndarray | None= None,
 ) -> go.Figure:
     
     """
@@ -997,7 +5305,7 @@ def get_figure_daily_points_one_year(
     
     Parameters:
         
-        df_historic (pandas.DataFrame):
+        df_historic (pandas.DataFrame | PartitionedHistory):
             Some user's RetroAchievements achievement history.
             
         year (int):
@@ -1005,6 +5313,10 @@ def get_figure_daily_points_one_year(
             
         title (bool, optional):
             Whether the graph should have a title or not.
+            
+        daily_points (numpy.ndarray, optional):
+            The points of each day of the year, if already computed (see
+            DailyPointsAggregator). df_historic is not used then.
         
     Returns:
         
@@ -1012,20 +5324,10 @@ def get_figure_daily_points_one_year(
             Pie chart of the console presence in the historic.
     """
     
-    # Retrieve the data
+    # Add up the points of each day of the year in a single pass
 
-    df_year = df_historic[df_historic["Year"] == year]
-    
-    daily_points  = np.zeros(365 + (year%4 == 0), dtype=int)
-    
-    index = 0
-    for month in range(1,13):
-        df_month = df_year[df_year["Month"] == month]
-        
-        for day in range(1, calendar.monthrange(year, month)[1]+1):
-            df_day = df_month[df_month["Day"] == day]
-            daily_points[index]  = df_day["Points"].sum()
-            index += 1
+    if daily_points is None:
+        daily_points = get_daily_points(get_year_data(df_historic, year), year)
 
     # Create customized tooltips
 
@@ -1127,12 +5429,169 @@ def get_figure_daily_points_one_year(
     return fig
 
 
+@instrumented("Figures")
+def get_figure_daily_heatmap(
+    df_historic: pd.DataFrame | PartitionedHistory,
+    by: str= "Points",
+    title: bool= False,
+) -> go.Figure:
+    
+    """
+    Returns a calendar heatmap of the daily activity throughout the whole
+    history, with one row of weeks per year.
+    
+    Parameters:
+        
+        df_historic (pandas.DataFrame | PartitionedHistory):
+            Some user's RetroAchievements achievement history.
+            
+        by (str, optional):
+            Value that sets the color of each day (options: 'Points',
+            'Achievements'). Both are shown in the tooltips.
+            
+        title (bool, optional):
+            Whether the graph should have a title or not.
+        
+    Returns:
+        
+        go.Figure:
+            Calendar heatmap of the daily activity.
+    """
+
+    if by not in ("Points", "Achievements"):
+        raise ValueError(f"'by' argument should be one of 'Points' or 'Achievements', but was '{by}'.")
+
+    df_all = get_historic_df(df_historic)
+
+    if len(df_all) == 0:
+        return go.Figure()
+
+    # Add up each year's days in a single pass, like the yearly bar charts.
+    # A DataFrame is split by year once instead of being scanned every year
+
+    if not isinstance(df_historic, PartitionedHistory):
+        df_historic = PartitionedHistory(df_all)
+
+    years = list(range(int(df_all["Year"].min()), int(df_all["Year"].max()) + 1))
+
+    daily_totals = {}
+
+    for year in years:
+        df_year = get_year_data(df_historic, year)
+        daily_totals[year] = {"Points": get_daily_points(df_year, year),
+                              "Achievements": get_daily_points(df_year, year, count=True)}
+
+    z_max = max(1, max(totals[by].max() for totals in daily_totals.values()))
+
+    fig = make_subplots(rows=len(years),
+                        cols=1,
+                        subplot_titles=[str(year) for year in years],
+                        vertical_spacing=min(0.3/len(years), 0.08),
+                        )
+
+    xtick_labels = [calendar.month_name[month][0].upper() for month in range(1, 13)]
+
+    for i, year in enumerate(years):
+
+        # Position of each day: column is the week of the year, row the
+        # weekday. Weeks depend on the year's first weekday, so each row
+        # gets its own month ticks
+
+        dates = pd.date_range(start=f"{year}-01-01", end=f"{year}-12-31", freq="D")
+        week = (np.arange(len(dates)) + dates[0].weekday())//7
+
+        points = daily_totals[year]["Points"]
+        cheevos = daily_totals[year]["Achievements"]
+
+        hover_text = [f"<b>{date.day} {calendar.month_name[date.month][:3]} {date.year}</b><br>{day_points} Points<br>{day_cheevos} achievements"
+                      for date, day_points, day_cheevos in zip(dates, points, cheevos)]
+
+        fig.add_trace(
+            go.Heatmap(
+                x=week,
+                y=dates.weekday,
+                z=daily_totals[year][by],
+                text=hover_text,
+                hoverinfo='text',
+                zmin=0,
+                zmax=z_max,
+                xgap=2,
+                ygap=2,
+                colorscale=[[0, '#3a3a3a'], [1, '#bd9109']],
+                showscale=(i == 0),
+                hoverlabel=dict(
+                    bgcolor='white',
+                    bordercolor='black',
+                    font=dict(
+                        color='black',
+                        family='Arial',
+                        size=14
+                    )
+                )
+            ),
+            row=i+1,
+            col=1,
+        )
+
+        fig.update_xaxes(
+            tickvals=week[dates.day == 1],
+            ticktext=xtick_labels,
+            row=i+1,
+            col=1,
+        )
+
+    # Customize the plot
+
+    fig.update_xaxes(
+        showgrid=False,
+        zeroline=False,
+        tickfont=dict(
+                color='#1d56d3',
+                size=14,
+                family='Arial'
+            )
+    )
+
+    fig.update_yaxes(
+        tickvals=[0, 2, 4, 6],
+        ticktext=["Mon", "Wed", "Fri", "Sun"],
+        autorange='reversed',
+        showgrid=False,
+        zeroline=False,
+        tickfont=dict(
+                color='#1d56d3',
+                size=12,
+                family='Arial'
+            )
+    )
+
+    fig.update_layout(
+        height=60 + 160*len(years),
+        plot_bgcolor='#212121',
+        margin=dict(t=80 if title else 40, b=20, l=50, r=10)
+    )
+
+    if title:
+        
+        fig.update_layout(
+            title=f"<b>{by} earned by date</b>",
+            titlefont=dict(
+                    color='#1d56d3',
+                    size=20, 
+                    family='Arial'
+                )
+        )
+
+    return fig
+
+
+@instrumented("Yearly game stats")
 def get_yearly_game_stats(
-    df_historic: pd.DataFrame,
+    df_historic: pd.DataFrame | PartitionedHistory,
     year: int,
     game_id: int,
     df_games_data: pd.DataFrame,
-    cheevos_data_dict: dict,
+    df_cheevos_data: pd.DataFrame | dict,
 ) -> dict:
 
     """
@@ -1141,7 +5600,7 @@ def get_yearly_game_stats(
     
     Parameters:
         
-        df_historic (pandas.DataFrame):
+        df_historic (pandas.DataFrame | PartitionedHistory):
             Some user's RetroAchievements achievement history.
             
         year (int):
@@ -1153,9 +5612,9 @@ def get_yearly_game_stats(
         df_games_data (pandas.DataFrame):
             RetroAchievements metadata of the games that appear in df_historic.
             
-        cheevos_data_dict (dict):
-            Dictionary with the involved games' ID as keys and a Pandas
-            DataFrame containing the achievements' metadata as values.
+        df_cheevos_data (pandas.DataFrame | dict):
+            Achievement catalog, as returned by format_games_data. A
+            dictionary of achievement DataFrames per game is accepted too.
         
     Returns:
         
@@ -1163,9 +5622,10 @@ def get_yearly_game_stats(
             Dictionary with the user's stats for the selected year.
     """
 
-    df_game = df_historic[(df_historic["GameID"] == game_id) & (df_historic["Year"] <= year)].reset_index(drop=True)
+    df_game = get_game_data(df_historic, game_id)
+    df_game = df_game[df_game["Year"] <= year].reset_index(drop=True)
     df_game_year = df_game[df_game["Year"] == year].reset_index(drop=True)
-    df_cheevos = get_cheevo_data(game_id, cheevos_data_dict)
+    df_cheevos = get_cheevo_data(game_id, df_cheevos_data)
 
     stats = {}
 
@@ -1183,11 +5643,11 @@ def get_yearly_game_stats(
 
     # Beaten/mastered
 
-    stats["Beaten"] = check_beaten(game_id, df_game, cheevos_data_dict)
-    stats["Beaten this year"] = not check_beaten(game_id, df_game[df_game["Year"] < year], cheevos_data_dict)
+    stats["Beaten"] = check_beaten(game_id, df_game, df_cheevos_data)
+    stats["Beaten this year"] = not check_beaten(game_id, df_game[df_game["Year"] < year], df_cheevos_data)
 
-    stats["Mastered"] = check_mastered(game_id, df_game, cheevos_data_dict)
-    stats["Mastered this year"] = not check_mastered(game_id, df_game[df_game["Year"] < year], cheevos_data_dict)
+    stats["Mastered"] = check_mastered(game_id, df_game, df_cheevos_data)
+    stats["Mastered this year"] = not check_mastered(game_id, df_game[df_game["Year"] < year], df_cheevos_data)
 
     # Notorious achievements
 
@@ -1196,14 +5656,146 @@ def get_yearly_game_stats(
 
     # Badges
 
-    stats["Game badge"] = get_game_icon_fig(df_historic, game_id)
+    stats["Game badge"] = get_game_icon_fig(df_game, game_id)
     
-    stats["Hardest achievement badge"] = get_cheevo_badge_fig(df_historic, stats["Hardest achievement"]["AchievementID"])
-    stats["Latest achievement badge"] =  get_cheevo_badge_fig(df_historic, stats["Latest achievement"]["AchievementID"])
+    stats["Hardest achievement badge"] = get_cheevo_badge_fig(df_game_year, stats["Hardest achievement"]["AchievementID"])
+    stats["Latest achievement badge"] =  get_cheevo_badge_fig(df_game_year, stats["Latest achievement"]["AchievementID"])
 
     return stats
 
 
+@instrumented("Yearly games stats")
+def get_yearly_games_stats(
+    df_historic: pd.DataFrame | PartitionedHistory,
+    year: int,
+    df_games_data: pd.DataFrame,
+    df_cheevos_data: pd.DataFrame | dict,
+) -> pd.DataFrame:
+
+    """
+    Extract the RetroAchievements stats for a certain year of every game
+    played in it from some user's achievement history, all at once.
+    
+    Images are not retrieved, see retrieve_yearly_games_images.
+    
+    Parameters:
+        
+        df_historic (pandas.DataFrame | PartitionedHistory):
+            Some user's RetroAchievements achievement history.
+            
+        year (int):
+            Year to check.
+            
+        df_games_data (pandas.DataFrame):
+            RetroAchievements metadata of the games that appear in df_historic.
+            
+        df_cheevos_data (pandas.DataFrame | dict):
+            Achievement catalog, as returned by format_games_data. A
+            dictionary of achievement DataFrames per game is accepted too.
+        
+    Returns:
+        
+        pandas.DataFrame:
+            DataFrame with the ID of the games played in the year as index and
+            the same stats as get_yearly_game_stats as columns. Counts include
+            every year up to the selected one. A game is beaten or mastered
+            this year if it became so during it. Notorious achievements are
+            given by their ID, and images by their media path.
+    """
+
+    df_all = get_historic_df(df_historic)
+    df_year = get_year_data(df_historic, year)
+
+    df_until_year = df_all[df_all["Year"] <= year]
+
+    game_ids = pd.Index(df_year["GameID"].unique(), name="GameID")
+
+    df_stats = pd.DataFrame(index=game_ids)
+
+    # Basic data
+
+    df_stats["Title"] = df_games_data.set_index("ID")["Title"].reindex(game_ids)
+
+    df_cheevos_year = get_games_cheevo_data(game_ids, df_cheevos_data)
+
+    df_cheevos = concat_cheevo_data(df_cheevos_year, ["Points"])
+    df_cheevos["Points"] = df_cheevos["Points"].astype("int64")
+
+    until_year_by_game = df_until_year.groupby("GameID")
+    year_by_game = df_year.groupby("GameID")
+
+    df_stats["Achievement count"] = until_year_by_game.size().reindex(game_ids)
+    df_stats["Achievement total"] = df_cheevos.groupby("GameID").size().reindex(game_ids, fill_value=0)
+    df_stats["Achievement count this year"] = year_by_game.size().reindex(game_ids)
+
+    df_stats["Point count"] = until_year_by_game["Points"].sum().reindex(game_ids).astype("int64")
+    df_stats["Point total"] = df_cheevos.groupby("GameID")["Points"].sum().reindex(game_ids, fill_value=0)
+    df_stats["Point count this year"] = year_by_game["Points"].sum().reindex(game_ids).astype("int64")
+
+    # Beaten/mastered, as of the end of the year
+
+    df_completion = get_completion_data(df_until_year, df_cheevos_year).reindex(game_ids)
+
+    df_stats["Beaten"] = df_completion["Beaten"]
+    df_stats["Beaten this year"] = df_completion["Beaten"] & (df_completion["Beaten year"] == year).fillna(False).astype(bool)
+
+    df_stats["Mastered"] = df_completion["Mastered"]
+    df_stats["Mastered this year"] = df_completion["Mastered"] & (df_completion["Mastered year"] == year).fillna(False).astype(bool)
+
+    # Notorious achievements: the first one with the highest RetroPoint value
+    # and the last one earned
+
+    hardest = df_year.loc[year_by_game["TrueRatio"].idxmax()].set_index("GameID")
+    latest = df_year.groupby("GameID").tail(1).set_index("GameID")
+
+    df_stats["Hardest achievement"] = hardest["AchievementID"].reindex(game_ids)
+    df_stats["Latest achievement"] = latest["AchievementID"].reindex(game_ids)
+
+    # Media paths of the images
+
+    df_stats["Game badge"] = latest["GameIcon"].astype(str).reindex(game_ids)
+    df_stats["Hardest achievement badge"] = hardest["BadgeURL"].reindex(game_ids)
+    df_stats["Latest achievement badge"] = latest["BadgeURL"].reindex(game_ids)
+
+    return df_stats
+
+
+@instrumented("Images")
+def retrieve_yearly_games_images(
+    df_games_stats: pd.DataFrame,
+    max_workers: int= DEFAULT_MAX_WORKERS,
+) -> dict:
+
+    """
+    Get the images of the games' stats returned by get_yearly_games_stats,
+    downloading them concurrently.
+    
+    Parameters:
+        
+        df_games_stats (pandas.DataFrame):
+            Games' stats for a year.
+            
+        max_workers (int, optional):
+            Maximum number of downloads at the same time.
+            
+    Returns:
+        
+        dict:
+            Dictionary with the games' ID as keys and dictionaries with the
+            'Game badge', 'Hardest achievement badge' and 'Latest achievement
+            badge' plottable figures as values.
+    """
+
+    columns = ["Game badge", "Hardest achievement badge", "Latest achievement badge"]
+
+    urls = {(game_id, column): get_media_url(df_games_stats.loc[game_id, column])
+            for game_id in df_games_stats.index for column in columns}
+
+    images = prefetch_images(urls, max_workers=max_workers)
+
+    return {game_id: {column: images[(game_id, column)] for column in columns} for game_id in df_games_stats.index}
+
+
 def get_system_distribution(
     df_historic: pd.DataFrame,
     by: str,
@@ -1227,27 +5819,29 @@ def get_system_distribution(
     """
     
     if by == "Games":
-        return df_historic.groupby('ConsoleName')['GameID'].nunique()
+        return df_historic.groupby('ConsoleName', observed=True)['GameID'].nunique()
     
     elif by == "Achievements":
-        return df_historic.groupby('ConsoleName')['AchievementID'].nunique()
+        return df_historic.groupby('ConsoleName', observed=True)['AchievementID'].nunique()
     
     elif by == "Points":
-        return df_historic.groupby('ConsoleName')['Points'].sum()
+        return df_historic.groupby('ConsoleName', observed=True)['Points'].sum()
     
     elif by == "RetroPoints":
-        return df_historic.groupby('ConsoleName')['TrueRatio'].sum()
+        return df_historic.groupby('ConsoleName', observed=True)['TrueRatio'].sum()
     
     else:
         raise ValueError(f"'by' argument should be one of 'Games', 'Points' or 'RetroPoints', but was '{by}'.")
 
 
+@instrumented("Figures")
 def get_figure_system_distribution(
-    df_historic: pd.DataFrame,
+    df_historic: pd.DataFrame | PartitionedHistory,
     year: str,
     by: str,
     max_shown: int= 8,
     title: bool= False,
+    distribution: pd.Series | None= None,
 ) -> go.Figure:
     
     """
@@ -1255,7 +5849,7 @@ def get_figure_system_distribution(
     
     Parameters:
         
-        df_historic (pandas.DataFrame):
+        df_historic (pandas.DataFrame | PartitionedHistory):
             Some user's RetroAchievements achievement history.
             
         year (int):
@@ -1269,6 +5863,10 @@ def get_figure_system_distribution(
             
         title (bool, optional):
             Whether the graph should have a title or not.
+            
+        distribution (pandas.Series, optional):
+            The year's distribution, if already computed (see
+            get_all_yearly_distributions). It must match 'by'.
         
     Returns:
         
@@ -1276,14 +5874,19 @@ def get_figure_system_distribution(
             Pie chart of the console presence in the historic.
     """
 
-    df_year = df_historic[df_historic["Year"] == year]
-    
-    system_dist = get_system_distribution(df_year, by)
+    if distribution is None:
+        system_dist = get_system_distribution(get_year_data(df_historic, year), by)
+    else:
+        system_dist = distribution.copy()
     
     if len(system_dist) > max_shown:
 
         system_dist = system_dist.sort_values(ascending=False)
 
+        # Plain labels, since 'Others' is not one of the categories
+
+        system_dist.index = system_dist.index.astype(object)
+
         total = system_dist.values.sum()
         system_dist = system_dist.iloc[range(max_shown)]
         system_dist["Others"] = total - system_dist.values.sum()
@@ -1333,24 +5936,94 @@ def get_dev_distribution(
     """
     
     if by == "Achievements":
-        return df_historic.groupby('Author')['AchievementID'].nunique()
+        return df_historic.groupby('Author', observed=True)['AchievementID'].nunique()
     
     elif by == "Points":
-        return df_historic.groupby('Author')['Points'].sum()
+        return df_historic.groupby('Author', observed=True)['Points'].sum()
     
     elif by == "RetroPoints":
-        return df_historic.groupby('Author')['TrueRatio'].sum()
+        return df_historic.groupby('Author', observed=True)['TrueRatio'].sum()
     
     else:
         raise ValueError(f"'by' argument should be one of 'Achievements' 'Points' or 'RetroPoints', but was '{by}'.")
 
 
+@instrumented("Dev stats")
+def get_dev_stats(
+    df_historic: pd.DataFrame | PartitionedHistory,
+    top_n: int | None= None,
+) -> tuple:
+    
+    """
+    Returns the stats of every developer present in some achievement history,
+    from a single aggregation grouped by developer and game.
+    
+    Parameters:
+        
+        df_historic (pandas.DataFrame | PartitionedHistory):
+            Some user's RetroAchievements achievement history, usually the
+            achievements of a single year.
+            
+        top_n (int, optional):
+            Number of developers returned, those with the most achievements.
+            All of them by default.
+            
+    Returns:
+        
+        pandas.DataFrame:
+            DataFrame with the developers' usernames as index, sorted by
+            achievement count with ties kept in username order, and the
+            columns 'Achievement total', 'Point total', 'RetroPoint total',
+            'Achievement %' and 'Game total'.
+            
+        pandas.Series:
+            Number of achievements of each returned developer in each game,
+            with the developers' usernames and the games' ID as index.
+    """
+
+    df_historic = get_historic_df(df_historic)
+
+    # Everything per developer adds up from the totals per developer and game,
+    # since every achievement belongs to a single game
+
+    df_points = df_historic[["Author", "GameID", "AchievementID"]].assign(Points=df_historic["Points"].astype("int64"),
+                                                                          TrueRatio=df_historic["TrueRatio"].astype("int64"))
+
+    dev_games = (df_points.groupby(["Author", "GameID"], observed=True)
+                          .agg(Achievements=("AchievementID", "nunique"),
+                               Points=("Points", "sum"),
+                               RetroPoints=("TrueRatio", "sum")))
+
+    by_dev = dev_games.groupby(level="Author", observed=True)
+
+    df_devs = pd.DataFrame({
+        "Achievement total": by_dev["Achievements"].sum(),
+        "Point total": by_dev["Points"].sum(),
+        "RetroPoint total": by_dev["RetroPoints"].sum(),
+    })
+
+    df_devs["Achievement %"] = 100*df_devs["Achievement total"]/len(df_historic)
+    df_devs["Game total"] = by_dev.size()
+
+    df_devs = df_devs.sort_values("Achievement total", ascending=False, kind="stable")
+
+    if top_n is not None:
+        df_devs = df_devs.iloc[:top_n]
+
+    game_distribution = dev_games["Achievements"].rename("AchievementID")
+    game_distribution = game_distribution[game_distribution.index.get_level_values("Author").isin(df_devs.index)]
+
+    return df_devs, game_distribution
+
+
+@instrumented("Figures")
 def get_figure_dev_distribution(
-    df_historic: pd.DataFrame,
+    df_historic: pd.DataFrame | PartitionedHistory,
     year: str,
     by: str,
     max_shown: int= 8,
     title: bool= False,
+    distribution: pd.Series | None= None,
 ) -> go.Figure:
     
     """
@@ -1358,7 +6031,7 @@ def get_figure_dev_distribution(
     
     Parameters:
         
-        df_historic (pandas.DataFrame):
+        df_historic (pandas.DataFrame | PartitionedHistory):
             Some user's RetroAchievements achievement history.
             
         year (int):
@@ -1372,6 +6045,10 @@ def get_figure_dev_distribution(
             
         title (bool, optional):
             Whether the graph should have a title or not.
+            
+        distribution (pandas.Series, optional):
+            The year's distribution, if already computed (see
+            get_all_yearly_distributions). It must match 'by'.
         
     Returns:
         
@@ -1379,14 +6056,19 @@ def get_figure_dev_distribution(
             Pie chart of the developer presence in the historic.
     """
 
-    df_year = df_historic[df_historic["Year"] == year]
-    
-    dev_dist = get_dev_distribution(df_year, by)
+    if distribution is None:
+        dev_dist = get_dev_distribution(get_year_data(df_historic, year), by)
+    else:
+        dev_dist = distribution.copy()
 
     if len(dev_dist) > max_shown:
 
         dev_dist = dev_dist.sort_values(ascending=False)
 
+        # Plain labels, since 'Others' is not one of the categories
+
+        dev_dist.index = dev_dist.index.astype(object)
+
         total = dev_dist.values.sum()
         dev_dist = dev_dist.iloc[range(max_shown)]
         dev_dist["Others"] = total - dev_dist.values.sum()
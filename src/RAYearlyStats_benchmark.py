@@ -0,0 +1,669 @@
+# -*- coding: utf-8 -*-
+"""
+Synthetic RetroAchievements data and benchmarks of the backend's analyses.
+
+Run it as a script to time the analyses against a generated history:
+
+    python RAYearlyStats_benchmark.py --scale medium
+    python RAYearlyStats_benchmark.py --cheevos 250000 --games 3000 --output results.json
+"""
+
+# Libraries for benchmarking
+
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+
+# Libraries for data manipulation
+
+import numpy as np
+import pandas as pd
+
+# Libraries for plotting
+
+from PIL import Image
+from io import BytesIO
+
+import RAYearlyStats_backend as RA
+
+
+#################
+# Configuration #
+#################
+
+
+# Predefined dataset sizes: (achievements earned, games played, years)
+
+SCALES = {
+    "small": (1_000, 10, 2),
+    "medium": (100_000, 1_000, 5),
+    "large": (1_000_000, 10_000, 10),
+}
+
+CONSOLE_NAMES = [
+    "NES/Famicom", "SNES/Super Famicom", "Game Boy", "Game Boy Color",
+    "Game Boy Advance", "Genesis/Mega Drive", "Master System", "Nintendo 64",
+    "PlayStation", "PlayStation 2", "PlayStation Portable", "Nintendo DS",
+    "Arcade", "PC Engine/TurboGrafx-16", "Atari 2600",
+]
+
+# Achievement point values and how often each one is used
+
+POINT_VALUES = np.array([1, 2, 3, 4, 5, 10, 25, 50, 100])
+POINT_WEIGHTS = np.array([6, 4, 6, 3, 20, 30, 18, 8, 5])/100
+
+# Share of games whose data is reported as events
+
+EVENT_GAMES_RATIO = 0.01
+
+
+##################
+# Synthetic data #
+##################
+
+
+def generate_synthetic_data(
+    n_cheevos: int= 10_000,
+    n_games: int= 100,
+    n_years: int= 5,
+    last_year: int= 2024,
+    hardcore_ratio: float= 0.8,
+    seed: int= 0,
+    first_game_id: int= 1,
+    first_cheevo_id: int= 1,
+) -> dict:
+
+    """
+    Generate a realistic RetroAchievements user dataset, in the same shape as
+    the API sends it.
+
+    Every game played gets a set of achievements. The user starts it on a
+    random date and earns a share of the set, often all of it, over the
+    following weeks.
+
+    Parameters:
+
+        n_cheevos (int, optional):
+            Number of achievements earned by the user.
+
+        n_games (int, optional):
+            Number of games played by the user.
+
+        n_years (int, optional):
+            Number of years the history spans.
+
+        last_year (int, optional):
+            Last year of the history.
+
+        hardcore_ratio (float, optional):
+            Share of the games played in Hardcore Mode.
+
+        seed (int, optional):
+            Seed of the random generator.
+
+        first_game_id (int, optional):
+            ID of the first game. Games get consecutive IDs from it.
+
+        first_cheevo_id (int, optional):
+            ID of the first achievement. Achievements get consecutive IDs
+            from it.
+
+    Returns:
+
+        dict:
+            Dictionary with the 'Historic' raw achievement history (a
+            DataFrame with the columns of API_GetAchievementsEarnedBetween.php,
+            sorted by date), the 'Awards' list of awards (as in
+            API_GetUserAwards.php), the 'Games' DataFrame with the general
+            metadata of the games and the 'Achievements' DataFrame with the
+            metadata of every achievement of every game (as in
+            API_GetGameExtended.php, plus a GameID column).
+    """
+
+    rng = np.random.default_rng(seed)
+
+    # Games
+
+    game_ids = np.arange(first_game_id, first_game_id + n_games)
+
+    consoles = rng.choice(CONSOLE_NAMES, size=n_games)
+    consoles[rng.random(n_games) < EVENT_GAMES_RATIO] = "Events"
+
+    df_games = pd.DataFrame({
+        "ID": game_ids,
+        "Title": [f"Synthetic Game {game_id:05d}" for game_id in game_ids],
+        "ConsoleID": pd.Series(consoles).map({name: i + 1 for i, name in enumerate(CONSOLE_NAMES + ["Events"])}).to_numpy(),
+        "ConsoleName": consoles,
+        "ImageIcon": [f"/Images/{game_id:06d}.png" for game_id in game_ids],
+    })
+
+    # Share the earned achievements between the games, then size the sets:
+    # a third of the games get mastered, the others have some left to earn
+
+    earned_counts = 1 + rng.multinomial(n_cheevos - n_games, rng.dirichlet(np.ones(n_games)))
+
+    mastered_games = rng.random(n_games) < 1/3
+    set_sizes = np.where(mastered_games, earned_counts,
+                         earned_counts + np.ceil(earned_counts*rng.uniform(0.1, 2, size=n_games)).astype(int))
+
+    cheevo_game_ids = np.repeat(game_ids, set_sizes)
+    n_catalog = len(cheevo_game_ids)
+
+    cheevo_ids = np.arange(first_cheevo_id, first_cheevo_id + n_catalog)
+    display_order = np.arange(n_catalog) - np.repeat(np.cumsum(set_sizes) - set_sizes, set_sizes)
+
+    points = rng.choice(POINT_VALUES, size=n_catalog, p=POINT_WEIGHTS)
+    true_ratio = (points*rng.uniform(1, 15, size=n_catalog)).astype(int)
+
+    n_authors = max(10, n_games//5)
+    authors = np.array([f"Dev{i:04d}" for i in range(n_authors)])
+    game_authors = rng.integers(0, n_authors, size=(n_games, 2))
+    cheevo_authors = authors[game_authors[cheevo_game_ids - first_game_id, rng.integers(0, 2, size=n_catalog)]]
+
+    # Around a fifth of each set is progression, plus one win condition
+
+    types = np.where(rng.random(n_catalog) < 0.2, "progression", np.where(rng.random(n_catalog) < 0.05, "missable", "")).astype(object)
+    types[np.cumsum(set_sizes) - 1] = "win_condition"
+
+    assert (np.bincount(cheevo_game_ids[types == "win_condition"] - first_game_id, minlength=n_games) == 1).all()
+
+    df_achievements = pd.DataFrame({
+        "GameID": cheevo_game_ids,
+        "ID": cheevo_ids,
+        "NumAwarded": rng.integers(1, 5000, size=n_catalog),
+        "NumAwardedHardcore": rng.integers(1, 5000, size=n_catalog),
+        "Title": [f"Achievement {cheevo_id}" for cheevo_id in cheevo_ids],
+        "Description": "Synthetic achievement",
+        "Points": points,
+        "TrueRatio": true_ratio,
+        "Author": cheevo_authors,
+        "DateModified": "2020-01-01 00:00:00",
+        "DateCreated": "2020-01-01 00:00:00",
+        "BadgeName": cheevo_ids.astype(str),
+        "DisplayOrder": display_order,
+        "MemAddr": "0xH0000=1",
+        "type": types,
+    })
+
+    df_achievements["type"] = df_achievements["type"].replace("", None)
+
+    # Pick the earned achievements in a random order within each game. Half
+    # of the games not mastered have their progression ones earned first, so
+    # that they get beaten when there are enough of them
+
+    keys = rng.random(n_catalog)
+    beaten_first = ~mastered_games & (rng.random(n_games) < 0.5)
+    keys[beaten_first[cheevo_game_ids - first_game_id] & np.isin(types, ["progression", "win_condition"])] -= 1
+
+    order = np.lexsort((keys, cheevo_game_ids))
+    rank = np.empty(n_catalog, dtype=np.int64)
+    rank[order] = display_order
+
+    earned = np.flatnonzero(rank < earned_counts[cheevo_game_ids - first_game_id])
+
+    # Dates: every game is started on a random day and its achievements
+    # earned during the following weeks
+
+    first_date = pd.Timestamp(f"{last_year - n_years + 1}-01-01").value//10**9
+    last_date  = pd.Timestamp(f"{last_year}-12-31 23:59:59").value//10**9
+
+    game_start = rng.integers(first_date, last_date - 60*24*60*60, size=n_games)
+    dates = game_start[cheevo_game_ids[earned] - first_game_id] + rng.exponential(14*24*60*60, size=n_cheevos).astype(np.int64)
+    dates = np.minimum(dates, last_date)
+
+    order = np.argsort(dates, kind="stable")
+    earned = earned[order]
+    dates = dates[order]
+
+    earned_game_ids = cheevo_game_ids[earned]
+    hardcore_games = rng.random(n_games) < hardcore_ratio
+
+    df_earned = df_achievements.iloc[earned]
+
+    date_strings = np.char.replace(np.datetime_as_string(dates.astype("datetime64[s]")), "T", " ")
+
+    df_historic = pd.DataFrame({
+        "Date": date_strings,
+        "HardcoreMode": hardcore_games[earned_game_ids - first_game_id].astype(int),
+        "AchievementID": df_earned["ID"].to_numpy(),
+        "Title": df_earned["Title"].to_numpy(),
+        "Description": df_earned["Description"].to_numpy(),
+        "BadgeName": df_earned["BadgeName"].to_numpy(),
+        "Points": df_earned["Points"].to_numpy(),
+        "TrueRatio": df_earned["TrueRatio"].to_numpy(),
+        "Type": df_earned["type"].to_numpy(),
+        "Author": df_earned["Author"].to_numpy(),
+        "GameTitle": df_games["Title"].to_numpy()[earned_game_ids - first_game_id],
+        "GameIcon": df_games["ImageIcon"].to_numpy()[earned_game_ids - first_game_id],
+        "GameID": earned_game_ids,
+        "ConsoleName": df_games["ConsoleName"].to_numpy()[earned_game_ids - first_game_id],
+        "CumulScore": np.cumsum(df_earned["Points"].to_numpy()),
+        "BadgeURL": [f"/Badge/{badge}.png" for badge in df_earned["BadgeName"]],
+        "GameURL": [f"/game/{game_id}" for game_id in earned_game_ids],
+    })
+
+    # Awards for the games that got beaten or mastered
+
+    played_cheevos = df_achievements[df_achievements["GameID"].isin(np.unique(earned_game_ids))]
+
+    df_completion = RA.get_completion_data(
+        df_historic[["GameID", "AchievementID"]].assign(Date=dates),
+        RA.format_cheevos_catalog(played_cheevos),
+    )
+
+    awards = []
+
+    for award_type, column in (("Game Beaten", "Beaten date"), ("Mastery/Completion", "Mastered date")):
+        for game_id, date in df_completion[column].dropna().items():
+            awards.append({
+                "AwardedAt": pd.Timestamp(int(date), unit="s").strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+                "AwardType": award_type,
+                "AwardData": int(game_id),
+                "AwardDataExtra": int(hardcore_games[game_id - first_game_id]),
+                "DisplayOrder": 0,
+                "Title": df_games["Title"].iloc[game_id - first_game_id],
+                "ConsoleID": int(df_games["ConsoleID"].iloc[game_id - first_game_id]),
+                "ConsoleName": df_games["ConsoleName"].iloc[game_id - first_game_id],
+                "Flags": None,
+                "ImageIcon": df_games["ImageIcon"].iloc[game_id - first_game_id],
+            })
+
+    awards.sort(key=lambda award: award["AwardedAt"])
+
+    return {
+        "Historic": df_historic,
+        "Awards": awards,
+        "Games": df_games,
+        "Achievements": df_achievements,
+    }
+
+
+def generate_synthetic_users(
+    usernames: list,
+    n_cheevos: int= 10_000,
+    n_games: int= 100,
+    n_years: int= 5,
+    seed: int= 0,
+) -> dict:
+
+    """
+    Generate a synthetic dataset per user, each with its own games and
+    achievements, so that the IDs of different users never collide.
+
+    Parameters:
+
+        usernames (list):
+            The users' usernames.
+
+        n_cheevos (int, optional):
+            Number of achievements earned by each user.
+
+        n_games (int, optional):
+            Number of games played by each user.
+
+        n_years (int, optional):
+            Number of years each history spans.
+
+        seed (int, optional):
+            Seed of the random generator of the first user, the next ones
+            use the following seeds.
+
+    Returns:
+
+        dict:
+            Dictionary with the usernames as keys and the datasets, as
+            returned by generate_synthetic_data, as values.
+    """
+
+    users = {}
+
+    first_game_id = first_cheevo_id = 1
+
+    for i, username in enumerate(usernames):
+
+        data = generate_synthetic_data(n_cheevos, n_games, n_years, seed=seed + i,
+                                       first_game_id=first_game_id, first_cheevo_id=first_cheevo_id)
+
+        first_game_id += n_games
+        first_cheevo_id += len(data["Achievements"])
+
+        users[username] = data
+
+    return users
+
+
+def get_game_extended(
+    data: dict,
+    game_id: int,
+) -> dict:
+
+    """
+    Returns the metadata of a synthetic game as API_GetGameExtended.php sends
+    it.
+
+    Parameters:
+
+        data (dict):
+            Synthetic dataset, as returned by generate_synthetic_data.
+
+        game_id (int):
+            ID of the desired game.
+
+    Returns:
+
+        dict:
+            The game's metadata including its achievements.
+    """
+
+    game_data = {column: None for column in ["ForumTopicID", "Flags", "ImageTitle", "ImageIngame", "ImageBoxArt",
+                                             "Publisher", "Developer", "Released", "ReleasedAtGranularity", "IsFinal",
+                                             "RichPresencePatch", "GuideURL", "Updated", "ParentGameID",
+                                             "NumDistinctPlayers", "NumAchievements", "Claims",
+                                             "NumDistinctPlayersCasual", "NumDistinctPlayersHardcore"]}
+
+    game_data.update(data["Games"][data["Games"]["ID"] == game_id].iloc[0].to_dict())
+
+    df_cheevos = data["Achievements"][data["Achievements"]["GameID"] == game_id].drop("GameID", axis=1)
+
+    game_data["Achievements"] = {str(cheevo["ID"]): cheevo for cheevo in df_cheevos.to_dict("records")}
+    game_data["NumAchievements"] = len(df_cheevos)
+
+    # Make it JSON compatible
+
+    return json.loads(json.dumps(game_data, default=int))
+
+
+def build_fixtures(
+    data: dict,
+) -> tuple:
+
+    """
+    Convert a synthetic dataset into the objects the backend's retrieve_*
+    functions return, going through the same formatting steps.
+
+    Parameters:
+
+        data (dict):
+            Synthetic dataset, as returned by generate_synthetic_data.
+
+    Returns:
+
+        pandas.DataFrame:
+            The achievement history, as returned by retrieve_historic_df.
+
+        pandas.DataFrame:
+            The award history, as returned by retrieve_awards_df.
+
+        pandas.DataFrame:
+            The games' metadata.
+
+        pandas.DataFrame:
+            The achievement catalog, indexed by GameID and AchievementID.
+    """
+
+    df_historic = RA.format_historic_df(data["Historic"])
+    df_awards = RA.format_awards_df({"VisibleUserAwards": data["Awards"]})
+
+    df_games_data = data["Games"].copy()
+
+    df_cheevos_data = RA.format_cheevos_catalog(data["Achievements"])
+
+    return df_historic, df_awards, df_games_data, df_cheevos_data
+
+
+def get_placeholder_image(
+) -> bytes:
+
+    """
+    Returns the picture used for every synthetic badge and icon.
+
+    Returns:
+
+        bytes:
+            A plain 64x64 PNG image.
+    """
+
+    buffer = BytesIO()
+    Image.new("RGBA", (64, 64), (189, 145, 9, 255)).save(buffer, format="png")
+
+    return buffer.getvalue()
+
+
+def warm_image_cache(
+    data: dict,
+):
+
+    """
+    Put a placeholder picture in the image cache for every media file the
+    synthetic dataset refers to, so that the analyses never reach the
+    network. The memory cache is enlarged to fit them and the disk cache is
+    disabled.
+
+    Parameters:
+
+        data (dict):
+            Synthetic dataset, as returned by generate_synthetic_data.
+    """
+
+    placeholder = get_placeholder_image()
+
+    paths = (list(data["Games"]["ImageIcon"]) +
+             [f"/Badge/{badge}.png" for badge in data["Achievements"]["BadgeName"]])
+
+    urls = [RA.get_media_url(path) for path in paths]
+    urls += [RA.get_user_icon_url(author) for author in data["Achievements"]["Author"].unique()]
+
+    RA.configure_image_cache(max_memory=2*len(urls)*len(placeholder), disk_cache=False)
+
+    for url in urls:
+        RA.image_memory_cache.put(url, placeholder)
+
+
+##############
+# Benchmarks #
+##############
+
+
+def get_benchmarks(
+    df_historic: pd.DataFrame,
+    df_awards: pd.DataFrame,
+    df_games_data: pd.DataFrame,
+    df_cheevos_data: pd.DataFrame,
+    year: int,
+) -> dict:
+
+    """
+    Returns the backend analyses to time, ready to be called.
+
+    Parameters:
+
+        df_historic (pandas.DataFrame):
+            Some user's RetroAchievements achievement history.
+
+        df_awards (pandas.DataFrame):
+            Some user's RetroAchievements award history.
+
+        df_games_data (pandas.DataFrame):
+            RetroAchievements metadata of the games that appear in df_historic.
+
+        df_cheevos_data (pandas.DataFrame):
+            The achievement catalog, as returned by build_fixtures.
+
+        year (int):
+            Year to analyse.
+
+    Returns:
+
+        dict:
+            Dictionary with the benchmark names as keys and functions without
+            arguments as values.
+    """
+
+    df_year = df_historic[df_historic["Year"] == year]
+    game_id = RA.get_most_cheevo_game(df_year)[0]
+
+    return {
+        "PartitionedHistory": lambda: RA.PartitionedHistory(df_historic),
+        "LookupIndex": lambda: RA.LookupIndex(df_historic, df_games_data),
+        "get_yearly_stats": lambda: RA.get_yearly_stats(df_historic, df_awards, year, image_format="bytes"),
+        "get_yearly_favdev_stats": lambda: RA.get_yearly_favdev_stats(df_historic, year, image_format="bytes"),
+        "get_yearly_game_stats": lambda: RA.get_yearly_game_stats(df_historic, year, game_id, df_games_data, df_cheevos_data),
+        "get_yearly_games_stats": lambda: RA.get_yearly_games_stats(df_historic, year, df_games_data, df_cheevos_data),
+        "get_completion_data": lambda: RA.get_completion_data(df_historic, df_cheevos_data),
+        "get_system_distribution": lambda: RA.get_system_distribution(df_year, "Achievements"),
+        "get_dev_distribution": lambda: RA.get_dev_distribution(df_year, "Achievements"),
+        "get_dev_stats": lambda: RA.get_dev_stats(df_year),
+        "get_figure_daily_points_one_year": lambda: RA.get_figure_daily_points_one_year(df_historic, year),
+        "get_figure_system_distribution": lambda: RA.get_figure_system_distribution(df_historic, year, "Achievements"),
+        "get_figure_dev_distribution": lambda: RA.get_figure_dev_distribution(df_historic, year, "Achievements"),
+        "get_figure_daily_heatmap": lambda: RA.get_figure_daily_heatmap(df_historic),
+    }
+
+
+def time_function(
+    func,
+    repeat: int= 3,
+) -> dict:
+
+    """
+    Measure the wall time and peak memory allocated by a function.
+
+    The timed runs are made without memory tracing, which slows Python
+    down, and one more run is made to measure the peak memory.
+
+    Parameters:
+
+        func (callable):
+            Function without arguments.
+
+        repeat (int, optional):
+            Number of timed runs.
+
+    Returns:
+
+        dict:
+            Dictionary with the best and mean wall time in seconds and the
+            peak memory in MB.
+    """
+
+    times = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "Best time (s)": min(times),
+        "Mean time (s)": sum(times)/len(times),
+        "Peak memory (MB)": peak/1024**2,
+    }
+
+
+def run_benchmarks(
+    n_cheevos: int= 10_000,
+    n_games: int= 100,
+    n_years: int= 5,
+    repeat: int= 3,
+    seed: int= 0,
+    only: list | None= None,
+) -> pd.DataFrame:
+
+    """
+    Generate a synthetic dataset and time the backend analyses against it.
+
+    Parameters:
+
+        n_cheevos (int, optional):
+            Number of achievements earned by the synthetic user.
+
+        n_games (int, optional):
+            Number of games played by the synthetic user.
+
+        n_years (int, optional):
+            Number of years the history spans.
+
+        repeat (int, optional):
+            Number of timed runs of each analysis.
+
+        seed (int, optional):
+            Seed of the random generator.
+
+        only (list, optional):
+            Names of the benchmarks to run. All of them by default.
+
+    Returns:
+
+        pandas.DataFrame:
+            DataFrame with the benchmark names as index and their best and
+            mean wall time and peak memory as columns.
+    """
+
+    data = generate_synthetic_data(n_cheevos, n_games, n_years, seed=seed)
+
+    warm_image_cache(data)
+
+    df_historic, df_awards, df_games_data, df_cheevos_data = build_fixtures(data)
+
+    # Analyse the busiest year
+
+    year = df_historic["Year"].value_counts().index[0]
+
+    benchmarks = get_benchmarks(df_historic, df_awards, df_games_data, df_cheevos_data, year)
+
+    results = {}
+
+    for name, func in benchmarks.items():
+        if only is None or name in only:
+            results[name] = time_function(func, repeat)
+
+    return pd.DataFrame.from_dict(results, orient="index")
+
+
+########
+# Main #
+########
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Time the RAYearlyStats analyses against a synthetic history.")
+
+    parser.add_argument("--scale", choices=SCALES.keys(), default="medium", help="predefined dataset size")
+    parser.add_argument("--cheevos", type=int, help="number of achievements earned (overrides --scale)")
+    parser.add_argument("--games", type=int, help="number of games played (overrides --scale)")
+    parser.add_argument("--years", type=int, help="number of years of history (overrides --scale)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--only", nargs="+", help="names of the benchmarks to run")
+    parser.add_argument("--output", help="write the results to this JSON file")
+
+    args = parser.parse_args()
+
+    n_cheevos, n_games, n_years = SCALES[args.scale]
+
+    n_cheevos = args.cheevos or n_cheevos
+    n_games = args.games or n_games
+    n_years = args.years or n_years
+
+    print(f"{n_cheevos} achievements, {n_games} games, {n_years} years", file=sys.stderr)
+
+    df_results = run_benchmarks(n_cheevos, n_games, n_years, args.repeat, args.seed, args.only)
+
+    print(df_results.to_string(float_format=lambda x: f"{x:.4f}"))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({
+                "Achievements": n_cheevos,
+                "Games": n_games,
+                "Years": n_years,
+                "Results": df_results.to_dict(orient="index"),
+            }, file, indent=2)
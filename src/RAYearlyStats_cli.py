@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+Command line generator of the yearly reports, no Jupyter needed.
+
+Every report is written as a self-contained HTML file, one per user and
+year, and the years are rendered in parallel worker processes:
+
+    python RAYearlyStats_cli.py username --api-key YOUR_API_KEY
+    python RAYearlyStats_cli.py user1 user2 --years 2023 2024 --output-dir reports
+"""
+
+import os
+import sys
+import argparse
+import tempfile
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import RAYearlyStats_backend as RA
+import RAYearlyStats_report as report
+
+
+# Data every worker process renders its reports from, set by init_worker
+
+worker_data = {}
+
+
+def init_worker(
+    users_data: dict,
+    hardcore_mode_only: bool,
+    plotlyjs: str,
+    http_settings: dict,
+):
+
+    """
+    Prepare a worker process to render reports. The data is sent once per
+    worker instead of once per report.
+
+    Parameters:
+
+        users_data (dict):
+            Dictionary with the usernames as keys and (achievement history,
+            award history, games' metadata, achievement catalog) tuples, or
+            the folders of their data snapshots, as values.
+
+        hardcore_mode_only (bool):
+            True if Softcore data was left out.
+
+        plotlyjs (str):
+            How plotly.js is included in the reports, see
+            get_yearly_report_html.
+
+        http_settings (dict):
+            The parent process' base URLs, so that workers download the
+            pictures from the same place.
+    """
+
+    worker_data["Users"] = {}
+
+    for username, user_data in users_data.items():
+
+        # Snapshots are loaded from files instead of the data being pickled
+        # to every worker, their numeric columns shared through memory mapping
+
+        if isinstance(user_data, str):
+            user_data = RA.load_snapshot(user_data)
+
+        df_historic, df_awards, df_games_data, _ = user_data
+
+        worker_data["Users"][username] = (RA.PartitionedHistory(df_historic), df_awards, df_games_data)
+
+    worker_data["Hardcore mode only"] = hardcore_mode_only
+    worker_data["plotly.js"] = plotlyjs
+
+    RA.configure_http(api_base_url=http_settings["API base URL"], media_base_url=http_settings["Media base URL"])
+
+
+def render_report(
+    username: str,
+    year: int,
+    path: str,
+) -> str:
+
+    """
+    Render the report of a user and year in a worker process.
+
+    Parameters:
+
+        username (str):
+            The user's RetroAchievements username.
+
+        year (int):
+            Year of the report.
+
+        path (str):
+            Path of the HTML file.
+
+    Returns:
+
+        str:
+            Path of the HTML file.
+    """
+
+    df_historic, df_awards, df_games_data = worker_data["Users"][username]
+
+    return report.write_yearly_report(path, username, year, df_historic, df_awards, df_games_data,
+                                      worker_data["Hardcore mode only"], worker_data["plotly.js"])
+
+
+def render_reports(
+    users_data: dict,
+    years: list | None= None,
+    output_dir: str= ".",
+    hardcore_mode_only: bool= False,
+    plotlyjs: str= "inline",
+    max_workers: int | None= None,
+) -> dict:
+
+    """
+    Render the yearly reports of several users in parallel worker processes.
+    If pyarrow is installed, the data reaches the workers as snapshots saved
+    to a temporary folder rather than pickled DataFrames.
+
+    Parameters:
+
+        users_data (dict):
+            Dictionary with the usernames as keys and (achievement history,
+            award history, games' metadata, achievement catalog) tuples, as
+            returned by retrieve_users_data, as values.
+
+        years (list, optional):
+            Years to render. Every year with achievements in each user's
+            history by default.
+
+        output_dir (str, optional):
+            Folder where the reports are written.
+
+        hardcore_mode_only (bool, optional):
+            True if Softcore data was left out.
+
+        plotlyjs (str, optional):
+            How plotly.js is included in the reports, see
+            get_yearly_report_html.
+
+        max_workers (int, optional):
+            Number of worker processes. As many as CPUs by default.
+
+    Returns:
+
+        dict:
+            Dictionary with (username, year) tuples as keys and the paths of
+            the written reports as values.
+    """
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    tasks = []
+
+    for username, (df_historic, _, _, _) in users_data.items():
+
+        user_years = sorted(df_historic["Year"].unique())
+
+        if years is not None:
+            user_years = [year for year in user_years if year in years]
+
+        tasks += [(username, int(year), os.path.join(output_dir, f"{username}_{year}.html")) for year in user_years]
+
+    paths = {}
+
+    if len(tasks) == 0:
+        return paths
+
+    with tempfile.TemporaryDirectory() as snapshots_dir:
+
+        workers_data = users_data
+
+        if RA.pa is not None:
+
+            workers_data = {}
+
+            for username, (df_historic, df_awards, df_games_data, df_cheevos_data) in users_data.items():
+
+                snapshot_dir = RA.get_snapshot_path(username, snapshots_dir)
+
+                RA.save_snapshot(snapshot_dir, df_historic, df_awards, df_games_data, df_cheevos_data,
+                                 {"Username": username})
+
+                workers_data[username] = snapshot_dir
+
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 initializer=init_worker,
+                                 initargs=(workers_data, hardcore_mode_only, plotlyjs, RA.http_settings)) as executor:
+
+            futures = {executor.submit(render_report, *task): task for task in tasks}
+
+            for future in as_completed(futures):
+
+                username, year, _ = futures[future]
+
+                try:
+                    paths[(username, year)] = future.result()
+                except Exception as error:
+                    print(f"Failed to render the {year} report of user {username}: {error}", file=sys.stderr)
+
+    return paths
+
+
+########
+# Main #
+########
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Render RetroAchievements yearly reports as static HTML files.")
+
+    parser.add_argument("usernames", nargs="+", help="RetroAchievements usernames")
+    parser.add_argument("--api-key", default=os.environ.get("RA_API_KEY"), help="RetroAchievements API key (default: $RA_API_KEY)")
+    parser.add_argument("--years", nargs="+", type=int, help="years to render (default: all)")
+    parser.add_argument("--hardcore", action="store_true", help="leave Softcore achievements out")
+    parser.add_argument("--output-dir", default=".", help="folder where the reports are written")
+    parser.add_argument("--workers", type=int, help="number of worker processes (default: number of CPUs)")
+    parser.add_argument("--plotlyjs", choices=report.PLOTLYJS_MODES, default="inline",
+                        help="embed plotly.js in every report or load it from its CDN")
+    parser.add_argument("--cache-dir", default=RA.DEFAULT_CACHE_DIR, help="folder of the games' metadata cache")
+    parser.add_argument("--api-base-url", help="base URL of the RetroAchievements API")
+    parser.add_argument("--media-base-url", help="base URL of the RetroAchievements media host")
+
+    args = parser.parse_args()
+
+    if not args.api_key:
+        parser.error("an API key is needed, use --api-key or set RA_API_KEY")
+
+    RA.configure_http(api_base_url=args.api_base_url, media_base_url=args.media_base_url)
+
+    users_data = RA.retrieve_users_data(args.usernames, args.api_key, args.hardcore, cache_dir=args.cache_dir)
+
+    paths = render_reports(users_data, args.years, args.output_dir, args.hardcore, args.plotlyjs, args.workers)
+
+    for (username, year), path in sorted(paths.items()):
+        print(f"{username} {year}: {path}")
+
+    if len(paths) == 0:
+        sys.exit(1)
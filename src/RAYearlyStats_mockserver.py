@@ -0,0 +1,508 @@
+# -*- coding: utf-8 -*-
+"""
+Local stand-in for the RetroAchievements web API and media host, serving
+synthetic data with configurable latency, rate limiting and errors.
+
+Run it as a script and point the backend to it:
+
+    python RAYearlyStats_mockserver.py --port 8000 --latency 0.05 --rate-limit 10
+
+    RA.configure_http(api_base_url="http://127.0.0.1:8000/API/",
+                      media_base_url="http://127.0.0.1:8000")
+"""
+
+# Libraries for the server
+
+import json
+import time
+import argparse
+import threading
+
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qsl
+from collections import deque, Counter
+
+# Libraries for data manipulation
+
+import numpy as np
+import pandas as pd
+
+import RAYearlyStats_backend as RA
+import RAYearlyStats_benchmark as benchmark
+
+
+#################
+# Configuration #
+#################
+
+
+# Folders of the media host, all of them served the placeholder picture.
+# History pages hold RA.HISTORIC_PAGE_SIZE achievements, as the client expects
+
+MEDIA_FOLDERS = ("Badge", "Images", "UserPic")
+
+
+##########
+# Server #
+##########
+
+
+class MockAPIHandler(BaseHTTPRequestHandler):
+
+    """
+    Answers the requests made to the mock server. Its settings and data are
+    attributes of the server, see start_mock_server.
+    """
+
+    # Keep connections alive, as the real servers do
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+
+        server = self.server
+        split_url = urlsplit(self.path)
+        args = dict(parse_qsl(split_url.query))
+
+        with server.lock:
+            server.stats[split_url.path] += 1
+
+        # Simulated network and server delay
+
+        delay = server.latency + server.jitter*server.rng.random()
+
+        if delay > 0:
+            time.sleep(delay)
+
+        # Rate limiting: requests beyond the limit within the last second are
+        # rejected and told when to come back
+
+        if server.rate_limit is not None:
+
+            with server.lock:
+
+                now = time.monotonic()
+
+                while server.request_times and server.request_times[0] <= now - 1:
+                    server.request_times.popleft()
+
+                limited = len(server.request_times) >= server.rate_limit
+
+                if not limited:
+                    server.request_times.append(now)
+
+            if limited:
+                return self.send_json({"message": "Too Many Attempts."}, 429, {"Retry-After": "1"})
+
+        # Injected errors
+
+        if server.error_rate > 0 and server.rng.random() < server.error_rate:
+            return self.send_json({"message": "Server Error"}, 503)
+
+        # Routing
+
+        folder = split_url.path.strip("/").split("/")[0]
+
+        if folder in MEDIA_FOLDERS:
+            return self.send_bytes(server.placeholder, "image/png")
+
+        if folder != "API":
+            return self.send_json({}, 404)
+
+        if server.api_key is not None and args.get("y") != server.api_key:
+            return self.send_json({"message": "Unauthenticated."}, 401)
+
+        function = split_url.path.strip("/").split("/")[-1]
+
+        if function == "API_GetAchievementsEarnedBetween.php":
+            return self.send_json(get_historic_page(server, args.get("u", ""), int(args.get("f", 0)), int(args.get("t", 0))))
+
+        if function == "API_GetUserAwards.php":
+            return self.send_json(get_user_awards(server, args.get("u", "")))
+
+        if function == "API_GetGameExtended.php":
+
+            game_data = get_game_extended(server, int(args.get("i", 0)))
+
+            if game_data is None:
+                return self.send_json({}, 404)
+
+            return self.send_json(game_data)
+
+        return self.send_json({}, 404)
+
+    def send_bytes(self, content: bytes, content_type: str, status: int= 200, headers: dict | None= None):
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+
+        self.end_headers()
+        self.wfile.write(content)
+
+    def send_json(self, data, status: int= 200, headers: dict | None= None):
+
+        self.send_bytes(json.dumps(data).encode("utf-8"), "application/json", status, headers)
+
+    def log_message(self, format, *args):
+
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def get_historic_page(
+    server: ThreadingHTTPServer,
+    username: str,
+    start_date_epoch: int,
+    end_date_epoch: int,
+) -> list:
+
+    """
+    Returns the achievements a synthetic user earned between two dates, at
+    most RA.HISTORIC_PAGE_SIZE of them, as the real API does.
+
+    Parameters:
+
+        server (ThreadingHTTPServer):
+            The mock server.
+
+        username (str):
+            The synthetic user's username.
+
+        start_date_epoch (int):
+            UNIX timestamp of the first second included.
+
+        end_date_epoch (int):
+            UNIX timestamp of the last second included.
+
+    Returns:
+
+        list:
+            The achievements as dictionaries, sorted by date.
+    """
+
+    user = server.users.get(username.lower())
+
+    if user is None:
+        return []
+
+    start = np.searchsorted(user["Dates"], start_date_epoch, side="left")
+    stop = np.searchsorted(user["Dates"], end_date_epoch, side="right")
+
+    return user["Data"]["Historic"].iloc[start:min(stop, start + RA.HISTORIC_PAGE_SIZE)].to_dict("records")
+
+
+def get_user_awards(
+    server: ThreadingHTTPServer,
+    username: str,
+) -> dict:
+
+    """
+    Returns the awards of a synthetic user as API_GetUserAwards.php does.
+
+    Parameters:
+
+        server (ThreadingHTTPServer):
+            The mock server.
+
+        username (str):
+            The synthetic user's username.
+
+    Returns:
+
+        dict:
+            The award counts and the list of awards.
+    """
+
+    user = server.users.get(username.lower())
+    awards = [] if user is None else user["Data"]["Awards"]
+
+    award_types = Counter(award["AwardType"] for award in awards)
+
+    return {
+        "TotalAwardsCount": len(awards),
+        "HiddenAwardsCount": 0,
+        "MasteryAwardsCount": award_types["Mastery/Completion"],
+        "CompletionAwardsCount": 0,
+        "BeatenHardcoreAwardsCount": sum(award["AwardType"] == "Game Beaten" and award["AwardDataExtra"] == 1 for award in awards),
+        "BeatenSoftcoreAwardsCount": sum(award["AwardType"] == "Game Beaten" and award["AwardDataExtra"] == 0 for award in awards),
+        "EventAwardsCount": 0,
+        "SiteAwardsCount": 0,
+        "VisibleUserAwards": awards,
+    }
+
+
+def get_game_extended(
+    server: ThreadingHTTPServer,
+    game_id: int,
+) -> dict | None:
+
+    """
+    Returns the metadata of a synthetic game as API_GetGameExtended.php does,
+    from the dataset of the users that played it. Answers are built once and
+    then reused.
+
+    Parameters:
+
+        server (ThreadingHTTPServer):
+            The mock server.
+
+        game_id (int):
+            ID of the desired game.
+
+    Returns:
+
+        dict | None:
+            The game's metadata including its achievements, or None if no
+            user has it.
+    """
+
+    with server.lock:
+        if game_id in server.games:
+            return server.games[game_id]
+
+    data = server.game_datasets.get(game_id)
+
+    game_data = None if data is None else benchmark.get_game_extended(data, game_id)
+
+    with server.lock:
+        server.games[game_id] = game_data
+
+    return game_data
+
+
+def check_shared_games(
+    data: dict,
+    other_data: dict,
+):
+
+    """
+    Check that the games two synthetic datasets have in common are the same
+    in both, so that a single game table can answer for every user.
+
+    Parameters:
+
+        data (dict):
+            Synthetic dataset, as returned by generate_synthetic_data.
+
+        other_data (dict):
+            Another synthetic dataset.
+
+    Raises:
+
+        ValueError:
+            If a game ID stands for different games or achievements.
+    """
+
+    shared_ids = np.intersect1d(data["Games"]["ID"], other_data["Games"]["ID"])
+
+    if len(shared_ids) == 0:
+        return
+
+    for table, column in (("Games", "ID"), ("Achievements", "GameID")):
+
+        df, df_other = [dataset[table][dataset[table][column].isin(shared_ids)].sort_values([column, "ID"]).reset_index(drop=True)
+                        for dataset in (data, other_data)]
+
+        if not df.equals(df_other):
+            raise ValueError("Users have different games with the same IDs, "
+                             "generate them with generate_synthetic_users instead.")
+
+
+def start_mock_server(
+    users: dict,
+    host: str= "127.0.0.1",
+    port: int= 0,
+    latency: float= 0.0,
+    jitter: float= 0.0,
+    rate_limit: float | None= None,
+    error_rate: float= 0.0,
+    api_key: str | None= None,
+    seed: int= 0,
+    verbose: bool= False,
+) -> ThreadingHTTPServer:
+
+    """
+    Start a mock RetroAchievements server in a background thread.
+
+    Parameters:
+
+        users (dict):
+            Dictionary with usernames as keys and synthetic datasets, as
+            returned by RAYearlyStats_benchmark.generate_synthetic_data, as
+            values. Games shared by several users must be the same in all
+            their datasets, see RAYearlyStats_benchmark.generate_synthetic_users.
+
+        host (str, optional):
+            Address to listen on.
+
+        port (int, optional):
+            Port to listen on. A free one is picked by default.
+
+        latency (float, optional):
+            Seconds every request is delayed.
+
+        jitter (float, optional):
+            Maximum random number of seconds added to the latency.
+
+        rate_limit (float, optional):
+            Maximum number of requests per second. Requests beyond it get a
+            429 status with a Retry-After header. Unlimited by default.
+
+        error_rate (float, optional):
+            Share of the requests that fail with a 503 status.
+
+        api_key (str, optional):
+            API key requests must carry. Any one is accepted by default.
+
+        seed (int, optional):
+            Seed of the random latency and errors.
+
+        verbose (bool, optional):
+            Whether to log every request.
+
+    Returns:
+
+        ThreadingHTTPServer:
+            The running server. Its 'stats' attribute counts the requests per
+            path, and shutdown() stops it.
+    """
+
+    server = ThreadingHTTPServer((host, port), MockAPIHandler)
+    server.daemon_threads = True
+
+    server.users = {}
+
+    # A single game table for all the users
+
+    server.game_datasets = {}
+
+    datasets = []
+
+    for username, data in users.items():
+
+        if not any(data is other_data for other_data in datasets):
+
+            for other_data in datasets:
+                check_shared_games(data, other_data)
+
+            datasets.append(data)
+
+            for game_id in data["Games"]["ID"].tolist():
+                server.game_datasets.setdefault(game_id, data)
+
+        dates = pd.to_datetime(data["Historic"]["Date"], format="%Y-%m-%d %H:%M:%S")
+
+        server.users[username.lower()] = {
+            "Data": data,
+            "Dates": ((dates - pd.Timestamp(0)) // pd.Timedelta(seconds=1)).to_numpy(),
+        }
+
+    server.games = {}
+    server.placeholder = benchmark.get_placeholder_image()
+
+    server.latency = latency
+    server.jitter = jitter
+    server.rate_limit = rate_limit
+    server.error_rate = error_rate
+    server.api_key = api_key
+    server.verbose = verbose
+
+    server.rng = np.random.default_rng(seed)
+    server.lock = threading.Lock()
+    server.request_times = deque()
+    server.stats = Counter()
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    return server
+
+
+def get_mock_server_urls(
+    server: ThreadingHTTPServer,
+) -> tuple:
+
+    """
+    Returns the base URLs of a mock server.
+
+    Parameters:
+
+        server (ThreadingHTTPServer):
+            The mock server.
+
+    Returns:
+
+        str:
+            Base URL of the API.
+
+        str:
+            Base URL of the media host.
+    """
+
+    host, port = server.server_address[:2]
+
+    media_base_url = f"http://{host}:{port}"
+
+    return media_base_url + "/API/", media_base_url
+
+
+def use_mock_server(
+    server: ThreadingHTTPServer,
+):
+
+    """
+    Point the backend to a mock server.
+
+    Parameters:
+
+        server (ThreadingHTTPServer):
+            The mock server.
+    """
+
+    api_base_url, media_base_url = get_mock_server_urls(server)
+
+    RA.configure_http(api_base_url=api_base_url, media_base_url=media_base_url)
+
+
+########
+# Main #
+########
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Serve synthetic data through a mock RetroAchievements API.")
+
+    parser.add_argument("--users", nargs="+", default=["SyntheticUser"], help="usernames to serve")
+    parser.add_argument("--scale", choices=benchmark.SCALES.keys(), default="small", help="predefined dataset size")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8000, help="port to listen on")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds every request is delayed")
+    parser.add_argument("--jitter", type=float, default=0.0, help="maximum random extra delay in seconds")
+    parser.add_argument("--rate-limit", type=float, help="maximum requests per second")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests failing with 503")
+    parser.add_argument("--api-key", help="API key requests must carry")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+
+    args = parser.parse_args()
+
+    n_cheevos, n_games, n_years = benchmark.SCALES[args.scale]
+
+    users = benchmark.generate_synthetic_users(args.users, n_cheevos, n_games, n_years, seed=args.seed)
+
+    server = start_mock_server(users, args.host, args.port, args.latency, args.jitter, args.rate_limit,
+                               args.error_rate, args.api_key, args.seed, args.verbose)
+
+    api_base_url, media_base_url = get_mock_server_urls(server)
+
+    print(f"API:   {api_base_url}")
+    print(f"Media: {media_base_url}")
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,511 @@
+# -*- coding: utf-8 -*-
+"""
+Static HTML version of the yearly report shown by the notebook.
+
+The report has the same sections and layout as the notebook's, and every
+picture and figure is embedded in it, so the file can be opened anywhere
+without a Python kernel.
+"""
+
+import html
+
+import pandas as pd
+
+import RAYearlyStats_backend as RA
+
+
+#################
+# Configuration #
+#################
+
+
+TITLE_FONTSIZE = 36
+SECTION_TITLE_FONTSIZE = 28
+GENERAL_TEXT_FONTSIZE = 18
+
+# Ways in which the plotly.js library is included in the report: inline
+# (self-contained, around 3.5 MB) or loaded from a CDN when opened
+
+PLOTLYJS_MODES = ("inline", "cdn")
+
+
+####################
+# HTML auxiliaries #
+####################
+
+
+def get_picture_html(
+    picture,
+) -> str:
+
+    """
+    Returns an HTML image embedding a picture.
+
+    Parameters:
+
+        picture (bytes | numpy.ndarray | matplotlib.figure.Figure | None):
+            Picture in any of the formats returned by retrieve_image_in_format.
+
+    Returns:
+
+        str:
+            The img element, or a blank space if there is no picture.
+    """
+
+    if picture is None:
+        return "&nbsp;"
+
+    return f"""<img src="{RA.get_image_data_uri(picture)}" style="width: 100%; height: auto; display: block;" alt="Figure">"""
+
+
+def get_horizontal_line_html(
+) -> str:
+
+    """
+    Returns the black line that separates the report's sections.
+    """
+
+    return """<div style="width: 100%; height: 1px; background-color: black;"></div>"""
+
+
+def get_section_title_html(
+    title: str,
+) -> str:
+
+    """
+    Returns the title of a section of the report.
+
+    Parameters:
+
+        title (str):
+            Text of the title.
+
+    Returns:
+
+        str:
+            The title's paragraph.
+    """
+
+    return f"""
+        <p style="font-size: {SECTION_TITLE_FONTSIZE}px; margin-bottom: 10px;">
+            <b>{html.escape(title)}</b>
+        </p>
+    """
+
+
+def get_two_column_list_html(
+    items: list,
+) -> str:
+
+    """
+    Returns a list of pictures with a caption, laid out in two columns.
+
+    Parameters:
+
+        items (list):
+            List of (picture, title, subtitle) tuples. Title and subtitle are
+            plain text.
+
+    Returns:
+
+        str:
+            One flex row per pair of items.
+    """
+
+    rows = []
+
+    for i in range(0, len(items), 2):
+
+        columns = []
+
+        for item in items[i:i+2]:
+
+            picture, title, subtitle = item
+
+            columns.append((get_picture_html(picture), f"""
+                <p style="font-size: 16px; margin-bottom: 10px;">{html.escape(str(title))}</p>
+                <p style="font-size: 12px;">{html.escape(str(subtitle))}</p>
+            """))
+
+        if len(columns) == 1:
+            columns.append(("&nbsp;", "&nbsp;"))
+
+        rows.append(f"""<div style="display: flex; justify-content: space-between; align-items: center; width: 100%; font-family: Arial, sans-serif;">
+            <!-- Column 1 -->
+            <div style="width: 8%; text-align: center;">{columns[0][0]}</div>
+            <!-- Column 2 -->
+            <div style="width: 42%; text-align: left;">{columns[0][1]}</div>
+            <!-- Column 3 -->
+            <div style="width: 8%; text-align: center;">{columns[1][0]}</div>
+            <!-- Column 4 -->
+            <div style="width: 42%; text-align: left;">{columns[1][1]}</div>
+        </div>""")
+
+    return "".join(rows)
+
+
+def get_figure_html(
+    fig,
+    include_plotlyjs: bool | str,
+) -> str:
+
+    """
+    Returns a plotly figure as an HTML fragment.
+
+    Parameters:
+
+        fig (plotly.graph_objects.Figure):
+            The figure.
+
+        include_plotlyjs (bool | str):
+            True to embed plotly.js, 'cdn' to load it from its CDN, or False
+            if the page already loads it.
+
+    Returns:
+
+        str:
+            The figure's div and script.
+    """
+
+    return fig.to_html(full_html=False, include_plotlyjs=include_plotlyjs)
+
+
+###################
+# Report sections #
+###################
+
+
+def get_general_data_html(
+    username: str,
+    year: int,
+    stats: dict,
+    hardcore_mode_only: bool,
+) -> str:
+
+    """
+    Returns the title of the report and the user's totals for the year.
+
+    Parameters:
+
+        username (str):
+            The user's RetroAchievements username.
+
+        year (int):
+            Year of the report.
+
+        stats (dict):
+            The user's stats, as returned by get_yearly_stats.
+
+        hardcore_mode_only (bool):
+            True if Softcore data was left out.
+
+    Returns:
+
+        str:
+            HTML of the section.
+    """
+
+    lines = [
+        f"""Achievements earned: <b>{stats["Achievements total"]}</b>""",
+        f"""Points earned: <b>{stats["Points total"]} ({stats["RetroPoints total"]})</b>""",
+    ]
+
+    if not hardcore_mode_only:
+        lines.append(f"""Softcore Points earned: <b>{stats["Softcore Points total"]}</b>""")
+
+    lines += [
+        f"""Games with at least one achievement earned: <b>{stats["Game total"]}</b>""",
+        f"""Beaten games: <b>{len(stats["Beaten games"])}</b>""",
+        f"""Mastered games: <b>{len(stats["Mastered games"])}</b>""",
+    ]
+
+    return (f"""
+        <p style="font-size: {TITLE_FONTSIZE}px; margin-bottom: 10px;">
+            <b>{html.escape(username)}'s {year} in RetroAchievements</b>
+        </p>
+    """ + get_horizontal_line_html() +
+            "".join(f"""
+        <p style="font-size: {GENERAL_TEXT_FONTSIZE}px; margin-bottom: 10px;">
+            {line}
+        </p>
+    """ for line in lines) + get_horizontal_line_html())
+
+
+def get_awarded_games_html(
+    title: str,
+    df_games: pd.DataFrame,
+    game_icons: dict,
+) -> str:
+
+    """
+    Returns the list of games beaten or mastered during the year.
+
+    Parameters:
+
+        title (str):
+            Title of the section.
+
+        df_games (pandas.DataFrame):
+            The awards of the games, as in the 'Beaten games' and 'Mastered
+            games' entries of get_yearly_stats.
+
+        game_icons (dict):
+            Dictionary with the games' ID as keys and their icons as values.
+
+    Returns:
+
+        str:
+            HTML of the section, empty if there are no games.
+    """
+
+    if len(df_games) == 0:
+        return ""
+
+    items = [(game_icons[award["AwardData"]],
+              award["Title"],
+              f"""{RA.get_formatted_date(award["Day"], award["Month"])} | {award["ConsoleName"]}""")
+             for _, award in df_games.iterrows()]
+
+    return get_section_title_html(title) + get_two_column_list_html(items) + get_horizontal_line_html()
+
+
+def get_hardest_achievements_html(
+    stats: dict,
+    df_games_data: pd.DataFrame | RA.LookupIndex,
+) -> str:
+
+    """
+    Returns the list of the achievements of the year with the highest
+    RetroPoint value.
+
+    Parameters:
+
+        stats (dict):
+            The user's stats, as returned by get_yearly_stats.
+
+        df_games_data (pandas.DataFrame | LookupIndex):
+            RetroAchievements metadata of the games played.
+
+    Returns:
+
+        str:
+            HTML of the section.
+    """
+
+    items = [(badge,
+              f"""{achievement["Title"]} | {achievement["Points"]} ({achievement["TrueRatio"]})""",
+              RA.get_game_title(achievement["GameID"], df_games_data))
+             for achievement, badge in zip(stats["Hardest achievements"], stats["Hardest achievements badges"])]
+
+    return (get_section_title_html("Achievements with highest RetroPoint value") +
+            get_two_column_list_html(items) + get_horizontal_line_html())
+
+
+def get_favdev_html(
+    username: str,
+    year: int,
+    stats: dict,
+    dev_stats: dict,
+    df_historic: pd.DataFrame | RA.LookupIndex,
+    df_games_data: pd.DataFrame | RA.LookupIndex,
+) -> str:
+
+    """
+    Returns the favorite developer appreciation corner.
+
+    Parameters:
+
+        username (str):
+            The user's RetroAchievements username.
+
+        year (int):
+            Year of the report.
+
+        stats (dict):
+            The user's stats, as returned by get_yearly_stats.
+
+        dev_stats (dict):
+            The user's developer stats, as returned by get_yearly_favdev_stats.
+
+        df_historic (pandas.DataFrame | LookupIndex):
+            The user's RetroAchievements achievement history.
+
+        df_games_data (pandas.DataFrame | LookupIndex):
+            RetroAchievements metadata of the games played.
+
+    Returns:
+
+        str:
+            HTML of the section.
+    """
+
+    dev_username = html.escape(dev_stats["Username"])
+    username = html.escape(username)
+
+    # Games whose icon was not needed by the stats are downloaded now
+
+    game_distribution = dev_stats["Game distribution"]
+
+    missing_icons = {game_id: RA.get_game_icon_url(df_historic, game_id)
+                     for game_id in game_distribution.index if game_id not in stats["Game icons"]}
+
+    game_icons = {**stats["Game icons"], **RA.prefetch_images(missing_icons, image_format="bytes")}
+
+    items = [(game_icons[game_id],
+              RA.get_game_title(game_id, df_games_data),
+              f"""{RA.get_game_console(game_id, df_historic)}, {cheevo_count} achievements""")
+             for game_id, cheevo_count in game_distribution.items()]
+
+    return (get_section_title_html("Favorite developer appreciation corner") + f"""
+        <div style="display: flex; justify-content: space-between; align-items: center; width: 100%; font-family: Arial, sans-serif;">
+            <!-- Column 1 -->
+            <div style="width: 15%; text-align: left;">
+                {get_picture_html(dev_stats["User icon"])}
+            </div>
+
+            <!-- Column 2 -->
+            <div style="width: 85%; text-align: left;">
+                <p style="font-size: {SECTION_TITLE_FONTSIZE}px; margin-bottom: 10px;"><b>{dev_username}</b></p>
+            </div>
+        </div>
+        <p style="font-size: {GENERAL_TEXT_FONTSIZE}px; margin-bottom: 10px;">
+            {dev_username} developed <b>{dev_stats["Achievement total"]} achievements</b> of the {stats["Achievements total"]} that {username} got in {year}. That's the <b>{dev_stats["Achievement %"]:.2f} %</b>!
+        </p>
+        <p style="font-size: {GENERAL_TEXT_FONTSIZE}px; margin-bottom: 10px;">
+           They sure deserve a thank you for making {year} more enjoyable!
+        </p>
+        <p style="font-size: {GENERAL_TEXT_FONTSIZE}px; margin-bottom: 10px;">
+            Here's a breakdown of the achievements developed by them that {username} played in {year}:
+        </p>
+    """ + get_two_column_list_html(items))
+
+
+##########
+# Report #
+##########
+
+
+def get_yearly_report_html(
+    username: str,
+    year: int,
+    df_historic: pd.DataFrame | RA.PartitionedHistory,
+    df_awards: pd.DataFrame,
+    df_games_data: pd.DataFrame,
+    hardcore_mode_only: bool= False,
+    plotlyjs: str= "inline",
+) -> str:
+
+    """
+    Build the whole yearly report of a user as a standalone HTML page.
+
+    Parameters:
+
+        username (str):
+            The user's RetroAchievements username.
+
+        year (int):
+            Year of the report.
+
+        df_historic (pandas.DataFrame | PartitionedHistory):
+            The user's RetroAchievements achievement history.
+
+        df_awards (pandas.DataFrame):
+            The user's RetroAchievements award history.
+
+        df_games_data (pandas.DataFrame):
+            RetroAchievements metadata of the games played.
+
+        hardcore_mode_only (bool, optional):
+            True if Softcore data was left out of the history.
+
+        plotlyjs (str, optional):
+            'inline' to embed plotly.js in the page, making it fully
+            self-contained, or 'cdn' to load it from its CDN.
+
+    Returns:
+
+        str:
+            The HTML document.
+    """
+
+    if plotlyjs not in PLOTLYJS_MODES:
+        raise ValueError(f"'plotlyjs' argument should be one of 'inline' or 'cdn', but was '{plotlyjs}'.")
+
+    if not isinstance(df_historic, RA.PartitionedHistory):
+        df_historic = RA.PartitionedHistory(df_historic)
+
+    stats     = RA.get_yearly_stats(df_historic, df_awards, year, image_format="bytes")
+    dev_stats = RA.get_yearly_favdev_stats(df_historic, year, image_format="bytes")
+
+    # Titles, systems and icons are looked up one by one in the lists
+
+    lookup_index = RA.LookupIndex(df_historic, df_games_data)
+
+    # plotly.js is included with the first figure only
+
+    include_plotlyjs = True if plotlyjs == "inline" else "cdn"
+
+    sections = [
+        get_general_data_html(username, year, stats, hardcore_mode_only),
+        get_awarded_games_html("Beaten games", stats["Beaten games"], stats["Game icons"]),
+        get_awarded_games_html("Mastered games", stats["Mastered games"], stats["Game icons"]),
+        get_section_title_html("Daily point distribution"),
+        get_figure_html(RA.get_figure_daily_points_one_year(df_historic, year), include_plotlyjs),
+        get_horizontal_line_html(),
+        get_hardest_achievements_html(stats, lookup_index),
+        get_section_title_html("Achievement distribution by console"),
+        get_figure_html(RA.get_figure_system_distribution(df_historic, year, by="Achievements"), False),
+        get_horizontal_line_html(),
+        get_section_title_html("Achievement distribution by developer"),
+        get_figure_html(RA.get_figure_dev_distribution(df_historic, year, by="Achievements"), False),
+        get_horizontal_line_html(),
+        get_favdev_html(username, year, stats, dev_stats, lookup_index, lookup_index),
+    ]
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(username)}'s {year} in RetroAchievements</title>
+</head>
+<body style="max-width: 1100px; margin: 20px auto; font-family: Arial, sans-serif;">
+{"".join(sections)}
+</body>
+</html>
+"""
+
+
+def write_yearly_report(
+    path: str,
+    username: str,
+    year: int,
+    df_historic: pd.DataFrame | RA.PartitionedHistory,
+    df_awards: pd.DataFrame,
+    df_games_data: pd.DataFrame,
+    hardcore_mode_only: bool= False,
+    plotlyjs: str= "inline",
+) -> str:
+
+    """
+    Build the yearly report of a user and write it to an HTML file.
+
+    Parameters:
+
+        path (str):
+            Path of the HTML file.
+
+        Rest of parameters:
+            See get_yearly_report_html.
+
+    Returns:
+
+        str:
+            Path of the HTML file.
+    """
+
+    report = get_yearly_report_html(username, year, df_historic, df_awards, df_games_data, hardcore_mode_only, plotlyjs)
+
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(report)
+
+    return path